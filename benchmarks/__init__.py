@@ -0,0 +1,11 @@
+"""
+Throughput benchmarks for the Claude CLI wrapper, driven by the fake CLI.
+Skipped by a plain `pytest`; run them with `pytest benchmarks` or
+`pytest -m benchmark`.
+"""
+
+import os
+
+CONCURRENCY_LEVELS = [
+    int(level) for level in os.getenv("BENCH_CONCURRENCY", "1,10,50,100,250,500").split(",")
+]
@@ -0,0 +1,110 @@
+"""
+benchmarks/test_throughput.py - Wrapper throughput against the fake CLI
+"""
+
+import asyncio
+
+import pytest
+
+from benchmarks import CONCURRENCY_LEVELS
+from src.claude.cli_interface import ClaudeInterface
+from src.claude.concurrency import AdaptiveLimiter
+from src.claude.workspace_manager import WorkspaceManager
+
+pytestmark = pytest.mark.benchmark
+
+
+def _interface(concurrency: int) -> ClaudeInterface:
+    interface = ClaudeInterface()
+    interface.concurrency_limiter = AdaptiveLimiter(
+        initial_limit=concurrency,
+        max_limit=concurrency,
+        adaptive=False
+    )
+    return interface
+
+
+def _failures(results) -> list:
+    return [r for r in results if isinstance(r, Exception) or not r.success]
+
+
+def test_execute_sequential(fake_claude, bench):
+    """Per-call overhead with an instant CLI: spawn, pipes and bookkeeping"""
+    fake_claude(latency="fixed:0", output_bytes=256)
+    interface = _interface(1)
+    tasks = 50
+    
+    async def run():
+        return [await interface.execute(f"prompt {index}") for index in range(tasks)]
+    
+    with bench.measure("execute (sequential)", tasks=tasks):
+        results = asyncio.run(run())
+    
+    assert not _failures(results)
+
+
+@pytest.mark.parametrize("concurrency", CONCURRENCY_LEVELS)
+def test_execute_batch(fake_claude, bench, concurrency):
+    """Batch throughput with two waves of agents per concurrency slot"""
+    fake_claude(latency="uniform:0.1,0.3", output_bytes=4096)
+    interface = _interface(concurrency)
+    prompts = [(f"prompt {index}", None) for index in range(concurrency * 2)]
+    
+    with bench.measure("execute_batch", tasks=len(prompts), concurrency=concurrency):
+        results = asyncio.run(interface.execute_batch(prompts))
+    
+    assert not _failures(results)
+
+
+@pytest.mark.parametrize("output_bytes", [1024, 1024 ** 2, 16 * 1024 ** 2])
+def test_execute_output_size(fake_claude, bench, output_bytes):
+    """Streaming cost and parent memory for large agent outputs"""
+    fake_claude(latency="fixed:0.2", output_bytes=output_bytes, chunks=64)
+    interface = _interface(4)
+    prompts = [(f"prompt {index}", None) for index in range(4)]
+    
+    with bench.measure(f"execute_batch {output_bytes // 1024}KiB out", tasks=4, concurrency=4):
+        results = asyncio.run(interface.execute_batch(prompts))
+    
+    assert not _failures(results)
+    assert all(len(result.output) == output_bytes for result in results)
+
+
+@pytest.mark.parametrize("concurrency", CONCURRENCY_LEVELS)
+def test_workspace_manager(fake_claude, bench, concurrency):
+    """Create and clean up isolated workspaces concurrently"""
+    manager = WorkspaceManager()
+    
+    async def one(index: int):
+        async with manager.isolated_workspace(f"bench{index}"):
+            pass
+    
+    async def run():
+        await asyncio.gather(*(one(index) for index in range(concurrency)))
+    
+    with bench.measure("workspace create+cleanup", tasks=concurrency, concurrency=concurrency):
+        asyncio.run(run())
+    
+    assert not manager.active_workspaces
+
+
+@pytest.mark.parametrize("concurrency", CONCURRENCY_LEVELS)
+def test_execute_in_workspaces(fake_claude, bench, concurrency):
+    """End to end: one workspace per agent, as the orchestrator runs them"""
+    fake_claude(latency="uniform:0.1,0.3")
+    interface = _interface(concurrency)
+    manager = WorkspaceManager()
+    
+    async def one(index: int):
+        async with manager.isolated_workspace(f"bench{index}") as workspace:
+            return await interface.run_limited(
+                lambda: interface.execute(f"prompt {index}", workspace)
+            )
+    
+    async def run():
+        return await asyncio.gather(*(one(index) for index in range(concurrency)))
+    
+    with bench.measure("execute in workspaces", tasks=concurrency, concurrency=concurrency):
+        results = asyncio.run(run())
+    
+    assert not _failures(results)
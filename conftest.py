@@ -0,0 +1,53 @@
+"""
+conftest.py - Fixtures shared by the unit tests
+
+Tests that need a CLI drive the real wrapper against scripts/fake_claude.py.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT))
+
+# src.core.logging sets up its handlers on import: keep test runs from
+# writing logs/research_*.log
+os.environ["LOG_TO_FILE"] = "false"
+os.environ["LOG_LEVEL"] = "WARNING"
+
+from src.core.config import reset_config
+
+FAKE_CLAUDE = ROOT / "scripts" / "fake_claude.py"
+
+
+@pytest.fixture
+def fake_claude(monkeypatch, tmp_path):
+    """
+    Point the wrapper at the fake CLI with an isolated configuration.
+    Returns a function that sets FAKE_CLAUDE_* options by keyword.
+    """
+    monkeypatch.setenv("CLAUDE_CLI_PATH", str(FAKE_CLAUDE))
+    monkeypatch.setenv("CLAUDE_RETRY_ATTEMPTS", "0")
+    monkeypatch.setenv("CLAUDE_CIRCUIT_ENABLED", "false")
+    monkeypatch.setenv("TOKEN_DAILY_BUDGET", "0")
+    monkeypatch.setenv("TOKEN_LEDGER_PATH", str(tmp_path / "token_usage.db"))
+    monkeypatch.setenv("CACHE_ENABLED", "false")
+    monkeypatch.setenv("CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("LOG_TO_FILE", "false")
+    monkeypatch.setenv("LOG_LEVEL", "WARNING")
+    monkeypatch.setenv("WORKSPACE_BASE_DIR", str(tmp_path / "workspaces"))
+    monkeypatch.setenv("USE_GIT_WORKTREES", "false")
+    monkeypatch.setenv("AGENT_DIR", str(tmp_path / "agents"))
+    monkeypatch.setenv("FAKE_CLAUDE_SESSION_DIR", str(tmp_path / "sessions"))
+    monkeypatch.setenv("FAKE_CLAUDE_LATENCY", "fixed:0")
+    reset_config()
+    
+    def configure(**settings):
+        for key, value in settings.items():
+            monkeypatch.setenv(f"FAKE_CLAUDE_{key.upper()}", str(value))
+    
+    yield configure
+    reset_config()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+scripts/benchmark_logging.py
+
+Measure event-loop latency under heavy logging with synchronous handlers
+versus the queue-based (LOG_ASYNC) pipeline.
+"""
+
+import sys
+import os
+import logging
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.config import get_config
+from src.core import logging as research_logging
+from src.core.logging import (
+    setup_logging,
+    get_logger,
+    get_dropped_log_count,
+    stop_logging_listener
+)
+
+
+def _listener_handlers():
+    return research_logging._queue_listener.handlers
+
+
+async def measure_loop_lag(stop: asyncio.Event, interval: float, lags: list):
+    """Record how late a periodic timer fires"""
+    loop = asyncio.get_event_loop()
+    while not stop.is_set():
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lags.append(max(0.0, loop.time() - expected) * 1000)
+
+
+class SlowStorageFilter(logging.Filter):
+    """Simulate slow storage (NFS, busy disk) by stalling each write"""
+    
+    def __init__(self, delay: float):
+        super().__init__()
+        self.delay = delay
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        time.sleep(self.delay)
+        return True
+
+
+async def log_heavily(logger, records: int):
+    for i in range(records):
+        logger.info(
+            "Benchmark record",
+            extra={'agent_name': f"agent-{i % 50}", 'execution_time': i * 0.001}
+        )
+        await asyncio.sleep(0)
+
+
+async def run_mode(async_logging: bool, args) -> dict:
+    config = get_config()
+    config.logging.async_logging = async_logging
+    config.logging.drop_policy = args.drop_policy
+    config.logging.queue_size = args.queue_size
+    root_logger = setup_logging()
+    logger = get_logger("benchmark")
+    
+    if args.io_delay_ms:
+        # The file handler sits behind the queue listener in async mode
+        handlers = (
+            _listener_handlers() if async_logging else root_logger.handlers
+        )
+        for handler in handlers:
+            if isinstance(handler, logging.FileHandler):
+                handler.addFilter(SlowStorageFilter(args.io_delay_ms / 1000))
+    
+    lags: list = []
+    stop = asyncio.Event()
+    ticker = asyncio.ensure_future(measure_loop_lag(stop, 0.001, lags))
+    
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        log_heavily(logger, args.records // args.writers)
+        for _ in range(args.writers)
+    ])
+    elapsed = time.perf_counter() - start
+    
+    stop.set()
+    await ticker
+    dropped = get_dropped_log_count()
+    stop_logging_listener()
+    
+    lags.sort()
+    return {
+        'records_per_sec': args.records / elapsed,
+        'lag_p50': statistics.median(lags) if lags else 0.0,
+        'lag_p99': lags[int(len(lags) * 0.99)] if lags else 0.0,
+        'lag_max': lags[-1] if lags else 0.0,
+        'dropped': dropped
+    }
+
+
+async def run(args, out):
+    config = get_config()
+    config.logging.log_to_file = True
+    config.logging.level = "INFO"
+    
+    with tempfile.TemporaryDirectory() as log_dir:
+        config.logging.log_dir = Path(log_dir)
+        results = {
+            'sync': await run_mode(False, args),
+            'queue': await run_mode(True, args)
+        }
+    
+    out.write(
+        f"{args.records} records from {args.writers} writers, "
+        f"drop policy {args.drop_policy}, queue size {args.queue_size}, "
+        f"simulated I/O delay {args.io_delay_ms} ms\n\n"
+    )
+    out.write(f"{'mode':>6}  {'rec/s':>10}  {'lag p50 ms':>10}  {'p99 ms':>8}  {'max ms':>8}  {'dropped':>8}\n")
+    out.write("-" * 60 + "\n")
+    for mode, r in results.items():
+        out.write(
+            f"{mode:>6}  {r['records_per_sec']:>10.0f}  {r['lag_p50']:>10.3f}  "
+            f"{r['lag_p99']:>8.3f}  {r['lag_max']:>8.3f}  {r['dropped']:>8}\n"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark event-loop latency under heavy logging"
+    )
+    parser.add_argument("-n", "--records", type=int, default=20000)
+    parser.add_argument("-w", "--writers", type=int, default=10)
+    parser.add_argument("--queue-size", type=int, default=10000)
+    parser.add_argument(
+        "--io-delay-ms",
+        type=float,
+        default=0.0,
+        help="Simulated per-record storage latency"
+    )
+    parser.add_argument(
+        "--drop-policy",
+        choices=["drop_newest", "drop_oldest", "block"],
+        default="drop_newest"
+    )
+    args = parser.parse_args()
+    
+    # Console output goes to /dev/null so the terminal doesn't dominate
+    out = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        asyncio.run(run(args, out))
+    finally:
+        sys.stdout.close()
+        sys.stdout = out
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+scripts/benchmark_prompt_delivery.py
+
+Compare CLI spawn latency for argv vs stdin prompt delivery across prompt
+sizes. Runs against scripts/fake_claude.py (with no simulated latency) by
+default; --cli takes another stand-in. The circuit breaker and token
+budget are switched off so failures are reported rather than refused.
+"""
+
+import sys
+import os
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.config import get_config
+from src.core.exceptions import ClaudeError
+from src.claude.cli_interface import ClaudeInterface
+
+
+FAKE_CLAUDE = Path(__file__).parent / "fake_claude.py"
+
+DEFAULT_SIZES = [1024, 16 * 1024, 64 * 1024, 127 * 1024, 256 * 1024, 1024 * 1024]
+
+
+async def time_delivery(interface: ClaudeInterface, mode: str, size: int, iterations: int):
+    """Return per-run latencies in ms, or the error that prevented spawning"""
+    interface.config.claude.prompt_delivery = mode
+    prompt = "x" * size
+    latencies = []
+    
+    for _ in range(iterations):
+        start = time.perf_counter()
+        try:
+            result = await interface.execute(prompt, use_cache=False, retry=False)
+        except OSError as e:
+            return None, e.strerror or str(e)
+        except ClaudeError as e:
+            return None, str(e)
+        if not result.success:
+            return None, f"exit code {result.exit_code}"
+        latencies.append((time.perf_counter() - start) * 1000)
+    
+    return latencies, None
+
+
+def format_size(size: int) -> str:
+    return f"{size // 1024} KiB" if size < 1024 * 1024 else f"{size // (1024 * 1024)} MiB"
+
+
+async def run(args):
+    # Measure spawning, not the stand-in's reply
+    os.environ.setdefault("FAKE_CLAUDE_LATENCY", "fixed:0")
+    
+    config = get_config()
+    config.claude.cli_path = args.cli
+    config.claude.circuit_enabled = False
+    config.tokens.enforce_budget = False
+    # Keep the stand-in's usage out of the real token ledger
+    config.tokens.ledger_path = Path(tempfile.mkdtemp()) / "token_usage.db"
+    interface = ClaudeInterface()
+    
+    print(f"CLI stand-in: {args.cli}  iterations: {args.iterations}\n")
+    print(f"{'prompt':>10}  {'mode':>6}  {'median ms':>10}  {'p95 ms':>10}")
+    print("-" * 44)
+    
+    for size in args.sizes:
+        for mode in ("argv", "stdin"):
+            latencies, error = await time_delivery(
+                interface, mode, size, args.iterations
+            )
+            if error:
+                print(f"{format_size(size):>10}  {mode:>6}  {'failed: ' + error:>22}")
+                continue
+            latencies.sort()
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+            print(
+                f"{format_size(size):>10}  {mode:>6}  "
+                f"{statistics.median(latencies):>10.2f}  {p95:>10.2f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark argv vs stdin prompt delivery"
+    )
+    parser.add_argument(
+        "--cli",
+        default=str(FAKE_CLAUDE),
+        help="Executable standing in for the Claude CLI"
+    )
+    parser.add_argument("-n", "--iterations", type=int, default=20)
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="Prompt sizes in bytes"
+    )
+    
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -256,6 +256,7 @@ class SetupChecker:
         env_vars = [
             ("CLAUDE_CLI_PATH", "claude"),
             ("TOKEN_DAILY_BUDGET", "100000"),
+            ("TOKEN_ENFORCE_BUDGET", "false"),
             ("CLAUDE_MAX_CONCURRENT", "3"),
         ]
         
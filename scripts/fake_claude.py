@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+scripts/fake_claude.py
+
+Stand-in for the `claude` CLI for benchmarks and offline runs. Accepts the
+same invocation the wrapper uses (`claude -p <prompt>` or the prompt on
+stdin) and simulates latency, output volume, exit codes and stderr.
+
+Behaviour is configured by FAKE_CLAUDE_* environment variables, or by a
+JSON file named in FAKE_CLAUDE_CONFIG whose keys are the same names in
+lower case without the prefix (environment wins):
+
+    FAKE_CLAUDE_LATENCY       fixed:S | uniform:A,B | normal:MU,SIGMA |
+                              lognormal:MU,SIGMA | exponential:MEAN
+                              (seconds, default fixed:0.05)
+    FAKE_CLAUDE_OUTPUT_BYTES  bytes of stdout to produce (default 256)
+    FAKE_CLAUDE_CHUNKS        chunks the output is streamed in (default 4)
+    FAKE_CLAUDE_EXIT_CODES    weighted exit codes, e.g. "0:0.95,1:0.05"
+    FAKE_CLAUDE_STDERR        text written to stderr
+    FAKE_CLAUDE_STDERR_ON     failure | always (default failure)
+    FAKE_CLAUDE_TASKS         tasks emitted for planner prompts (default 5)
+    FAKE_CLAUDE_RATE_LIMIT_UNTIL
+                              Unix time before which every call fails with
+                              "Claude AI usage limit reached|<time>"
+    FAKE_CLAUDE_HANG          fraction of calls that go silent after their
+                              first chunk and never exit (default 0)
+    FAKE_CLAUDE_TOOL_PROCS    background "tool" processes each call starts
+                              and leaves running (default 0)
+    FAKE_CLAUDE_ALLOC_MB      memory each call allocates and touches (default 0)
+    FAKE_CLAUDE_BURN_CPU      CPU seconds each call spins for (default 0)
+    FAKE_CLAUDE_CALL_LOG      file to append "<time> <pid>" to per call
+    FAKE_CLAUDE_SESSION_DIR   where sessions are kept for --resume
+                              (default: fake_claude_sessions in the temp dir)
+    FAKE_CLAUDE_SEED          random seed (default: per process)
+
+With `--output-format json` the reply is wrapped in a result envelope
+with session id, cost and token usage (about four characters per token).
+`--output-format stream-json` prints one event per line instead: an init
+event, the reply as assistant messages (one per chunk) and the envelope.
+
+Every call starts a session, recorded before any output. `--resume <id>`
+continues one started from the same directory, replying to its original
+prompt and reporting that prompt as cache reads rather than input; an
+unknown id fails the way the CLI does.
+
+Prompts addressed to the planner, synthesizer or critic agents get
+replies in the shape the orchestrator expects, so whole research runs
+can be driven offline.
+
+Point the wrapper at it with CLAUDE_CLI_PATH=scripts/fake_claude.py.
+Only the standard library is used, to keep process start-up cheap.
+"""
+
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+VERSION = "fake-claude 1.0.0"
+
+DEFAULTS = {
+    'latency': "fixed:0.05",
+    'output_bytes': "256",
+    'chunks': "4",
+    'exit_codes': "0:1",
+    'stderr': "",
+    'stderr_on': "failure",
+    'tasks': "5",
+    'rate_limit_until': "",
+    'hang': "0",
+    'tool_procs': "0",
+    'alloc_mb': "0",
+    'burn_cpu': "0",
+    'call_log': "",
+    'session_dir': "",
+    'seed': ""
+}
+
+
+def load_settings() -> dict:
+    settings = dict(DEFAULTS)
+    
+    config_path = os.environ.get("FAKE_CLAUDE_CONFIG")
+    if config_path:
+        with open(config_path, "r", encoding="utf-8") as f:
+            settings.update({k: str(v) for k, v in json.load(f).items()})
+    
+    for key in DEFAULTS:
+        value = os.environ.get(f"FAKE_CLAUDE_{key.upper()}")
+        if value is not None:
+            settings[key] = value
+    return settings
+
+
+def sample_latency(spec: str, rng: random.Random) -> float:
+    kind, _, params = spec.partition(":")
+    values = [float(v) for v in params.split(",") if v]
+    
+    if kind == "fixed":
+        latency = values[0]
+    elif kind == "uniform":
+        latency = rng.uniform(values[0], values[1])
+    elif kind == "normal":
+        latency = rng.gauss(values[0], values[1])
+    elif kind == "lognormal":
+        latency = rng.lognormvariate(values[0], values[1])
+    elif kind == "exponential":
+        latency = rng.expovariate(1.0 / values[0])
+    else:
+        raise ValueError(f"Unknown latency distribution: {spec}")
+    return max(latency, 0.0)
+
+
+def sample_exit_code(spec: str, rng: random.Random) -> int:
+    codes, weights = [], []
+    for entry in spec.split(","):
+        code, _, weight = entry.partition(":")
+        codes.append(int(code))
+        weights.append(float(weight or 1))
+    return rng.choices(codes, weights)[0]
+
+
+def read_prompt(argv: list) -> str:
+    if "-p" not in argv:
+        return ""
+    index = argv.index("-p")
+    if index + 1 < len(argv) and not argv[index + 1].startswith("--"):
+        return argv[index + 1]
+    return sys.stdin.read()
+
+
+def option(argv: list, name: str, default: str = None) -> str:
+    if name in argv and argv.index(name) + 1 < len(argv):
+        return argv[argv.index(name) + 1]
+    return default
+
+
+def json_envelope(
+    prompt: str,
+    text: str,
+    exit_code: int,
+    latency: float,
+    session_id: str = None,
+    context: str = ""
+) -> str:
+    """Result object in the shape `claude -p --output-format json` prints"""
+    input_tokens = len(prompt) // 4 + 1
+    output_tokens = len(text) // 4 + 1
+    cache_read_tokens = len(context) // 4
+    return json.dumps({
+        'type': "result",
+        'subtype': "success" if exit_code == 0 else "error_during_execution",
+        'is_error': exit_code != 0,
+        'duration_ms': int(latency * 1000),
+        'num_turns': 1,
+        'result': text,
+        'session_id': session_id or str(uuid.uuid4()),
+        'total_cost_usd': (input_tokens * 3 + output_tokens * 15) / 1e6,
+        'usage': {
+            'input_tokens': input_tokens,
+            'cache_creation_input_tokens': 0,
+            'cache_read_input_tokens': cache_read_tokens,
+            'output_tokens': output_tokens
+        }
+    }) + "\n"
+
+
+def role_output(prompt: str, settings: dict) -> str:
+    """Replies shaped like the orchestrator's agents, or None"""
+    if "Use helios-planner" in prompt:
+        count = int(settings['tasks'])
+        tasks = [f"Research question {index + 1}" for index in range(count)]
+        return json.dumps({'research_tasks': tasks}, indent=2) + "\n"
+    if "Use helios-synthesizer" in prompt:
+        return f"# Synthesis\n\nCombined {prompt.count('--- Snippet')} snippets.\n"
+    if "Use helios-critic" in prompt:
+        return "Critique: looks fine.\n---\n# Final Report\n\n" + prompt[-500:] + "\n"
+    return None
+
+
+def stream_json_events(
+    prompt: str,
+    text: str,
+    exit_code: int,
+    latency: float,
+    chunks: int,
+    session_id: str,
+    context: str = ""
+) -> list:
+    """Event lines in the shape `claude -p --output-format stream-json` prints"""
+    events = [json.dumps({'type': "system", 'subtype': "init", 'session_id': session_id}) + "\n"]
+    # One assistant message per chunk of whole lines, like one per turn
+    lines = text.splitlines(keepends=True)
+    size = -(-len(lines) // max(1, chunks)) if lines else 1
+    for index in range(0, len(lines), size):
+        events.append(json.dumps({
+            'type': "assistant",
+            'session_id': session_id,
+            'message': {
+                'role': "assistant",
+                'content': [{'type': "text", 'text': "".join(lines[index:index + size])}]
+            }
+        }) + "\n")
+    events.append(json_envelope(prompt, text, exit_code, latency, session_id, context))
+    return events
+
+
+def session_path(settings: dict, session_id: str) -> str:
+    directory = settings['session_dir'] or os.path.join(
+        tempfile.gettempdir(), "fake_claude_sessions"
+    )
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{session_id}.json")
+
+
+def load_session(settings: dict, session_id: str) -> dict:
+    """A session started from this directory, or None"""
+    try:
+        with open(session_path(settings, session_id), "r", encoding="utf-8") as f:
+            session = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return session if session.get('cwd') == os.getcwd() else None
+
+
+def save_session(settings: dict, session_id: str, prompt: str):
+    with open(session_path(settings, session_id), "w", encoding="utf-8") as f:
+        json.dump({'cwd': os.getcwd(), 'prompt': prompt}, f)
+
+
+def filler_output(size: int) -> str:
+    line = "The quick brown fox jumps over the lazy dog. " * 2 + "\n"
+    return (line * (size // len(line) + 1))[:size]
+
+
+def stream(text, chunks: int, latency: float, hang: bool = False):
+    """
+    Write text in chunks spread evenly over the latency; a list is written
+    one item per chunk
+    """
+    if isinstance(text, list):
+        parts = text
+    else:
+        size = -(-len(text) // max(1, chunks)) if text else 0
+        parts = [text[index * size:(index + 1) * size] for index in range(max(1, chunks))]
+    pause = latency / len(parts)
+    for part in parts:
+        time.sleep(pause)
+        if part:
+            sys.stdout.write(part)
+            sys.stdout.flush()
+        if hang:
+            while True:
+                time.sleep(3600)
+
+
+def main() -> int:
+    argv = sys.argv[1:]
+    if "--version" in argv:
+        print(VERSION)
+        return 0
+    
+    settings = load_settings()
+    rng = random.Random(settings['seed'] or None)
+    prompt = read_prompt(argv)
+    
+    if settings['call_log']:
+        with open(settings['call_log'], "a", encoding="utf-8") as f:
+            f.write(f"{time.time():.3f} {os.getpid()}\n")
+    
+    limited_until = float(settings['rate_limit_until'] or 0)
+    if time.time() < limited_until:
+        message = f"Claude AI usage limit reached|{int(limited_until)}"
+        if option(argv, "--output-format") in ("json", "stream-json"):
+            sys.stdout.write(json_envelope(prompt, message, 1, 0.0))
+        else:
+            sys.stderr.write(message + "\n")
+        return 1
+    
+    # The original prompt is already in a resumed session's context
+    context = ""
+    session_id = option(argv, "--resume")
+    if session_id:
+        session = load_session(settings, session_id)
+        if session is None:
+            sys.stderr.write(f"No conversation found with session ID: {session_id}\n")
+            return 1
+        context = session['prompt']
+    else:
+        session_id = str(uuid.uuid4())
+        save_session(settings, session_id, prompt)
+    
+    for _ in range(int(settings['tool_procs'])):
+        subprocess.Popen(
+            [sys.executable, "-c", "import time; time.sleep(3600)"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+    
+    # Resource use, to exercise the wrapper's limits
+    ballast = bytearray(int(float(settings['alloc_mb']) * 1024 * 1024))
+    for offset in range(0, len(ballast), 4096):
+        ballast[offset] = 1
+    spin_until = time.process_time() + float(settings['burn_cpu'])
+    while time.process_time() < spin_until:
+        pass
+    
+    latency = sample_latency(settings['latency'], rng)
+    exit_code = sample_exit_code(settings['exit_codes'], rng)
+    
+    output = role_output(context or prompt, settings)
+    if output is None:
+        output = filler_output(int(settings['output_bytes']))
+    if option(argv, "--output-format") == "json":
+        output = json_envelope(prompt, output, exit_code, latency, session_id, context)
+    elif option(argv, "--output-format") == "stream-json":
+        output = stream_json_events(
+            prompt, output, exit_code, latency, int(settings['chunks']), session_id, context
+        )
+    hang = rng.random() < float(settings['hang'])
+    stream(output, int(settings['chunks']), latency, hang)
+    
+    if settings['stderr'] and (exit_code != 0 or settings['stderr_on'] == "always"):
+        sys.stderr.write(settings['stderr'])
+        sys.stderr.flush()
+    
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
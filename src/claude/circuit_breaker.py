@@ -0,0 +1,203 @@
+"""
+Circuit breaker around the Claude CLI.
+When most recent executions against a CLI/model pair are failing, further
+launches fail fast with CircuitBreakerError instead of each waiting out a
+timeout; after a cool-down a single probe decides whether to resume.
+"""
+
+import time
+from collections import deque
+from enum import Enum
+from typing import Dict, Any, Optional, Deque, Tuple
+
+from ..core.config import get_config, ClaudeConfig
+from ..core.logging import get_logger
+from ..core.exceptions import CircuitBreakerError
+from ..utils.metrics import get_metrics_registry
+from .retry import FailureKind
+
+logger = get_logger(__name__)
+metrics = get_metrics_registry()
+
+STATE = metrics.gauge(
+    "circuit_breaker_state",
+    "Circuit state per CLI and model (0 closed, 1 half-open, 2 open)",
+    ["breaker"]
+)
+REJECTIONS = metrics.counter(
+    "circuit_breaker_rejections_total",
+    "Executions refused without launching because the circuit was open",
+    ["breaker"]
+)
+
+# Outcomes that say the CLI or its backend is unhealthy. Rate limits are
+# left to the rate-limit gate: a throttling backend is up.
+BREAKER_KINDS = {
+    FailureKind.TRANSIENT, FailureKind.TIMEOUT, FailureKind.STALLED, FailureKind.FATAL
+}
+
+
+class CircuitState(str, Enum):
+    """Circuit breaker states"""
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+
+
+STATE_VALUES = {CircuitState.CLOSED: 0, CircuitState.HALF_OPEN: 1, CircuitState.OPEN: 2}
+
+
+class CircuitBreaker:
+    """
+    Failure-ratio circuit breaker.
+    
+    Closed: outcomes within the last `window` seconds are kept; once at
+    least `min_calls` have been seen and the failing share reaches
+    `failure_ratio`, the circuit opens. Open: calls are refused until
+    `open_seconds` have passed. Half-open: one probe call is let through;
+    its success closes the circuit, its failure re-opens it, and other
+    calls are refused while it runs.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        failure_ratio: float = 0.5,
+        window: float = 60.0,
+        min_calls: int = 10,
+        open_seconds: float = 30.0
+    ):
+        self.name = name
+        self.failure_ratio = failure_ratio
+        self.window = window
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        
+        self.state = CircuitState.CLOSED
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.times_opened = 0
+        STATE.set(0, breaker=name)
+    
+    @classmethod
+    def from_config(cls, name: str, config: ClaudeConfig) -> "CircuitBreaker":
+        return cls(
+            name,
+            failure_ratio=config.circuit_failure_ratio,
+            window=config.circuit_window,
+            min_calls=config.circuit_min_calls,
+            open_seconds=config.circuit_open_seconds
+        )
+    
+    def _transition(self, state: CircuitState):
+        if state == self.state:
+            return
+        logger.warning(
+            f"Circuit {state.value}",
+            extra={'breaker': self.name, 'previous': self.state.value}
+        )
+        self.state = state
+        STATE.set(STATE_VALUES[state], breaker=self.name)
+    
+    def _prune(self, now: float):
+        while self._outcomes and self._outcomes[0][0] < now - self.window:
+            self._outcomes.popleft()
+    
+    def before_call(self) -> bool:
+        """
+        Admit a call or raise CircuitBreakerError. Returns True if the
+        call is the half-open probe.
+        """
+        if self.state == CircuitState.OPEN:
+            if time.monotonic() - self._opened_at < self.open_seconds:
+                self._reject()
+            self._transition(CircuitState.HALF_OPEN)
+        
+        if self.state == CircuitState.HALF_OPEN:
+            if self._probe_in_flight:
+                self._reject()
+            self._probe_in_flight = True
+            return True
+        
+        return False
+    
+    def _reject(self):
+        REJECTIONS.inc(breaker=self.name)
+        retry_in = max(self.open_seconds - (time.monotonic() - self._opened_at), 0.0)
+        raise CircuitBreakerError(
+            self.name,
+            f"Circuit breaker {self.state.value} for {self.name}"
+            + (f" (next probe in {retry_in:.0f}s)" if self.state == CircuitState.OPEN else "")
+        )
+    
+    def record(self, kind: Optional[FailureKind], probe: bool = False):
+        """Feed a call's outcome (None for success) into the breaker"""
+        failed = kind in BREAKER_KINDS
+        now = time.monotonic()
+        
+        if probe:
+            self._probe_in_flight = False
+            if failed:
+                self._open(now)
+            else:
+                self._outcomes.clear()
+                self._transition(CircuitState.CLOSED)
+            return
+        
+        if self.state != CircuitState.CLOSED:
+            # Stragglers that started before the circuit opened
+            return
+        
+        self._outcomes.append((now, failed))
+        self._prune(now)
+        failures = sum(1 for _, f in self._outcomes if f)
+        if (
+            len(self._outcomes) >= self.min_calls
+            and failures / len(self._outcomes) >= self.failure_ratio
+        ):
+            self._open(now)
+    
+    def abandon(self, probe: bool):
+        """A call ended without an outcome (e.g. cancelled)"""
+        if probe:
+            self._probe_in_flight = False
+    
+    def _open(self, now: float):
+        self._opened_at = now
+        self.times_opened += 1
+        self._transition(CircuitState.OPEN)
+    
+    def stats(self) -> Dict[str, Any]:
+        self._prune(time.monotonic())
+        return {
+            'name': self.name,
+            'state': self.state.value,
+            'window_calls': len(self._outcomes),
+            'window_failures': sum(1 for _, f in self._outcomes if f),
+            'times_opened': self.times_opened
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_config: Optional[ClaudeConfig] = None
+
+
+def get_circuit_breaker(
+    cli_path: str,
+    model: Optional[str] = None
+) -> Optional[CircuitBreaker]:
+    """Process-wide breaker for a CLI path and model, or None if disabled"""
+    global _breakers_config
+    config = get_config().claude
+    if _breakers_config is not config:
+        _breakers.clear()
+        _breakers_config = config
+    
+    if not config.circuit_enabled:
+        return None
+    
+    name = f"{cli_path}:{model or 'default'}"
+    if name not in _breakers:
+        _breakers[name] = CircuitBreaker.from_config(name, config)
+    return _breakers[name]
@@ -5,22 +5,96 @@ Handles subprocess management, output capture, and error handling.
 """
 
 import asyncio
+import codecs
+from contextlib import contextmanager
+from functools import partial
+import json
+import signal
 import subprocess
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from typing import (
+    Dict, Any, Optional, Tuple, AsyncIterator, AsyncContextManager, Union, Callable, Awaitable
+)
 from dataclasses import dataclass
 import shlex
 import os
+import time
 
 from ..core.config import get_config
 from ..core.logging import get_logger, ClaudeOutputLogger
 from ..core.exceptions import (
+    ClaudeError,
     ClaudeExecutionError,
     ClaudeTimeoutError,
-    ClaudeNotFoundError
+    ClaudeStalledError,
+    ClaudeNotFoundError,
+    CacheError,
+    RateLimitError,
+    CircuitBreakerError
+)
+from .response_cache import ResponseCache, hash_agent_definition
+from .retry import RetryPolicy, FailureKind, classify_failure, failure_diagnostics
+from .concurrency import (
+    AdaptiveLimiter, Priority, HeldSlot, hold_slot, reset_slot, without_slot
 )
+from .host_limiter import HostLimiter
+from .token_budget import get_token_budget
+from .rate_limit import get_rate_limit_gate, parse_retry_after
+from .circuit_breaker import get_circuit_breaker
+from .hedging import LatencyHistory, HedgeBudget, HEDGES, watch_spawn, notify_spawned
+from .process_tree import terminate_process_group, ensure_child_watcher
+from .resource_limits import ResourceLimits, resolve_limits, LIMIT_VIOLATIONS
+from ..utils.metrics import get_metrics_registry
+from ..utils.tracing import get_tracer
 
 logger = get_logger(__name__)
+metrics = get_metrics_registry()
+
+EXECUTIONS = metrics.counter(
+    "claude_executions_total",
+    "Claude executions by outcome (success, partial, failure, error, rejected, cached)",
+    ["outcome"]
+)
+EXECUTION_SECONDS = metrics.histogram(
+    "claude_execution_seconds",
+    "Wall-clock latency of Claude executions including retries",
+    ["outcome"]
+)
+RETRIES = metrics.counter(
+    "claude_retries_total",
+    "Additional attempts made after a retryable failure"
+)
+IN_FLIGHT = metrics.gauge(
+    "claude_executions_in_flight",
+    "Claude executions currently running"
+)
+QUEUE_DEPTH = metrics.gauge(
+    "claude_queue_depth",
+    "Executions waiting for a concurrency slot"
+)
+STALLS = metrics.counter(
+    "claude_stalls_total",
+    "Executions killed by the idle-output watchdog"
+)
+CONCURRENCY_LIMIT = metrics.gauge(
+    "claude_concurrency_limit",
+    "Current adaptive concurrency limit"
+)
+
+# Bytes read from the CLI's stdout per iteration when streaming
+STREAM_READ_SIZE = 64 * 1024
+
+# With buffer_output=False, how much of stderr's tail is kept for diagnostics
+STDERR_TAIL_SIZE = 64 * 1024
+
+# Sent when resuming an interrupted session in place of the original prompt
+RESUME_INSTRUCTION = (
+    "You were interrupted before finishing. Continue from where you left "
+    "off, then give your complete final answer."
+)
+
+# Linux rejects any single argv element longer than this (MAX_ARG_STRLEN)
+MAX_ARG_STRLEN = 128 * 1024
 
 
 @dataclass
@@ -33,6 +107,25 @@ class ClaudeResult:
     execution_time: float
     command: str
     workspace: Optional[Path] = None
+    cached: bool = False
+    attempts: int = 1
+    retry_backoff: float = 0.0
+    failure_kind: Optional[str] = None
+    input_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+    cache_read_tokens: Optional[int] = None
+    cost_usd: Optional[float] = None
+    hedged: bool = False
+    truncated: bool = False
+    session_id: Optional[str] = None
+    envelope_error: Optional[str] = None
+    
+    @property
+    def total_tokens(self) -> Optional[int]:
+        """Tokens the CLI reported for this execution, if it reported any"""
+        if self.input_tokens is None and self.output_tokens is None:
+            return None
+        return (self.input_tokens or 0) + (self.output_tokens or 0)
     
     @property
     def combined_output(self) -> str:
@@ -40,12 +133,129 @@ class ClaudeResult:
         return self.output + ("\n" + self.error if self.error else "")
 
 
+@dataclass
+class Metered:
+    """An execution's budget reservation; set ``result`` once it is known"""
+    result: Optional[ClaudeResult] = None
+
+
+def parse_json_output(raw: str) -> Optional[Dict[str, Any]]:
+    """
+    Unpack the result envelope printed with ``--output-format json``.
+    Returns None if the output isn't one (e.g. a CLI without the flag).
+    """
+    try:
+        envelope = json.loads(raw)
+    except ValueError:
+        return None
+    if not isinstance(envelope, dict) or envelope.get("type") != "result":
+        return None
+    
+    usage = envelope.get("usage") or {}
+    input_tokens = None
+    if "input_tokens" in usage:
+        # Prompt-cache writes are processed like fresh input; reads are
+        # far cheaper and reported separately
+        input_tokens = sum(
+            usage.get(key) or 0 for key in ("input_tokens", "cache_creation_input_tokens")
+        )
+    
+    return {
+        'text': envelope.get("result") or "",
+        'is_error': bool(envelope.get("is_error")),
+        'input_tokens': input_tokens,
+        'output_tokens': usage.get("output_tokens"),
+        'cache_read_tokens': usage.get("cache_read_input_tokens"),
+        'cost_usd': envelope.get("total_cost_usd", envelope.get("cost_usd")),
+        'session_id': envelope.get("session_id")
+    }
+
+
+class StreamJsonReader:
+    """
+    Incremental reader for ``--output-format stream-json`` output: one JSON
+    event per line, ending with the same result envelope as ``json``.
+    ``feed`` returns the assistant text completed by a chunk, so replies
+    can be consumed while the CLI is still running. Lines that aren't
+    events (e.g. a CLI without the flag) are passed through as text.
+    """
+    
+    def __init__(self):
+        self.envelope: Optional[Dict[str, Any]] = None
+        self.session_id: Optional[str] = None
+        self._pending = ""
+        self._text_ended_line = True
+    
+    def feed(self, text: str, final: bool = False) -> str:
+        """Consume decoded stdout and return the assistant text it completed"""
+        lines = (self._pending + text).split("\n")
+        self._pending = "" if final else lines.pop()
+        return "".join(
+            self._line(line, ended=not final or index < len(lines) - 1)
+            for index, line in enumerate(lines)
+        )
+    
+    def _text(self, text: str) -> str:
+        if text:
+            self._text_ended_line = text.endswith("\n")
+        return text
+    
+    def _line(self, line: str, ended: bool) -> str:
+        try:
+            event = json.loads(line)
+        except ValueError:
+            event = None
+        if not isinstance(event, dict):
+            return self._text(line + ("\n" if ended else ""))
+        self.session_id = self.session_id or event.get("session_id")
+        
+        if event.get("type") == "result":
+            self.envelope = parse_json_output(line)
+            return ""
+        if event.get("type") != "assistant":
+            return ""
+        
+        texts = []
+        for block in (event.get("message") or {}).get("content") or []:
+            if isinstance(block, dict) and block.get("type") == "text" and block.get("text"):
+                if not self._text_ended_line:
+                    texts.append("\n")
+                texts.append(self._text(block["text"]))
+        return "".join(texts)
+
+
+def parse_stream_json(raw: str) -> Tuple[Optional[Dict[str, Any]], str, Optional[str]]:
+    """
+    Unpack complete ``stream-json`` output. Returns the unpacked envelope
+    (None if the run never finished), the assistant text seen and the
+    session id; for an interrupted run the last two are all there is.
+    """
+    reader = StreamJsonReader()
+    text = reader.feed(raw, final=True)
+    return reader.envelope, text, reader.session_id
+
+
 class ClaudeInterface:
     """Wrapper for Claude CLI interactions"""
     
     def __init__(self):
         self.config = get_config()
         self.output_logger = ClaudeOutputLogger(logger)
+        self.cache = ResponseCache(self.config.cache)
+        self.retry_policy = RetryPolicy.from_config(self.config.claude)
+        self.concurrency_limiter = AdaptiveLimiter.from_config(self.config.claude)
+        self.host_limiter = (
+            HostLimiter(self.config.claude.host_max_concurrent, self.config.claude.runtime_dir)
+            if self.config.claude.host_max_concurrent > 0 else None
+        )
+        self.token_budget = get_token_budget()
+        self.rate_limit_gate = get_rate_limit_gate()
+        self.circuit_breaker = get_circuit_breaker(
+            self.config.claude.cli_path, self.config.claude.model
+        )
+        self.latency_history = LatencyHistory()
+        # Shared by execute_hedged() calls that don't bring their own
+        self.hedge_budget = HedgeBudget(self.config.claude.hedge_budget_ratio)
         self._verify_claude_available()
     
     def _verify_claude_available(self):
@@ -53,7 +263,7 @@ class ClaudeInterface:
         if self.config.dry_run:
             logger.info("Dry run mode - skipping Claude CLI verification")
             return
-            
+        
         try:
             result = subprocess.run(
                 [self.config.claude.cli_path, "--version"],
@@ -78,12 +288,399 @@ class ClaudeInterface:
         prompt: str,
         workspace: Optional[Path] = None,
         timeout: Optional[int] = None,
-        env_vars: Optional[Dict[str, str]] = None
+        env_vars: Optional[Dict[str, str]] = None,
+        agent_name: Optional[str] = None,
+        use_cache: Optional[bool] = None,
+        retry: bool = True,
+        token_estimate: Optional[int] = None,
+        allow_partial: bool = False,
+        resume_session: Optional[str] = None
+    ) -> ClaudeResult:
+        """
+        Execute a Claude command asynchronously.
+        
+        ``token_estimate`` is reserved against the daily token budget
+        before the CLI is spawned (the tier 1 estimate if omitted); a
+        request that doesn't fit raises TokenLimitError.
+        
+        With ``allow_partial``, a run that times out or stalls after
+        writing some output returns it (``truncated=True``,
+        ``success=False``) instead of raising or being retried.
+        
+        ``resume_session`` continues that CLI session with ``prompt`` as
+        the next message (see ClaudeSubAgentInterface.resume_agent).
+        """
+        
+        with get_tracer().span("claude.execute", "claude", agent=agent_name) as span:
+            result = await self._execute_cached(
+                prompt, workspace, timeout, env_vars, agent_name, use_cache, retry,
+                token_estimate, allow_partial, resume_session
+            )
+            if span:
+                span.set(
+                    success=result.success,
+                    cached=result.cached,
+                    attempts=result.attempts,
+                    tokens=result.total_tokens
+                )
+            return result
+    
+    async def _execute_cached(
+        self,
+        prompt: str,
+        workspace: Optional[Path],
+        timeout: Optional[int],
+        env_vars: Optional[Dict[str, str]],
+        agent_name: Optional[str],
+        use_cache: Optional[bool],
+        retry: bool,
+        token_estimate: Optional[int] = None,
+        allow_partial: bool = False,
+        resume_session: Optional[str] = None
+    ) -> ClaudeResult:
+        """Serve from the response cache or execute and record metrics"""
+        
+        use_cache = use_cache if use_cache is not None else self.cache.enabled
+        use_cache = use_cache and not self.config.dry_run
+        
+        cache_key = None
+        if use_cache:
+            cache_key = self._cache_key(prompt, agent_name, workspace)
+            cached = self._cache_lookup(cache_key, workspace)
+            if cached is not None:
+                EXECUTIONS.inc(outcome="cached")
+                return cached
+        
+        with self._metered(token_estimate, agent_name) as metered:
+            start_time = time.monotonic()
+            outcome = "error"
+            IN_FLIGHT.inc()
+            try:
+                result = metered.result = await self._execute_with_retry(
+                    prompt, workspace, timeout, env_vars, retry, allow_partial,
+                    resume_session, self.resource_limits(agent_name, workspace)
+                )
+                if result.success:
+                    outcome = "success"
+                else:
+                    outcome = "partial" if result.truncated else "failure"
+            except (CircuitBreakerError, RateLimitError):
+                outcome = "rejected"
+                raise
+            finally:
+                IN_FLIGHT.dec()
+                EXECUTIONS.inc(outcome=outcome)
+                EXECUTION_SECONDS.observe(time.monotonic() - start_time, outcome=outcome)
+        
+        if result.success:
+            self.latency_history.record(agent_name, result.execution_time)
+            if cache_key:
+                self._cache_store(cache_key, result)
+        
+        return result
+    
+    @contextmanager
+    def _metered(self, token_estimate: Optional[int], agent_name: Optional[str]):
+        """
+        Reserve an execution's token estimate (the tier 1 estimate if
+        None) against the daily budget, then settle it with the usage of
+        the ClaudeResult stored on the yielded Metered. Raises
+        TokenLimitError if the estimate doesn't fit.
+        """
+        reservation = None
+        if not self.config.dry_run:
+            reservation = self.token_budget.reserve(
+                token_estimate or self.config.tokens.tier1_estimate,
+                agent_name or "Claude execution"
+            )
+        
+        metered = Metered()
+        try:
+            yield metered
+        except (CircuitBreakerError, RateLimitError):
+            # Refused or throttled by the backend: no tokens were spent
+            self.token_budget.cancel(reservation)
+            raise
+        except BaseException as e:
+            # A timed-out or stalled run reports what it spent so far
+            result = metered.result or getattr(e, 'partial_result', None)
+            self._settle(reservation, result, agent_name)
+            raise
+        self._settle(reservation, metered.result, agent_name)
+    
+    def _settle(
+        self,
+        reservation: Optional[int],
+        result: Optional[ClaudeResult],
+        agent_name: Optional[str]
+    ):
+        # Without reported usage a success (text output) is charged the
+        # estimate; a failure (a CLI that died at start-up) isn't
+        self.token_budget.settle(
+            reservation,
+            result.input_tokens if result else None,
+            result.output_tokens if result else None,
+            agent=agent_name,
+            cost_usd=result.cost_usd if result else None,
+            cache_read_tokens=result.cache_read_tokens if result else None,
+            charge_estimate=result is not None and result.success
+        )
+    
+    async def _execute_with_retry(
+        self,
+        prompt: str,
+        workspace: Optional[Path],
+        timeout: Optional[int],
+        env_vars: Optional[Dict[str, str]],
+        retry: bool,
+        allow_partial: bool = False,
+        resume_session: Optional[str] = None,
+        limits: Optional[ResourceLimits] = None
+    ) -> ClaudeResult:
+        """Run attempts until success, a non-retryable failure, or the policy gives up"""
+        
+        attempt = 0
+        delay = 0.0
+        backoff = 0.0
+        
+        while True:
+            attempt += 1
+            result = None
+            error = None
+            
+            try:
+                result = await self._execute_once(
+                    prompt, workspace, timeout, env_vars, resume_session, limits
+                )
+            except (ClaudeError, OSError) as e:
+                error = e
+            
+            kind = classify_failure(result, error)
+            
+            partial = getattr(error, 'partial_result', None)
+            if allow_partial and partial is not None and (
+                partial.output.strip() or partial.session_id
+            ):
+                # Keep what the agent wrote (or a session to resume) rather
+                # than paying for a rerun
+                result, error = partial, None
+                break
+            
+            if not retry or not self.retry_policy.should_retry(kind, attempt):
+                break
+            
+            if kind == FailureKind.RATE_LIMITED:
+                # The attempt closed the shared gate; the next one waits on it
+                delay = self.rate_limit_gate.remaining()
+            else:
+                delay = self.retry_policy.next_delay(delay)
+            backoff += delay
+            RETRIES.inc()
+            logger.warning(
+                "Retrying Claude execution",
+                extra={
+                    'attempt': attempt,
+                    'failure_kind': kind.value,
+                    'delay': delay
+                }
+            )
+            # Neither the backoff nor the pause holds a concurrency slot
+            if kind == FailureKind.RATE_LIMITED:
+                if self.rate_limit_gate.closed:
+                    await without_slot(self.rate_limit_gate.wait())
+            else:
+                await without_slot(asyncio.sleep(delay))
+        
+        if kind == FailureKind.RATE_LIMITED and result is not None:
+            retry_after = parse_retry_after(failure_diagnostics(result))
+            error = RateLimitError(
+                retry_after=round(retry_after if retry_after is not None
+                                  else self.rate_limit_gate.remaining(), 1)
+            )
+            error.details['stderr'] = result.error[-500:]
+        
+        if error is not None:
+            if isinstance(error, (ClaudeError, RateLimitError)):
+                error.details.update({
+                    'attempts': attempt,
+                    'retry_backoff': backoff
+                })
+            raise error
+        
+        result.attempts = attempt
+        result.retry_backoff = backoff
+        result.failure_kind = kind.value if kind else None
+        return result
+    
+    async def _execute_once(
+        self,
+        prompt: str,
+        workspace: Optional[Path],
+        timeout: Optional[int],
+        env_vars: Optional[Dict[str, str]],
+        resume_session: Optional[str] = None,
+        limits: Optional[ResourceLimits] = None
     ) -> ClaudeResult:
-        """Execute a Claude command asynchronously"""
+        """Run a single attempt to completion"""
+        result = None
+        async for item in self._execute_stream(
+            prompt, workspace, timeout, env_vars, lines=False,
+            resume_session=resume_session, limits=limits
+        ):
+            if isinstance(item, ClaudeResult):
+                result = item
+        return result
+    
+    def _agent_search_dirs(self, workspace: Optional[Path]) -> list:
+        """Where the CLI looks for agent definitions, in precedence order"""
+        search_dirs = [Path(".claude/agents"), self.config.agent_dir]
+        if workspace:
+            search_dirs.insert(0, workspace / ".claude" / "agents")
+        return search_dirs
+    
+    def resource_limits(
+        self,
+        agent_name: Optional[str],
+        workspace: Optional[Path] = None
+    ) -> Optional[ResourceLimits]:
+        """Resource limits for an agent's CLI process (None if unlimited)"""
+        return resolve_limits(
+            self.config.claude, agent_name, self._agent_search_dirs(workspace)
+        )
+    
+    def _cache_key(
+        self,
+        prompt: str,
+        agent_name: Optional[str],
+        workspace: Optional[Path]
+    ) -> str:
+        """Build the response cache key for a request"""
+        agent_hash = None
+        if agent_name:
+            agent_hash = hash_agent_definition(
+                agent_name, self._agent_search_dirs(workspace)
+            )
+        
+        return ResponseCache.make_key(
+            prompt,
+            agent_name=agent_name,
+            agent_hash=agent_hash,
+            model=self.config.claude.model
+        )
+    
+    def _cache_lookup(
+        self,
+        cache_key: str,
+        workspace: Optional[Path]
+    ) -> Optional[ClaudeResult]:
+        """Return a cached result, treating cache failures as misses"""
+        try:
+            entry = self.cache.get(cache_key)
+        except CacheError as e:
+            logger.warning(f"Response cache unavailable: {e}")
+            return None
+        
+        if entry is None:
+            return None
+        
+        return ClaudeResult(
+            success=True,
+            output=entry['output'],
+            error=entry['error'],
+            exit_code=entry['exit_code'],
+            execution_time=0.0,
+            command=entry['command'],
+            workspace=workspace,
+            cached=True
+        )
+    
+    def _cache_store(self, cache_key: str, result: ClaudeResult):
+        """Store a successful result, ignoring cache failures"""
+        try:
+            self.cache.set(cache_key, {
+                'output': result.output,
+                'error': result.error,
+                'exit_code': result.exit_code,
+                'command': result.command
+            })
+        except CacheError as e:
+            logger.warning(f"Failed to cache response: {e}")
+    
+    async def execute_stream(
+        self,
+        prompt: str,
+        workspace: Optional[Path] = None,
+        timeout: Optional[int] = None,
+        env_vars: Optional[Dict[str, str]] = None,
+        lines: bool = True,
+        buffer_output: bool = True,
+        output_format: Optional[str] = None,
+        resume_session: Optional[str] = None,
+        limits: Optional[ResourceLimits] = None,
+        agent_name: Optional[str] = None,
+        token_estimate: Optional[int] = None
+    ) -> AsyncIterator[Union[str, ClaudeResult]]:
+        """
+        Execute a Claude command, yielding stdout as it arrives.
+        
+        Yields decoded stdout lines (line endings kept) or, with
+        ``lines=False``, raw decoded chunks, followed by a final
+        ``ClaudeResult``. With ``buffer_output=False`` the result's
+        ``output`` is left empty and only the last STDERR_TAIL_SIZE bytes
+        of stderr are kept, so memory stays flat for large outputs.
+        
+        With the ``stream-json`` output format (the configured default)
+        the assistant's text is yielded as each message arrives, and the
+        result carries the reply, token usage and session id from the
+        closing envelope. ``json`` reports the same but its reply only
+        arrives once complete, so the text is yielded after the process
+        exits; ``"text"`` streams raw output without usage.
+        
+        A run killed for a timeout or stall raises with the output captured
+        so far as a ``truncated`` ClaudeResult in ``partial_result``.
+        
+        Besides the wall-clock ``timeout``, a process silent on both
+        stdout and stderr for CLAUDE_IDLE_TIMEOUT seconds is killed with
+        ClaudeStalledError, freeing its slot early. Print mode can be
+        silent until it finishes, so the window must allow for that.
+        
+        ``limits`` are applied to the CLI process as it is spawned; a run
+        that dies on one fails as MEMORY_LIMIT or CPU_LIMIT, and limits
+        this process can't grant raise ConfigurationError up front.
+        
+        Like execute(), ``token_estimate`` is reserved against the daily
+        token budget before the CLI is spawned and settled with the usage
+        the run reports.
+        """
+        with self._metered(token_estimate, agent_name) as metered:
+            async for item in self._execute_stream(
+                prompt, workspace, timeout, env_vars, lines, buffer_output,
+                output_format, resume_session, limits
+            ):
+                if isinstance(item, ClaudeResult):
+                    metered.result = item
+                yield item
+    
+    async def _execute_stream(
+        self,
+        prompt: str,
+        workspace: Optional[Path] = None,
+        timeout: Optional[int] = None,
+        env_vars: Optional[Dict[str, str]] = None,
+        lines: bool = True,
+        buffer_output: bool = True,
+        output_format: Optional[str] = None,
+        resume_session: Optional[str] = None,
+        limits: Optional[ResourceLimits] = None
+    ) -> AsyncIterator[Union[str, ClaudeResult]]:
+        """Spawn the CLI once for execute_stream(), without budget accounting"""
         
         # Build command
-        cmd = self._build_command(prompt)
+        output_format = output_format or self.config.claude.output_format
+        # A json reply is only usable once the whole envelope is in
+        buffered_envelope = output_format == "json"
+        use_stdin = self._use_stdin(prompt)
+        cmd = self._build_command(prompt, use_stdin, output_format, resume_session)
         self.output_logger.log_command(cmd, workspace)
         
         # Set up environment
@@ -93,64 +690,252 @@ class ClaudeInterface:
         
         # Use specified timeout or default
         timeout = timeout or self.config.claude.default_timeout
+        idle_timeout = self.config.claude.idle_timeout
         
         # Execute
-        start_time = asyncio.get_event_loop().time()
+        loop = asyncio.get_event_loop()
+        start_time = loop.time()
+        deadline = start_time + timeout
+        
+        if self.config.dry_run:
+            # Simulate execution in dry run mode
+            await asyncio.sleep(0.1)
+            output = f"[DRY RUN] Would execute: {' '.join(cmd)}"
+            yield output
+            yield ClaudeResult(
+                success=True,
+                output=output if buffer_output else "",
+                error="",
+                exit_code=0,
+                execution_time=0.1,
+                command=' '.join(cmd),
+                workspace=workspace
+            )
+            return
+        
+        # A limit that can't be applied is a configuration error: raised
+        # before the launch, so it never counts against the breaker
+        spawn_cmd = limits.wrap(cmd) if limits else cmd
+        
+        process = None
+        stderr_task = None
+        stdin_task = None
+        host_token = None
+        breaker = self.circuit_breaker
+        breaker_recorded = False
+        
+        if self.rate_limit_gate.closed:
+            with get_tracer().span("claude.rate_limit_pause", "claude"):
+                await self.rate_limit_gate.wait()
+        
+        # Refuses the launch outright while the circuit is open
+        probe = breaker.before_call() if breaker else False
         
         try:
-            if self.config.dry_run:
-                # Simulate execution in dry run mode
-                await asyncio.sleep(0.1)
+            if self.host_limiter:
+                with get_tracer().span("claude.host_slot", "claude"):
+                    host_token = await self.host_limiter.acquire()
+            
+            # Pausing or queueing for a host slot doesn't count against the timeout
+            start_time = loop.time()
+            deadline = start_time + timeout
+            
+            # Create subprocess, leading its own process group so the
+            # tools it runs are torn down with it
+            ensure_child_watcher()
+            with get_tracer().span("claude.spawn", "claude", stdin=use_stdin):
+                process = await asyncio.create_subprocess_exec(
+                    *spawn_cmd,
+                    stdin=asyncio.subprocess.PIPE if use_stdin else None,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    cwd=str(workspace) if workspace else None,
+                    env=env,
+                    start_new_session=True
+                )
+            notify_spawned()
+            
+            if use_stdin:
+                stdin_task = asyncio.ensure_future(
+                    self._write_stdin(process, prompt)
+                )
+            
+            last_output = loop.time()
+            stderr_parts = []
+            stderr_size = 0
+            
+            def stderr_bytes() -> bytes:
+                data = b"".join(stderr_parts)
+                return data if buffer_output else data[-STDERR_TAIL_SIZE:]
+            
+            async def drain_stderr() -> bytes:
+                nonlocal last_output, stderr_size
+                while True:
+                    data = await process.stderr.read(STREAM_READ_SIZE)
+                    if not data:
+                        return stderr_bytes()
+                    last_output = loop.time()
+                    stderr_parts.append(data)
+                    stderr_size += len(data)
+                    if not buffer_output and stderr_size > 2 * STDERR_TAIL_SIZE:
+                        # Unbuffered runs keep memory flat: only the tail,
+                        # where the CLI reports why it failed, is kept
+                        stderr_parts[:] = [stderr_bytes()]
+                        stderr_size = len(stderr_parts[0])
+            
+            def partial_result() -> ClaudeResult:
+                """What the process wrote before it was cut off"""
+                if buffered_envelope:
+                    # A json envelope is useless until complete
+                    output = ""
+                elif stream_reader:
+                    output = "".join(chunks)
+                else:
+                    output = "".join(chunks) + decoder.decode(b"", final=True)
                 return ClaudeResult(
-                    success=True,
-                    output=f"[DRY RUN] Would execute: {' '.join(cmd)}",
-                    error="",
-                    exit_code=0,
-                    execution_time=0.1,
+                    success=False,
+                    output=output,
+                    error=stderr_bytes().decode('utf-8', errors='replace'),
+                    exit_code=(
+                        process.returncode if process.returncode is not None
+                        else -signal.SIGKILL
+                    ),
+                    execution_time=loop.time() - start_time,
                     command=' '.join(cmd),
-                    workspace=workspace
+                    workspace=workspace,
+                    truncated=True,
+                    session_id=stream_reader.session_id if stream_reader else None
                 )
             
-            # Create subprocess
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=str(workspace) if workspace else None,
-                env=env
-            )
+            async def watched(awaitable):
+                """Await within the deadline and the idle window"""
+                future = asyncio.ensure_future(awaitable)
+                try:
+                    while True:
+                        limit = deadline
+                        if idle_timeout:
+                            limit = min(limit, last_output + idle_timeout)
+                        done, _ = await asyncio.wait(
+                            {future}, timeout=max(limit - loop.time(), 0)
+                        )
+                        if done:
+                            return future.result()
+                        now = loop.time()
+                        if now >= deadline:
+                            raise asyncio.TimeoutError()
+                        if idle_timeout and now - last_output >= idle_timeout:
+                            STALLS.inc()
+                            raise ClaudeStalledError(
+                                f"Claude execution stalled: no output for {idle_timeout:g}s",
+                                idle_seconds=idle_timeout
+                            )
+                finally:
+                    if not future.done():
+                        future.cancel()
+            
+            # Drain stderr in the background so a chatty agent can't
+            # block on a full pipe while we read stdout
+            stderr_task = asyncio.ensure_future(drain_stderr())
+            
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            stream_reader = StreamJsonReader() if output_format == "stream-json" else None
+            chunks = []
+            pending = ""
             
-            # Wait for completion with timeout
             try:
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=timeout
-                )
+                while True:
+                    data = await watched(process.stdout.read(STREAM_READ_SIZE))
+                    if data:
+                        last_output = loop.time()
+                    at_eof = not data
+                    text = decoder.decode(data, final=at_eof)
+                    if stream_reader:
+                        # From here on, only the assistant's text
+                        text = stream_reader.feed(text, final=at_eof)
+                    
+                    if text and (buffer_output or buffered_envelope):
+                        chunks.append(text)
+                    
+                    if buffered_envelope:
+                        # Nothing usable until the whole envelope is in
+                        pass
+                    elif not lines:
+                        if text:
+                            yield text
+                    else:
+                        pending += text
+                        parts = pending.split("\n")
+                        pending = parts.pop()
+                        for part in parts:
+                            yield part + "\n"
+                        if at_eof and pending:
+                            yield pending
+                    
+                    if at_eof:
+                        break
+                
+                # Wait for completion within the remaining budget
+                stderr = await watched(stderr_task)
+                await watched(process.wait())
             except asyncio.TimeoutError:
-                # Kill the process
-                process.kill()
-                await process.wait()
                 raise ClaudeTimeoutError(
                     f"Claude execution timed out after {timeout}s",
-                    timeout_seconds=timeout
+                    timeout_seconds=timeout,
+                    partial_result=partial_result()
                 )
+            except ClaudeStalledError as e:
+                e.partial_result = partial_result()
+                raise
             
             # Decode output
-            output = stdout.decode('utf-8', errors='replace')
+            output = "".join(chunks)
             error = stderr.decode('utf-8', errors='replace')
             
-            execution_time = asyncio.get_event_loop().time() - start_time
+            execution_time = loop.time() - start_time
+            
+            if stream_reader:
+                envelope = stream_reader.envelope
+            else:
+                envelope = parse_json_output(output) if buffered_envelope else None
+            if envelope is not None:
+                output = envelope['text']
+            if buffered_envelope:
+                for part in (output.splitlines(keepends=True) if lines else [output]):
+                    if part:
+                        yield part
+            if not buffer_output:
+                output = ""
             
             result = ClaudeResult(
-                success=process.returncode == 0,
+                success=process.returncode == 0 and not (envelope and envelope['is_error']),
                 output=output,
                 error=error,
                 exit_code=process.returncode,
                 execution_time=execution_time,
                 command=' '.join(cmd),
-                workspace=workspace
+                workspace=workspace,
+                input_tokens=envelope['input_tokens'] if envelope else None,
+                output_tokens=envelope['output_tokens'] if envelope else None,
+                cache_read_tokens=envelope['cache_read_tokens'] if envelope else None,
+                cost_usd=envelope['cost_usd'] if envelope else None,
+                session_id=(
+                    envelope['session_id'] if envelope
+                    else stream_reader.session_id if stream_reader else None
+                ),
+                envelope_error=envelope['text'] if envelope and envelope['is_error'] else None
             )
             
+            kind = classify_failure(result)
+            if kind in (FailureKind.MEMORY_LIMIT, FailureKind.CPU_LIMIT):
+                LIMIT_VIOLATIONS.inc(limit=kind.value)
+            if kind is None:
+                self.rate_limit_gate.reset()
+            elif kind == FailureKind.RATE_LIMITED:
+                self.rate_limit_gate.trip(parse_retry_after(failure_diagnostics(result)))
+            if breaker:
+                breaker.record(kind, probe)
+                breaker_recorded = True
+            
             # Log output
             self.output_logger.log_output(
                 agent_name="claude",
@@ -158,9 +943,12 @@ class ClaudeInterface:
                 error=error if process.returncode != 0 else None
             )
             
-            return result
-            
+            yield result
+        
         except Exception as e:
+            if breaker and not breaker_recorded:
+                breaker.record(classify_failure(error=e), probe)
+                breaker_recorded = True
             # Log and re-raise
             logger.error(
                 f"Claude execution failed: {e}",
@@ -168,6 +956,25 @@ class ClaudeInterface:
                 extra={'command': ' '.join(cmd)}
             )
             raise
+        finally:
+            for task in (stdin_task, stderr_task):
+                if task is not None and not task.done():
+                    task.cancel()
+            try:
+                if process is not None:
+                    # Tear down the process group if we timed out or the
+                    # consumer stopped early, and any tools left running
+                    # after a normal exit. Shielded so a second
+                    # cancellation can't strand the group half-killed.
+                    await asyncio.shield(asyncio.ensure_future(
+                        terminate_process_group(process, self.config.claude.kill_grace)
+                    ))
+            finally:
+                if breaker and not breaker_recorded:
+                    # Cancelled, or the consumer stopped reading early
+                    breaker.abandon(probe)
+                if host_token:
+                    await self.host_limiter.release_async(host_token)
     
     def execute_sync(
         self,
@@ -182,37 +989,259 @@ class ClaudeInterface:
             self.execute(prompt, workspace, timeout, env_vars)
         )
     
-    def _build_command(self, prompt: str) -> list:
+    def _use_stdin(self, prompt: str) -> bool:
+        """Decide whether the prompt goes over stdin rather than argv"""
+        mode = self.config.claude.prompt_delivery
+        if mode != "auto":
+            return mode == "stdin"
+        
+        # Stay well clear of MAX_ARG_STRLEN; large argv also slows exec
+        threshold = min(self.config.claude.stdin_prompt_threshold, MAX_ARG_STRLEN)
+        return len(prompt.encode('utf-8')) > threshold
+    
+    async def _write_stdin(self, process, prompt: str):
+        """Stream the prompt into the CLI's stdin and close it"""
+        try:
+            process.stdin.write(prompt.encode('utf-8'))
+            await process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            # The CLI exited before reading its prompt; its exit code and
+            # stderr tell the story
+            pass
+        finally:
+            process.stdin.close()
+    
+    def _build_command(
+        self,
+        prompt: str,
+        use_stdin: bool = False,
+        output_format: str = "text",
+        resume_session: Optional[str] = None
+    ) -> list:
         """Build the Claude command"""
-        cmd = [self.config.claude.cli_path, "-p", prompt]
+        if use_stdin:
+            # With no prompt argument, print mode reads the prompt from stdin
+            cmd = [self.config.claude.cli_path, "-p"]
+        else:
+            cmd = [self.config.claude.cli_path, "-p", prompt]
+        
+        if output_format != "text":
+            cmd.extend(["--output-format", output_format])
+        if output_format == "stream-json":
+            # Print mode only streams events with --verbose
+            cmd.append("--verbose")
+        if resume_session:
+            cmd.extend(["--resume", resume_session])
         
         # Add any additional flags from config
         # Note: Based on our testing, most flags don't work as expected
         # so we keep it simple
+        if self.config.claude.model:
+            cmd.extend(["--model", self.config.claude.model])
         
         return cmd
     
     async def execute_batch(
         self,
         prompts: list[Tuple[str, Optional[Path]]],
-        max_concurrent: Optional[int] = None
+        max_concurrent: Optional[int] = None,
+        agent_name: Optional[str] = None,
+        priority: Priority = Priority.NORMAL,
+        token_estimate: Optional[int] = None,
+        hedge: Optional[bool] = None,
+        fresh_workspace: Optional[Callable[[], AsyncContextManager[Path]]] = None,
+        lease_workspace: Optional[Callable[[], AsyncContextManager[Path]]] = None,
+        use_cache: Optional[bool] = None
     ) -> list[ClaudeResult]:
-        """Execute multiple prompts with concurrency control"""
+        """
+        Execute multiple prompts with adaptive concurrency control.
+        
+        ``max_concurrent`` caps this batch only; the shared limiter's
+        limit is left alone. ``lease_workspace`` supplies a workspace for
+        each prompt without one, leased only once it holds a slot. With
+        ``hedge`` (default CLAUDE_HEDGE_ENABLED) slow executions are
+        duplicated as in execute_hedged(), within one budget for the batch;
+        ``fresh_workspace`` (default ``lease_workspace``) supplies the
+        duplicates' workspaces, and prompts with a workspace aren't hedged
+        without it.
+        """
         
-        max_concurrent = max_concurrent or self.config.claude.max_concurrent
-        semaphore = asyncio.Semaphore(max_concurrent)
+        hedge = hedge if hedge is not None else self.config.claude.hedge_enabled
+        budget = HedgeBudget(self.config.claude.hedge_budget_ratio) if hedge else None
+        batch_slots = asyncio.Semaphore(max_concurrent) if max_concurrent else None
+        fresh_workspace = fresh_workspace or lease_workspace
         
-        async def run_with_semaphore(prompt: str, workspace: Optional[Path]):
-            async with semaphore:
-                return await self.execute(prompt, workspace)
+        async def execute_one(prompt: str, workspace: Optional[Path]) -> ClaudeResult:
+            if hedge:
+                return await self.execute_hedged(
+                    prompt, workspace,
+                    agent_name=agent_name,
+                    token_estimate=token_estimate,
+                    budget=budget,
+                    fresh_workspace=fresh_workspace,
+                    use_cache=use_cache
+                )
+            return await self.execute(
+                prompt, workspace,
+                agent_name=agent_name, use_cache=use_cache, token_estimate=token_estimate
+            )
         
-        tasks = [
-            run_with_semaphore(prompt, workspace)
-            for prompt, workspace in prompts
-        ]
+        async def run(prompt: str, workspace: Optional[Path]) -> ClaudeResult:
+            if workspace is None and lease_workspace:
+                async with lease_workspace() as leased:
+                    return await execute_one(prompt, leased)
+            return await execute_one(prompt, workspace)
+        
+        async def run_one(prompt: str, workspace: Optional[Path]) -> ClaudeResult:
+            execute_fn = partial(run, prompt, workspace)
+            if batch_slots is None:
+                return await self.run_limited(execute_fn, priority=priority)
+            # Take the batch slot first so waiting on it holds no shared slot
+            async with batch_slots:
+                return await self.run_limited(execute_fn, priority=priority)
+        
+        tasks = [run_one(prompt, workspace) for prompt, workspace in prompts]
         
         return await asyncio.gather(*tasks, return_exceptions=True)
     
+    async def execute_hedged(
+        self,
+        prompt: str,
+        workspace: Optional[Path] = None,
+        agent_name: Optional[str] = None,
+        token_estimate: Optional[int] = None,
+        budget: Optional[HedgeBudget] = None,
+        fresh_workspace: Optional[Callable[[], AsyncContextManager[Path]]] = None,
+        allow_partial: bool = False,
+        use_cache: Optional[bool] = None
+    ) -> ClaudeResult:
+        """
+        Execute, launching a duplicate once this runs past the agent's
+        CLAUDE_HEDGE_PERCENTILE latency. The first to succeed is returned
+        and the other killed. Without enough latency history or budget
+        left this is a plain execute(). ``budget`` defaults to one shared
+        by every call on this interface.
+        
+        The duplicate runs in a workspace from ``fresh_workspace`` and
+        outside the concurrency limiter, which the budget keeps small. An
+        execution with a ``workspace`` but no ``fresh_workspace`` isn't
+        hedged: two agents must not work in the same directory.
+        """
+        settings = self.config.claude
+        execute = partial(
+            self.execute, prompt,
+            agent_name=agent_name,
+            use_cache=use_cache,
+            token_estimate=token_estimate,
+            allow_partial=allow_partial
+        )
+        
+        if workspace is not None and fresh_workspace is None:
+            return await execute(workspace)
+        
+        budget = budget or self.hedge_budget
+        budget.register()
+        threshold = self.latency_history.percentile(
+            agent_name, settings.hedge_percentile, settings.hedge_min_samples
+        )
+        if threshold is None:
+            return await execute(workspace)
+        
+        async def duplicate():
+            if workspace is None:
+                return await execute(None)
+            async with fresh_workspace() as hedge_workspace:
+                return await execute(hedge_workspace)
+        
+        spawned = asyncio.Event()
+        
+        async def first():
+            watch_spawn(spawned)
+            return await execute(workspace)
+        
+        primary = asyncio.ensure_future(first())
+        spawn_wait = asyncio.ensure_future(spawned.wait())
+        hedge = None
+        running = [primary]
+        try:
+            # The delay runs from the first spawn: time queued behind the
+            # rate-limit gate or for a host slot would hold up a duplicate
+            # just the same
+            await asyncio.wait(
+                {primary, spawn_wait}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not primary.done():
+                await asyncio.wait({primary}, timeout=threshold)
+            if primary.done() or not budget.try_acquire():
+                return await primary
+            
+            logger.info(
+                "Hedging slow execution",
+                extra={'agent_name': agent_name, 'threshold': round(threshold, 2)}
+            )
+            hedge = asyncio.ensure_future(duplicate())
+            running.append(hedge)
+            
+            pending = set(running)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None and task.result().success:
+                        HEDGES.inc(outcome="won" if task is hedge else "lost")
+                        result = task.result()
+                        result.hedged = task is hedge
+                        return result
+            
+            # Neither succeeded: report the primary's outcome
+            HEDGES.inc(outcome="lost")
+            return primary.result()
+        finally:
+            spawn_wait.cancel()
+            # Kill the loser (or both, if we were cancelled) and reap it
+            for task in running:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
+    
+    async def run_limited(
+        self,
+        execute_fn: Callable[[], Awaitable[Optional[ClaudeResult]]],
+        priority: Priority = Priority.NORMAL
+    ) -> Optional[ClaudeResult]:
+        """
+        Run an execution under the shared adaptive concurrency limiter.
+        ``execute_fn`` may return None when it decides not to run once it
+        holds the slot; that outcome isn't fed to the limiter.
+        """
+        
+        limiter = self.concurrency_limiter
+        # Don't hold a slot while launches are paused for a rate limit
+        await self.rate_limit_gate.wait()
+        QUEUE_DEPTH.inc()
+        try:
+            started_at = await limiter.acquire(priority)
+        finally:
+            QUEUE_DEPTH.dec()
+        
+        # Retries give the slot up while they back off
+        slot = HeldSlot(limiter, priority, started_at)
+        token = hold_slot(slot)
+        try:
+            try:
+                result = await execute_fn()
+            except Exception as e:
+                limiter.record(slot.started_at, classify_failure(error=e))
+                raise
+            if result is not None:
+                limiter.record(slot.started_at, classify_failure(result))
+            return result
+        finally:
+            reset_slot(token)
+            await slot.release()
+            CONCURRENCY_LIMIT.set(limiter.limit)
+    
     def test_connection(self) -> bool:
         """Test Claude CLI is responsive"""
         try:
@@ -229,17 +1258,25 @@ class ClaudeInterface:
 class ClaudeSubAgentInterface(ClaudeInterface):
     """Extended interface for sub-agent execution"""
     
+    @staticmethod
+    def format_agent_prompt(agent_name: str, query: str) -> str:
+        """Prompt that routes a query to a sub-agent"""
+        return f"Use {agent_name} to {query}"
+    
     async def execute_with_agent(
         self,
         agent_name: str,
         query: str,
         workspace: Optional[Path] = None,
-        timeout: Optional[int] = None
+        timeout: Optional[int] = None,
+        token_estimate: Optional[int] = None,
+        allow_partial: bool = False,
+        use_cache: Optional[bool] = None
     ) -> ClaudeResult:
         """Execute a query using a specific sub-agent"""
         
         # Format prompt for sub-agent invocation
-        prompt = f"Use {agent_name} to {query}"
+        prompt = self.format_agent_prompt(agent_name, query)
         
         # Log agent invocation
         logger.info(
@@ -251,7 +1288,10 @@ class ClaudeSubAgentInterface(ClaudeInterface):
         )
         
         # Execute
-        result = await self.execute(prompt, workspace, timeout)
+        result = await self.execute(
+            prompt, workspace, timeout, agent_name=agent_name, use_cache=use_cache,
+            token_estimate=token_estimate, allow_partial=allow_partial
+        )
         
         # Add agent context to result
         if hasattr(result, '__dict__'):
@@ -259,6 +1299,69 @@ class ClaudeSubAgentInterface(ClaudeInterface):
         
         return result
     
+    async def resume_agent(
+        self,
+        agent_name: str,
+        session_id: str,
+        workspace: Optional[Path] = None,
+        timeout: Optional[int] = None,
+        token_estimate: Optional[int] = None,
+        allow_partial: bool = False,
+        instruction: str = RESUME_INSTRUCTION
+    ) -> ClaudeResult:
+        """
+        Continue an interrupted sub-agent session with ``--resume`` instead
+        of rerunning it, so the context and turns it already consumed
+        aren't paid for twice. The CLI keeps sessions per directory: pass
+        the workspace the session ran in.
+        """
+        logger.info(
+            f"Resuming sub-agent session",
+            extra={'agent_name': agent_name, 'session_id': session_id}
+        )
+        
+        result = await self.execute(
+            instruction, workspace, timeout, agent_name=agent_name,
+            use_cache=False, token_estimate=token_estimate,
+            allow_partial=allow_partial, resume_session=session_id
+        )
+        result.__dict__['agent_name'] = agent_name
+        return result
+    
+    async def stream_with_agent(
+        self,
+        agent_name: str,
+        query: str,
+        workspace: Optional[Path] = None,
+        timeout: Optional[int] = None,
+        token_estimate: Optional[int] = None
+    ) -> AsyncIterator[Union[str, ClaudeResult]]:
+        """Stream a sub-agent's output line by line, then its ClaudeResult"""
+        
+        prompt = self.format_agent_prompt(agent_name, query)
+        
+        logger.info(
+            f"Streaming sub-agent",
+            extra={
+                'agent_name': agent_name,
+                'query_length': len(query)
+            }
+        )
+        
+        # With json output nothing would arrive until the agent finished
+        output_format = self.config.claude.output_format
+        if output_format == "json":
+            output_format = "stream-json"
+        
+        async for item in self.execute_stream(
+            prompt, workspace, timeout, output_format=output_format,
+            limits=self.resource_limits(agent_name, workspace),
+            agent_name=agent_name, token_estimate=token_estimate
+        ):
+            if isinstance(item, ClaudeResult):
+                item.__dict__['agent_name'] = agent_name
+            yield item
+    
     def verify_agent_exists(self, agent_name: str) -> bool:
         """Check if an agent definition exists"""
         agent_file = self.config.agent_dir / f"{agent_name}.md"
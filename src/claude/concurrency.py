@@ -0,0 +1,244 @@
+"""
+Adaptive concurrency control for batched Claude executions.
+Grows parallelism additively while the CLI stays healthy and backs off
+multiplicatively on rate limits and timeouts (AIMD).
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Dict, Any, Optional, Deque, Tuple, Awaitable
+
+from ..core.logging import get_logger
+from .retry import FailureKind
+
+logger = get_logger(__name__)
+
+# Outcomes that signal the backend is saturated
+CONGESTION_KINDS = {FailureKind.RATE_LIMITED, FailureKind.TIMEOUT}
+
+
+class Priority(IntEnum):
+    """Scheduling priority of an execution (lower runs first)"""
+    CRITICAL = 0    # On the job's critical path: planner, synthesizer, critic
+    NORMAL = 1      # Bulk research
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limiter with an asyncio-friendly acquire/release API"""
+    
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        backoff_factor: float = 0.5,
+        latency_tolerance: float = 2.0,
+        min_success_rate: float = 0.9,
+        adaptive: bool = True,
+        window_size: int = 50,
+        history_size: int = 1000
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max(max_limit, min_limit)
+        self.backoff_factor = backoff_factor
+        self.latency_tolerance = latency_tolerance
+        self.min_success_rate = min_success_rate
+        self.adaptive = adaptive
+        
+        self._limit = float(self._clamp(initial_limit))
+        self._in_flight = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._latency_ewma: Optional[float] = None
+        self._outcomes: Deque[bool] = deque(maxlen=window_size)
+        self._last_decrease = 0.0
+        self.history: Deque[Tuple[float, int]] = deque(maxlen=history_size)
+        self.history.append((time.time(), self.limit))
+    
+    @classmethod
+    def from_config(cls, claude_config) -> "AdaptiveLimiter":
+        return cls(
+            initial_limit=claude_config.max_concurrent,
+            max_limit=claude_config.max_concurrent_ceiling,
+            adaptive=claude_config.adaptive_concurrency
+        )
+    
+    @property
+    def limit(self) -> int:
+        """Current number of permitted concurrent executions"""
+        return int(self._limit)
+    
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+    
+    def _clamp(self, value: float) -> float:
+        return min(max(value, self.min_limit), self.max_limit)
+    
+    def _get_condition(self) -> asyncio.Condition:
+        # Created lazily (and per event loop) so the limiter can be built
+        # outside a running loop and reused across execute_sync calls
+        loop = asyncio.get_event_loop()
+        if self._condition is None or self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+        return self._condition
+    
+    def set_limit(self, limit: int):
+        """Reset the limit explicitly, e.g. from a caller-supplied max_concurrent"""
+        self._update_limit(float(self._clamp(limit)))
+    
+    async def acquire(self, priority: Priority = Priority.NORMAL) -> float:
+        """
+        Wait for a free slot; returns the start timestamp to pass to record().
+        
+        A bare limiter serves waiters in arrival order; priority only
+        matters under a FairShareScheduler.
+        """
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        return time.monotonic()
+    
+    async def release(self):
+        """Release a slot acquired with acquire()"""
+        condition = self._get_condition()
+        async with condition:
+            self._in_flight -= 1
+            condition.notify_all()
+    
+    def record(self, started_at: float, kind: Optional[FailureKind]):
+        """Feed an execution outcome into the AIMD controller"""
+        now = time.monotonic()
+        latency = now - started_at
+        success = kind is None
+        self._outcomes.append(success)
+        
+        if not self.adaptive:
+            return
+        
+        if kind in CONGESTION_KINDS:
+            # Only back off once per congestion event: executions that
+            # started before the last decrease already saw the old limit
+            if started_at >= self._last_decrease:
+                self._last_decrease = now
+                self._update_limit(self._clamp(self._limit * self.backoff_factor))
+                logger.warning(
+                    "Reducing concurrency limit",
+                    extra={'limit': self.limit, 'failure_kind': kind.value}
+                )
+            return
+        
+        if not success:
+            return
+        
+        healthy_latency = (
+            self._latency_ewma is None
+            or latency <= self._latency_ewma * self.latency_tolerance
+        )
+        self._latency_ewma = (
+            latency if self._latency_ewma is None
+            else 0.8 * self._latency_ewma + 0.2 * latency
+        )
+        
+        # Grow by roughly one slot per limit-sized window of healthy
+        # completions, and only while the current limit is actually in use
+        if (
+            healthy_latency
+            and self.success_rate >= self.min_success_rate
+            and self._in_flight >= self.limit
+        ):
+            self._update_limit(self._clamp(self._limit + 1.0 / self._limit))
+    
+    @property
+    def success_rate(self) -> float:
+        if not self._outcomes:
+            return 1.0
+        return sum(self._outcomes) / len(self._outcomes)
+    
+    def _update_limit(self, new_limit: float):
+        old_limit = self.limit
+        self._limit = new_limit
+        if self.limit != old_limit:
+            self.history.append((time.time(), self.limit))
+            if self._condition is not None:
+                # Wake waiters that may now fit under a raised limit
+                asyncio.ensure_future(self._notify())
+    
+    async def _notify(self):
+        async with self._condition:
+            self._condition.notify_all()
+    
+    def metrics(self) -> Dict[str, Any]:
+        """Current limit, utilisation and limit history"""
+        return {
+            'limit': self.limit,
+            'in_flight': self._in_flight,
+            'min_limit': self.min_limit,
+            'max_limit': self.max_limit,
+            'adaptive': self.adaptive,
+            'success_rate': self.success_rate,
+            'latency_ewma': self._latency_ewma,
+            'history': [
+                {'timestamp': ts, 'limit': limit}
+                for ts, limit in self.history
+            ]
+        }
+
+
+class HeldSlot:
+    """
+    A limiter slot held for one execution. Retries give it up while they
+    back off (see without_slot), so a failing execution's sleep doesn't
+    keep queued work from running.
+    """
+    
+    def __init__(self, limiter, priority: Priority, started_at: float):
+        self.limiter = limiter
+        self.priority = priority
+        self.started_at = started_at
+        self.held = True
+    
+    async def pause(self, awaitable: Awaitable) -> Any:
+        """Await with the slot given up, then take one again"""
+        if not self.held:
+            # Already given up, e.g. by the other half of a hedged pair
+            return await awaitable
+        self.held = False
+        await self.limiter.release()
+        result = await awaitable
+        self.started_at = await self.limiter.acquire(self.priority)
+        self.held = True
+        return result
+    
+    async def release(self):
+        if self.held:
+            self.held = False
+            await self.limiter.release()
+
+
+_current_slot: ContextVar[Optional[HeldSlot]] = ContextVar("current_slot", default=None)
+
+
+def hold_slot(slot: Optional[HeldSlot]):
+    """Make ``slot`` the current execution's slot; returns a token for reset_slot()"""
+    return _current_slot.set(slot)
+
+
+def reset_slot(token):
+    _current_slot.reset(token)
+
+
+async def without_slot(awaitable: Awaitable) -> Any:
+    """
+    Await ``awaitable`` (a retry backoff, a rate-limit pause) without the
+    limiter slot the current execution holds, if any.
+    """
+    slot = _current_slot.get()
+    if slot is None:
+        return await awaitable
+    return await slot.pause(awaitable)
@@ -0,0 +1,91 @@
+"""
+Hedged executions for tail-latency reduction.
+An execution that runs past a percentile of its agent's historical latency
+gets a duplicate launched alongside it; the first to succeed is kept and
+the other killed. A per-batch budget caps the extra spend.
+"""
+
+import asyncio
+import math
+from collections import defaultdict, deque
+from contextvars import ContextVar
+from typing import Dict, Any, Optional, Deque
+
+from ..utils.metrics import get_metrics_registry
+
+metrics = get_metrics_registry()
+
+HEDGES = metrics.counter(
+    "claude_hedges_total",
+    "Hedged executions by outcome (won, lost, over_budget)",
+    ["outcome"]
+)
+
+# Set by the execution being timed once its first process is running
+_spawned: ContextVar[Optional[asyncio.Event]] = ContextVar("hedge_spawned", default=None)
+
+
+def watch_spawn(event: asyncio.Event):
+    """Have the current task's next spawn set ``event``"""
+    _spawned.set(event)
+
+
+def notify_spawned():
+    """Called right after an execution's process is started"""
+    event = _spawned.get()
+    if event is not None:
+        event.set()
+
+
+class LatencyHistory:
+    """Recent successful execution latencies, per agent"""
+    
+    def __init__(self, size: int = 200):
+        self._samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=size))
+    
+    def record(self, agent_name: Optional[str], seconds: float):
+        self._samples[agent_name or "default"].append(seconds)
+    
+    def percentile(
+        self,
+        agent_name: Optional[str],
+        quantile: float,
+        min_samples: int = 1
+    ) -> Optional[float]:
+        """Latency at `quantile`, or None with fewer than min_samples"""
+        samples = self._samples.get(agent_name or "default")
+        if not samples or len(samples) < min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(int(quantile * len(ordered)), len(ordered) - 1)]
+
+
+class HedgeBudget:
+    """
+    Caps duplicate launches at a fraction of primary launches, which
+    bounds the extra token spend to roughly the same fraction.
+    """
+    
+    def __init__(self, ratio: float):
+        self.ratio = ratio
+        self.primaries = 0
+        self.hedges = 0
+    
+    def register(self):
+        """Count a primary execution"""
+        self.primaries += 1
+    
+    def try_acquire(self) -> bool:
+        """Take budget for one duplicate if any is left"""
+        if self.hedges + 1 > math.ceil(self.primaries * self.ratio):
+            HEDGES.inc(outcome="over_budget")
+            return False
+        self.hedges += 1
+        return True
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'ratio': self.ratio,
+            'primaries': self.primaries,
+            'hedges': self.hedges
+        }
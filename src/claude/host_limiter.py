@@ -0,0 +1,212 @@
+"""
+Host-wide concurrency limit shared by every orchestrator process.
+A counting semaphore kept in a small JSON file under a runtime directory
+and guarded by an exclusive flock; holders that have died are detected by
+PID liveness and their slots reclaimed.
+"""
+
+import asyncio
+import fcntl
+import json
+import os
+import random
+import time
+import uuid
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from ..core.logging import get_logger
+from ..utils.metrics import get_metrics_registry
+
+logger = get_logger(__name__)
+metrics = get_metrics_registry()
+
+WAIT_SECONDS = metrics.histogram(
+    "host_slot_wait_seconds",
+    "Time spent waiting for a host-wide execution slot",
+    buckets=(0.01, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+)
+
+STATE_FILE = "slots.json"
+LOCK_FILE = "slots.lock"
+
+
+def default_runtime_dir() -> Path:
+    """$XDG_RUNTIME_DIR/helios, or a per-user directory under /tmp"""
+    base = os.getenv("XDG_RUNTIME_DIR")
+    if base:
+        return Path(base) / "helios"
+    return Path("/tmp") / f"helios-{os.getuid()}"
+
+
+def process_start_time(pid: int) -> Optional[str]:
+    """Kernel start time of a process, to tell a live holder from a reused PID"""
+    try:
+        with open(f"/proc/{pid}/stat", "r") as f:
+            # Field 22; the command name (field 2) may contain spaces
+            return f.read().rsplit(")", 1)[1].split()[19]
+    except (OSError, IndexError):
+        return None
+
+
+def process_alive(pid: int, started: Optional[str] = None) -> bool:
+    """
+    Whether a process is running; with ``started`` (its recorded
+    process_start_time), also that the PID hasn't been reused since.
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    except (TypeError, OSError):
+        return False
+    
+    return started is None or started == process_start_time(pid)
+
+
+def _holder_alive(holder: Dict[str, Any]) -> bool:
+    return process_alive(holder.get("pid"), holder.get("started"))
+
+
+class HostLimiter:
+    """
+    Cross-process counting semaphore.
+    
+    Each acquisition is recorded in the state file as token -> holder
+    (pid and process start time). The file is only read and rewritten
+    under an exclusive flock, and every acquisition attempt first drops
+    holders whose process no longer exists, so slots leaked by a crashed
+    orchestrator are recovered by the next process that needs one.
+    Waiting is by polling with jittered backoff. The async methods take
+    the lock and do the file I/O in a worker thread, so a contended lock
+    never blocks the event loop.
+    """
+    
+    def __init__(
+        self,
+        slots: int,
+        runtime_dir: Optional[Path] = None,
+        poll_interval: float = 0.05,
+        max_poll_interval: float = 1.0
+    ):
+        if slots < 1:
+            raise ValueError(f"Host slots must be at least 1, got {slots}")
+        self.slots = slots
+        self.runtime_dir = Path(runtime_dir) if runtime_dir else default_runtime_dir()
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self._pid = os.getpid()
+        self._started = process_start_time(self._pid)
+        
+        self.runtime_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+        self._state_path = self.runtime_dir / STATE_FILE
+        self._lock_path = self.runtime_dir / LOCK_FILE
+    
+    def _locked_update(self, update) -> Any:
+        """Run update(holders) under the lock, persisting any changes"""
+        with open(self._lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                holders = self._read_state()
+                live = {
+                    token: holder for token, holder in holders.items()
+                    if _holder_alive(holder)
+                }
+                if len(live) != len(holders):
+                    logger.warning(
+                        "Reclaimed host slots from dead processes",
+                        extra={'reclaimed': len(holders) - len(live)}
+                    )
+                result = update(live)
+                if live != holders:
+                    self._write_state(live)
+                return result
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def _read_state(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            return json.loads(self._state_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError):
+            # Starting afresh may briefly admit more than `slots` holders,
+            # which beats wedging every process on a bad file
+            logger.warning(f"Resetting unreadable host slot state: {self._state_path}")
+            return {}
+    
+    def _write_state(self, holders: Dict[str, Dict[str, Any]]):
+        tmp_path = self._state_path.with_name(f".{STATE_FILE}.{self._pid}.tmp")
+        tmp_path.write_text(json.dumps(holders), encoding="utf-8")
+        os.replace(tmp_path, self._state_path)
+    
+    def try_acquire(self) -> Optional[str]:
+        """Take a slot if one is free; returns its token"""
+        def update(holders):
+            if len(holders) >= self.slots:
+                return None
+            token = uuid.uuid4().hex
+            holders[token] = {
+                'pid': self._pid,
+                'started': self._started,
+                'acquired_at': time.time()
+            }
+            return token
+        
+        return self._locked_update(update)
+    
+    def release(self, token: str):
+        """Give back a slot taken with try_acquire()/acquire()"""
+        self._locked_update(lambda holders: holders.pop(token, None))
+    
+    async def acquire(self) -> str:
+        """Wait for a free slot; returns its token"""
+        start = time.monotonic()
+        delay = self.poll_interval
+        while True:
+            attempt = asyncio.ensure_future(asyncio.to_thread(self.try_acquire))
+            try:
+                token = await asyncio.shield(attempt)
+            except asyncio.CancelledError:
+                # The thread may still win a slot nobody would release
+                attempt.add_done_callback(self._release_won)
+                raise
+            if token:
+                WAIT_SECONDS.observe(time.monotonic() - start)
+                return token
+            await asyncio.sleep(random.uniform(delay / 2, delay))
+            delay = min(delay * 2, self.max_poll_interval)
+    
+    async def release_async(self, token: str):
+        """release() without blocking the event loop"""
+        # Shielded so cancelling the caller can't leak the slot
+        await asyncio.shield(asyncio.to_thread(self.release, token))
+    
+    def _release_won(self, attempt: asyncio.Future):
+        if not attempt.cancelled() and attempt.exception() is None and attempt.result():
+            self.release(attempt.result())
+    
+    @asynccontextmanager
+    async def slot(self):
+        """Hold a host-wide slot for the duration of the block"""
+        token = await self.acquire()
+        try:
+            yield token
+        finally:
+            await self.release_async(token)
+    
+    def in_use(self) -> int:
+        """Live slots currently held across the host"""
+        return self._locked_update(len)
+    
+    def stats(self) -> Dict[str, Any]:
+        holders = self._locked_update(dict)
+        return {
+            'slots': self.slots,
+            'in_use': len(holders),
+            'local': sum(1 for h in holders.values() if h['pid'] == self._pid),
+            'runtime_dir': str(self.runtime_dir)
+        }
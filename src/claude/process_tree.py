@@ -0,0 +1,152 @@
+"""
+Process-tree teardown for CLI executions.
+Each CLI runs as the leader of its own process group, so the tool
+subprocesses it spawns can be signalled with it. Teardown asks the group
+to exit, escalates to SIGKILL and confirms the group is gone instead of
+leaving orphans to accumulate over a long swarm.
+"""
+
+import asyncio
+import os
+import signal
+import sys
+import threading
+from typing import Optional
+
+from ..core.logging import get_logger
+from ..utils.metrics import get_metrics_registry
+
+logger = get_logger(__name__)
+metrics = get_metrics_registry()
+
+GROUP_SIGNALS = metrics.counter(
+    "claude_process_group_signals_total",
+    "Signals sent to CLI process groups during teardown",
+    ["signal"]
+)
+ORPHANED_GROUPS = metrics.counter(
+    "claude_orphaned_process_groups_total",
+    "Process groups that still had members after teardown"
+)
+
+# How often a group is polled while waiting for it to empty
+POLL_INTERVAL = 0.05
+
+
+def group_alive(pgid: int) -> bool:
+    """Whether any process (zombies included) is left in a process group"""
+    try:
+        os.killpg(pgid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def signal_group(pgid: int, sig: int) -> bool:
+    """Signal a process group; False if it was already gone"""
+    try:
+        os.killpg(pgid, sig)
+    except ProcessLookupError:
+        return False
+    GROUP_SIGNALS.inc(signal=signal.Signals(sig).name)
+    return True
+
+
+async def _wait_for_group(pgid: int, timeout: float) -> bool:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while group_alive(pgid):
+        if loop.time() >= deadline:
+            return False
+        await asyncio.sleep(POLL_INTERVAL)
+    return True
+
+
+async def terminate_process_group(
+    process: asyncio.subprocess.Process,
+    grace: float = 5.0,
+    reap_timeout: float = 2.0
+) -> bool:
+    """
+    Tear down the process group led by ``process`` (started with
+    ``start_new_session=True``): SIGTERM, then SIGKILL for whatever is
+    left after ``grace`` seconds. Also clears out tool processes a CLI
+    that exited normally left behind. Returns False if the group still
+    had members ``reap_timeout`` seconds after SIGKILL.
+    """
+    pgid = process.pid
+    
+    if process.returncode is not None and not group_alive(pgid):
+        return True
+    
+    if signal_group(pgid, signal.SIGTERM):
+        await _wait_for_group(pgid, grace)
+    
+    if group_alive(pgid):
+        signal_group(pgid, signal.SIGKILL)
+    
+    # Reap the leader ourselves; the rest were reparented on exit
+    await process.wait()
+    if await _wait_for_group(pgid, reap_timeout):
+        return True
+    
+    ORPHANED_GROUPS.inc()
+    logger.warning(
+        "Process group still has members after SIGKILL",
+        extra={'pgid': pgid}
+    )
+    return False
+
+
+def ensure_child_watcher():
+    """
+    Use a pidfd child watcher for the running loop on Python < 3.12.
+    
+    The default ThreadedChildWatcher parks a thread per running child,
+    which adds up with hundreds of agents per host; pidfds are polled by
+    the loop itself. 3.12+ uses pidfds on its own.
+    
+    The watcher is installed once and never replaced: closing a watcher
+    drops the children registered with it (e.g. in-flight git commands),
+    whose waits then never return. The event loop policy re-attaches it
+    to each new main-thread loop; a watcher left on a loop that is no
+    longer running is moved to this one. Only the main thread's loop is
+    handled, since a watcher serves a single loop.
+    """
+    if sys.version_info >= (3, 12) or not hasattr(asyncio, "PidfdChildWatcher"):
+        return
+    if threading.current_thread() is not threading.main_thread():
+        return
+    
+    loop = asyncio.get_running_loop()
+    watcher = asyncio.get_child_watcher()
+    if isinstance(watcher, asyncio.PidfdChildWatcher):
+        if not watcher.is_active():
+            # Its old loop stopped, taking any children it was waiting on
+            watcher.attach_loop(loop)
+        return
+    if not _pidfd_supported():
+        return
+    
+    # Replacing the threaded watcher is safe: closing it is a no-op and
+    # its threads still deliver the exits of children already running
+    watcher = asyncio.PidfdChildWatcher()
+    watcher.attach_loop(loop)
+    asyncio.set_child_watcher(watcher)
+
+
+_pidfd_checked: Optional[bool] = None
+
+
+def _pidfd_supported() -> bool:
+    """pidfd_open needs Linux 5.3+"""
+    global _pidfd_checked
+    if _pidfd_checked is None:
+        try:
+            os.close(os.pidfd_open(os.getpid()))
+            _pidfd_checked = True
+        except (AttributeError, OSError):
+            _pidfd_checked = False
+    return _pidfd_checked
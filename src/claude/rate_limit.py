@@ -0,0 +1,163 @@
+"""
+Coordinated handling of CLI rate and usage limits.
+A rate-limited execution closes a process-wide gate until the limit's
+window reopens, so queued launches wait once instead of each hammering a
+throttled endpoint and failing on its own.
+"""
+
+import asyncio
+import random
+import re
+import time
+from typing import Optional
+
+from ..core.config import get_config, ClaudeConfig
+from ..core.logging import get_logger
+from ..core.exceptions import RateLimitError
+from ..utils.metrics import get_metrics_registry
+
+logger = get_logger(__name__)
+metrics = get_metrics_registry()
+
+TRIPS = metrics.counter(
+    "rate_limit_trips_total",
+    "Rate-limited executions that closed (or extended) the launch gate"
+)
+PAUSE_SECONDS = metrics.histogram(
+    "rate_limit_pause_seconds",
+    "Time launches spent waiting for the rate-limit gate to reopen",
+    buckets=(0.1, 1.0, 5.0, 15.0, 30.0, 60.0, 300.0, 900.0, 3600.0)
+)
+GATE_CLOSED = metrics.gauge(
+    "rate_limit_gate_closed",
+    "1 while launches are paused for a rate limit"
+)
+
+# "Claude AI usage limit reached|1735689600": the reset time as a Unix epoch
+EPOCH_PATTERN = re.compile(r"limit reached\|(\d{9,11})\b", re.IGNORECASE)
+
+RETRY_AFTER_PATTERN = re.compile(
+    r"(?:retry[-_ ]after|try again in|retry in|reset(?:s)? in)[\"':=\s]*"
+    r"(\d+(?:\.\d+)?)\s*(ms|milliseconds?|s|secs?|seconds?|m|mins?|minutes?|h|hrs?|hours?)?\b",
+    re.IGNORECASE
+)
+
+UNIT_SECONDS = {'ms': 0.001, 'm': 60.0, 'h': 3600.0}
+
+
+def parse_retry_after(text: str, now: Optional[float] = None) -> Optional[float]:
+    """Seconds until a rate limit lifts, from a hint in CLI output, or None"""
+    now = now if now is not None else time.time()
+    
+    match = EPOCH_PATTERN.search(text)
+    if match:
+        return max(float(match.group(1)) - now, 0.0)
+    
+    match = RETRY_AFTER_PATTERN.search(text)
+    if match:
+        unit = (match.group(2) or "s").lower()
+        if unit.startswith("ms") or unit.startswith("milli"):
+            scale = UNIT_SECONDS['ms']
+        else:
+            scale = UNIT_SECONDS.get(unit[0], 1.0)
+        return float(match.group(1)) * scale
+    
+    return None
+
+
+class RateLimitGate:
+    """
+    Shared pause for every launch after a rate limit.
+    
+    trip() closes the gate until the hinted reset time, or for a
+    decorrelated-jitter backoff that grows while limits keep recurring;
+    wait() blocks launches until it reopens. Waiters are released with a
+    little jitter so they don't all hit the endpoint in the same instant.
+    Pauses longer than max_wait (e.g. a daily usage limit) fail fast with
+    RateLimitError instead of parking the job for hours.
+    """
+    
+    def __init__(
+        self,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        max_wait: float = 900.0,
+        release_jitter: float = 1.0
+    ):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_wait = max_wait
+        self.release_jitter = release_jitter
+        self._reopen_at = 0.0
+        self._last_delay = 0.0
+        self.trips = 0
+    
+    @classmethod
+    def from_config(cls, config: ClaudeConfig) -> "RateLimitGate":
+        return cls(
+            base_delay=config.rate_limit_delay,
+            max_delay=config.retry_max_delay,
+            max_wait=config.rate_limit_max_wait
+        )
+    
+    @property
+    def closed(self) -> bool:
+        return self.remaining() > 0
+    
+    def remaining(self) -> float:
+        """Seconds until the gate reopens (0 when open)"""
+        return max(self._reopen_at - time.monotonic(), 0.0)
+    
+    def trip(self, retry_after: Optional[float] = None) -> float:
+        """Close the gate after a rate limit; returns the pause applied"""
+        if retry_after is None:
+            upper = max(self.base_delay, self._last_delay * 3)
+            retry_after = min(self.max_delay, random.uniform(self.base_delay, upper))
+        self._last_delay = retry_after
+        self.trips += 1
+        TRIPS.inc()
+        
+        reopen_at = time.monotonic() + retry_after
+        if reopen_at > self._reopen_at:
+            self._reopen_at = reopen_at
+            GATE_CLOSED.set(1)
+            logger.warning(
+                "Rate limited: pausing launches",
+                extra={'retry_after': round(retry_after, 1), 'trips': self.trips}
+            )
+        return retry_after
+    
+    def reset(self):
+        """An execution got through: the next backoff starts small again"""
+        self._last_delay = 0.0
+    
+    async def wait(self) -> float:
+        """Block until the gate is open; returns the time spent waiting"""
+        start = time.monotonic()
+        while True:
+            remaining = self.remaining()
+            if remaining <= 0:
+                break
+            if remaining > self.max_wait:
+                raise RateLimitError(retry_after=round(remaining, 1))
+            await asyncio.sleep(remaining + random.uniform(0, self.release_jitter))
+        
+        GATE_CLOSED.set(0)
+        waited = time.monotonic() - start
+        if waited > 0.001:
+            PAUSE_SECONDS.observe(waited)
+        return waited
+
+
+_gate: Optional[RateLimitGate] = None
+_gate_config: Optional[ClaudeConfig] = None
+
+
+def get_rate_limit_gate() -> RateLimitGate:
+    """Get the process-wide rate-limit gate"""
+    global _gate, _gate_config
+    config = get_config().claude
+    if _gate is None or _gate_config is not config:
+        _gate = RateLimitGate.from_config(config)
+        _gate_config = config
+    return _gate
@@ -0,0 +1,234 @@
+"""
+Per-agent resource limits for spawned CLI processes.
+Memory, CPU time, nice level and CPU affinity come from CLAUDE_LIMIT_*
+defaults, a `resource_limits` block in the agent's frontmatter, and
+CLAUDE_AGENT_LIMITS overrides, so one runaway agent can't starve every
+other researcher on the host.
+"""
+
+import os
+import resource
+import shutil
+from dataclasses import dataclass, fields, replace
+from pathlib import Path
+from typing import Dict, Any, Optional, FrozenSet, Tuple, List
+
+import yaml
+
+from ..core.config import ClaudeConfig
+from ..core.logging import get_logger
+from ..core.exceptions import ConfigurationError
+from ..utils.metrics import get_metrics_registry
+
+logger = get_logger(__name__)
+metrics = get_metrics_registry()
+
+LIMIT_VIOLATIONS = metrics.counter(
+    "claude_resource_limit_violations_total",
+    "Executions that failed on a resource limit",
+    ["limit"]
+)
+
+# SIGXCPU arrives at the soft CPU limit; SIGKILL follows at the hard one
+CPU_HARD_LIMIT_GRACE = 5
+
+MB = 1024 * 1024
+
+# prlimit(1) option for each rlimit
+PRLIMIT_OPTIONS = {
+    resource.RLIMIT_AS: "as",
+    resource.RLIMIT_DATA: "data",
+    resource.RLIMIT_CPU: "cpu",
+}
+
+
+def _tool(name: str) -> str:
+    path = shutil.which(name)
+    if not path:
+        raise ConfigurationError(
+            f"{name} is needed to apply resource limits but isn't on PATH"
+        )
+    return path
+
+
+def parse_cpu_list(value: Any) -> FrozenSet[int]:
+    """CPU set from "0-3,6" or a list of CPU numbers"""
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return frozenset(int(cpu) for cpu in value)
+    cpus = set()
+    for part in str(value).split(","):
+        part = part.strip()
+        if not part:
+            continue
+        low, _, high = part.partition("-")
+        cpus.update(range(int(low), int(high or low) + 1))
+    return frozenset(cpus)
+
+
+@dataclass(frozen=True)
+class ResourceLimits:
+    """
+    Limits for one CLI process (None leaves a setting alone).
+    
+    memory_mb caps address space (RLIMIT_AS). Linux ignores RLIMIT_RSS,
+    so data_mb (RLIMIT_DATA, private writable memory) is the nearest
+    enforceable stand-in for resident size. Node reserves much more
+    address space than it touches, so memory_mb must be generous. Every
+    limit is per process: tools the CLI starts inherit their own copy.
+    
+    The CLI is exec'd through prlimit(1), taskset(1) and nice(1), which
+    each exec the next, so the limits hold from the CLI's first
+    instruction (every thread it starts and every tool it forks inherits
+    them) and no Python runs in the forked child. A nice level below the
+    parent's needs CAP_SYS_NICE and is skipped without it.
+    """
+    memory_mb: Optional[int] = None
+    data_mb: Optional[int] = None
+    cpu_seconds: Optional[int] = None
+    nice: Optional[int] = None
+    cpu_affinity: Optional[FrozenSet[int]] = None
+    
+    @classmethod
+    def from_config(cls, config: ClaudeConfig) -> "ResourceLimits":
+        """Defaults for every agent from CLAUDE_LIMIT_*"""
+        return cls(
+            memory_mb=config.limit_memory_mb or None,
+            data_mb=config.limit_data_mb or None,
+            cpu_seconds=config.limit_cpu_seconds or None,
+            nice=config.limit_nice,
+            cpu_affinity=parse_cpu_list(config.limit_cpu_affinity) or None
+        )
+    
+    @classmethod
+    def from_mapping(cls, values: Dict[str, Any]) -> "ResourceLimits":
+        """Limits from a frontmatter or CLAUDE_AGENT_LIMITS mapping"""
+        names = {f.name for f in fields(cls)}
+        unknown = set(values) - names
+        if unknown:
+            raise ConfigurationError(
+                f"Unknown resource limits: {', '.join(sorted(unknown))}"
+            )
+        try:
+            return cls(**{
+                name: (
+                    parse_cpu_list(value) if name == "cpu_affinity" else int(value)
+                ) if value is not None else None
+                for name, value in values.items()
+            })
+        except (TypeError, ValueError) as e:
+            raise ConfigurationError(f"Invalid resource limits {values}: {e}")
+    
+    def merged(self, other: "ResourceLimits") -> "ResourceLimits":
+        """These limits with the settings `other` makes taking precedence"""
+        return replace(self, **{
+            f.name: getattr(other, f.name)
+            for f in fields(other) if getattr(other, f.name) is not None
+        })
+    
+    def __bool__(self) -> bool:
+        return any(getattr(self, f.name) is not None for f in fields(self))
+    
+    def rlimits(self) -> Dict[int, Tuple[int, int]]:
+        limits = {}
+        if self.memory_mb:
+            limits[resource.RLIMIT_AS] = (self.memory_mb * MB,) * 2
+        if self.data_mb:
+            limits[resource.RLIMIT_DATA] = (self.data_mb * MB,) * 2
+        if self.cpu_seconds:
+            limits[resource.RLIMIT_CPU] = (
+                self.cpu_seconds, self.cpu_seconds + CPU_HARD_LIMIT_GRACE
+            )
+        return limits
+    
+    def wrap(self, cmd: List[str]) -> List[str]:
+        """
+        ``cmd`` run under these limits. Each wrapper execs the next, so
+        the CLI keeps the PID and process group it was spawned with.
+        
+        Raises ConfigurationError for limits this process can't grant (a
+        limit above its own hard limit, CPUs outside its affinity) or a
+        missing tool, before anything is spawned.
+        """
+        wrapped = []
+        
+        rlimits = self.rlimits()
+        if rlimits:
+            options = []
+            for which, (soft, hard) in rlimits.items():
+                _, parent_hard = resource.getrlimit(which)
+                if parent_hard != resource.RLIM_INFINITY:
+                    if soft > parent_hard:
+                        raise ConfigurationError(
+                            f"Resource limit {PRLIMIT_OPTIONS[which]}={soft} exceeds "
+                            f"this process's hard limit of {parent_hard}"
+                        )
+                    hard = min(hard, parent_hard)
+                options.append(f"--{PRLIMIT_OPTIONS[which]}={soft}:{hard}")
+            wrapped += [_tool("prlimit"), *options, "--"]
+        
+        if self.cpu_affinity:
+            allowed = os.sched_getaffinity(0)
+            if not self.cpu_affinity <= allowed:
+                raise ConfigurationError(
+                    f"CPU affinity {sorted(self.cpu_affinity)} is outside the "
+                    f"CPUs this process may use ({sorted(allowed)})"
+                )
+            cpus = ",".join(str(cpu) for cpu in sorted(self.cpu_affinity))
+            wrapped += [_tool("taskset"), "--cpu-list", cpus]
+        
+        if self.nice is not None:
+            increment = self.nice - os.getpriority(os.PRIO_PROCESS, 0)
+            if increment > 0 or (increment < 0 and os.geteuid() == 0):
+                wrapped += [_tool("nice"), "-n", str(increment)]
+        
+        return wrapped + list(cmd)
+
+
+_frontmatter_cache: Dict[Path, Tuple[float, ResourceLimits]] = {}
+
+
+def frontmatter_limits(agent_file: Path) -> ResourceLimits:
+    """The `resource_limits` block of an agent definition's frontmatter"""
+    mtime = agent_file.stat().st_mtime
+    cached = _frontmatter_cache.get(agent_file)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    
+    limits = ResourceLimits()
+    text = agent_file.read_text(encoding="utf-8")
+    if text.startswith("---"):
+        header = text[3:].split("\n---", 1)[0]
+        try:
+            block = (yaml.safe_load(header) or {}).get("resource_limits")
+            if block:
+                limits = ResourceLimits.from_mapping(block)
+        except (yaml.YAMLError, AttributeError, ConfigurationError) as e:
+            logger.warning(
+                f"Ignoring resource limits in {agent_file}: {e}"
+            )
+    
+    _frontmatter_cache[agent_file] = (mtime, limits)
+    return limits
+
+
+def resolve_limits(
+    config: ClaudeConfig,
+    agent_name: Optional[str],
+    search_dirs: list
+) -> Optional[ResourceLimits]:
+    """
+    Limits for an agent: CLAUDE_LIMIT_* defaults, overridden by the first
+    definition found in search_dirs, overridden by CLAUDE_AGENT_LIMITS.
+    None when nothing is limited.
+    """
+    limits = ResourceLimits.from_config(config)
+    if agent_name:
+        for directory in search_dirs:
+            agent_file = Path(directory) / f"{agent_name}.md"
+            if agent_file.is_file():
+                limits = limits.merged(frontmatter_limits(agent_file))
+                break
+        overrides = config.agent_limits.get(agent_name)
+        if overrides:
+            limits = limits.merged(ResourceLimits.from_mapping(overrides))
+    return limits or None
@@ -0,0 +1,121 @@
+"""
+Content-addressed response cache for Claude CLI executions.
+Identical prompts against the same agent definition and model are served
+from disk instead of paying latency and tokens again.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+import diskcache
+
+from ..core.config import get_config, CacheConfig
+from ..core.logging import get_logger, PerformanceLogger
+from ..core.exceptions import CacheError
+
+logger = get_logger(__name__)
+
+
+class ResponseCache:
+    """Disk-backed response cache with TTL and size-based LRU eviction"""
+    
+    def __init__(self, config: Optional[CacheConfig] = None):
+        self.config = config or get_config().cache
+        self.perf_logger = PerformanceLogger(logger)
+        self._cache: Optional[diskcache.Cache] = None
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.config.enabled
+    
+    def _open(self) -> diskcache.Cache:
+        """Open the underlying cache lazily"""
+        if self._cache is None:
+            try:
+                self._cache = diskcache.Cache(
+                    str(self.config.cache_dir / "responses"),
+                    size_limit=self.config.max_size_mb * 1024 * 1024,
+                    eviction_policy="least-recently-used"
+                )
+            except Exception as e:
+                raise CacheError(
+                    f"Failed to open response cache: {e}",
+                    {'cache_dir': str(self.config.cache_dir)}
+                )
+        return self._cache
+    
+    @staticmethod
+    def make_key(
+        prompt: str,
+        agent_name: Optional[str] = None,
+        agent_hash: Optional[str] = None,
+        model: Optional[str] = None
+    ) -> str:
+        """Build a content-addressed key for a request"""
+        payload = json.dumps(
+            {
+                'prompt': prompt,
+                'agent_name': agent_name,
+                'agent_hash': agent_hash,
+                'model': model
+            },
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for a key, or None on a miss"""
+        try:
+            entry = self._open().get(key)
+        except CacheError:
+            raise
+        except Exception as e:
+            raise CacheError(f"Cache read failed: {e}", {'cache_key': key})
+        
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.perf_logger.log_cache_hit(key, len(entry.get('output', '')))
+        return entry
+    
+    def set(self, key: str, entry: Dict[str, Any]) -> None:
+        """Store an entry, expiring it after the configured TTL"""
+        try:
+            self._open().set(key, entry, expire=self.config.ttl_seconds)
+        except CacheError:
+            raise
+        except Exception as e:
+            raise CacheError(f"Cache write failed: {e}", {'cache_key': key})
+    
+    def clear(self) -> None:
+        """Remove all cached responses"""
+        self._open().clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return entry count, on-disk size and hit/miss counters"""
+        cache = self._open()
+        return {
+            'entries': len(cache),
+            'size_bytes': cache.volume(),
+            'hits': self.hits,
+            'misses': self.misses
+        }
+    
+    def close(self) -> None:
+        if self._cache is not None:
+            self._cache.close()
+            self._cache = None
+
+
+def hash_agent_definition(agent_name: str, search_dirs: list) -> Optional[str]:
+    """Hash the first agent definition found for agent_name in search_dirs"""
+    for directory in search_dirs:
+        agent_file = Path(directory) / f"{agent_name}.md"
+        if agent_file.is_file():
+            return hashlib.sha256(agent_file.read_bytes()).hexdigest()
+    return None
@@ -0,0 +1,135 @@
+"""
+Retry policy for Claude CLI executions.
+Classifies failures and spaces retries with decorrelated jitter so large
+batches ride out transient errors without synchronised retry storms.
+"""
+
+import random
+import re
+import signal
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+from ..core.config import ClaudeConfig
+from ..core.exceptions import (
+    ClaudeTimeoutError, ClaudeStalledError, ClaudeNotFoundError, RateLimitError
+)
+
+
+class FailureKind(str, Enum):
+    """Why a Claude execution failed"""
+    TRANSIENT = "transient"
+    RATE_LIMITED = "rate_limited"
+    TIMEOUT = "timeout"
+    STALLED = "stalled"
+    MEMORY_LIMIT = "memory_limit"
+    CPU_LIMIT = "cpu_limit"
+    FATAL = "fatal"
+
+
+RETRYABLE_KINDS = {
+    FailureKind.TRANSIENT,
+    FailureKind.RATE_LIMITED,
+    FailureKind.TIMEOUT,
+    FailureKind.STALLED,
+}
+
+# Exit codes that mean the CLI could not run at all
+FATAL_EXIT_CODES = {126, 127}
+
+RATE_LIMIT_PATTERN = re.compile(
+    r"rate.?limit|too many requests|\b429\b|usage limit",
+    re.IGNORECASE
+)
+
+# Allocation failures, as reported by Node, C++ and Python tools
+MEMORY_LIMIT_PATTERN = re.compile(
+    r"out of memory|cannot allocate memory|\bENOMEM\b|std::bad_alloc|MemoryError|"
+    r"heap limit",
+    re.IGNORECASE
+)
+
+FATAL_PATTERN = re.compile(
+    r"invalid api key|authentication|unauthori[sz]ed|forbidden|"
+    r"unknown option|invalid model|command not found|no conversation found",
+    re.IGNORECASE
+)
+
+
+def failure_diagnostics(result) -> str:
+    """
+    The parts of a failed result that explain the failure: stderr and an
+    error result envelope. Model output is left out, since a report that
+    merely mentions e.g. rate limits must not be taken for one.
+    """
+    return f"{result.error}\n{result.envelope_error or ''}"
+
+
+def classify_failure(result=None, error: Optional[BaseException] = None) -> Optional[FailureKind]:
+    """
+    Classify an execution outcome.
+    
+    Pass either the ClaudeResult or the exception raised by the attempt.
+    Returns None for a successful result.
+    """
+    if error is not None:
+        if isinstance(error, RateLimitError):
+            return FailureKind.RATE_LIMITED
+        if isinstance(error, ClaudeTimeoutError):
+            return FailureKind.TIMEOUT
+        if isinstance(error, ClaudeStalledError):
+            return FailureKind.STALLED
+        if isinstance(error, (ClaudeNotFoundError, FileNotFoundError, PermissionError)):
+            return FailureKind.FATAL
+        if isinstance(error, OSError):
+            # e.g. EAGAIN/ENOMEM while spawning under load
+            return FailureKind.TRANSIENT
+        return FailureKind.FATAL
+    
+    if result is None or result.success:
+        return None
+    
+    diagnostics = failure_diagnostics(result)
+    
+    if RATE_LIMIT_PATTERN.search(diagnostics):
+        return FailureKind.RATE_LIMITED
+    # Resource limits fail the same way every time: not retryable
+    if result.exit_code == -signal.SIGXCPU:
+        return FailureKind.CPU_LIMIT
+    if MEMORY_LIMIT_PATTERN.search(diagnostics):
+        return FailureKind.MEMORY_LIMIT
+    if result.exit_code in FATAL_EXIT_CODES or FATAL_PATTERN.search(diagnostics):
+        return FailureKind.FATAL
+    
+    # Unrecognised non-zero exits and signal deaths are treated as transient
+    return FailureKind.TRANSIENT
+
+
+@dataclass
+class RetryPolicy:
+    """Decorrelated-jitter retry policy"""
+    max_attempts: int = 4
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+    
+    @classmethod
+    def from_config(cls, config: ClaudeConfig) -> "RetryPolicy":
+        """Build a policy from ClaudeConfig (retry_attempts are retries after the first try)"""
+        return cls(
+            max_attempts=max(1, config.retry_attempts + 1),
+            base_delay=config.rate_limit_delay,
+            max_delay=config.retry_max_delay
+        )
+    
+    def should_retry(self, kind: Optional[FailureKind], attempt: int) -> bool:
+        """Whether another attempt should follow attempt number `attempt`"""
+        return kind in RETRYABLE_KINDS and attempt < self.max_attempts
+    
+    def next_delay(self, previous_delay: float) -> float:
+        """
+        Next sleep using decorrelated jitter:
+        min(max_delay, uniform(base_delay, previous_delay * 3))
+        """
+        upper = max(self.base_delay, previous_delay * 3)
+        return min(self.max_delay, random.uniform(self.base_delay, upper))
@@ -0,0 +1,282 @@
+"""
+Fair-share scheduling of many research jobs over one concurrency budget.
+Slots from a shared AdaptiveLimiter are handed out by weighted fair
+queuing across jobs, and by priority (then arrival) within each job.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Any, Optional, List, Tuple
+
+from ..core.logging import get_logger
+from ..utils.metrics import get_metrics_registry
+from .concurrency import AdaptiveLimiter, Priority
+from .retry import FailureKind
+
+logger = get_logger(__name__)
+metrics = get_metrics_registry()
+
+WAIT_SECONDS = metrics.histogram(
+    "scheduler_wait_seconds",
+    "Time an execution waited for a slot, by job and priority",
+    ["job", "priority"]
+)
+QUEUED = metrics.gauge(
+    "scheduler_queued",
+    "Executions waiting for a slot, by job",
+    ["job"]
+)
+
+
+@dataclass
+class _Waiter:
+    job: "_Job"
+    priority: Priority
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class _Job:
+    """Per-job queue, virtual clock and statistics"""
+    job_id: str
+    weight: float
+    max_in_flight: Optional[int] = None
+    queue: List[Tuple[int, int, _Waiter]] = field(default_factory=list)
+    virtual_finish: float = 0.0
+    in_flight: int = 0
+    submitted: int = 0
+    dispatched: int = 0
+    completed: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+    wait_by_priority: Dict[str, float] = field(default_factory=dict)
+    registered_at: float = field(default_factory=time.monotonic)
+    
+    def head(self) -> Optional[_Waiter]:
+        """First live waiter, discarding any whose caller was cancelled"""
+        while self.queue and self.queue[0][2].future.done():
+            heapq.heappop(self.queue)
+        return self.queue[0][2] if self.queue else None
+    
+    def eligible(self) -> bool:
+        return (
+            self.head() is not None
+            and (self.max_in_flight is None or self.in_flight < self.max_in_flight)
+        )
+
+
+class FairShareScheduler:
+    """
+    Weighted fair queuing over a shared AdaptiveLimiter.
+    
+    A single dispatcher acquires slots from the limiter and grants each to
+    the eligible job with the smallest virtual finish time; serving a job
+    advances its clock by 1/weight, so over time jobs receive slots in
+    proportion to their weights. A job that goes idle re-enters at the
+    current virtual time rather than banking credit. Within a job, waiters
+    are served by Priority, then first come first served.
+    
+    The shared limiter keeps its AIMD control: outcomes reported by any
+    job adjust the budget for all of them.
+    """
+    
+    def __init__(self, limiter: AdaptiveLimiter):
+        self.limiter = limiter
+        self._jobs: Dict[str, _Job] = {}
+        self._virtual_time = 0.0
+        self._sequence = itertools.count()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def register_job(
+        self,
+        job_id: str,
+        weight: float = 1.0,
+        max_in_flight: Optional[int] = None
+    ) -> "JobLimiter":
+        """Add a job and return its limiter for ClaudeInterface.concurrency_limiter"""
+        if weight <= 0:
+            raise ValueError(f"Job weight must be positive, got {weight}")
+        if job_id in self._jobs:
+            raise ValueError(f"Job already registered: {job_id}")
+        
+        self._jobs[job_id] = _Job(job_id, weight, max_in_flight)
+        logger.info(
+            "Registered job with scheduler",
+            extra={'job_id': job_id, 'weight': weight}
+        )
+        return JobLimiter(self, job_id)
+    
+    def unregister_job(self, job_id: str):
+        job = self._jobs.pop(job_id, None)
+        if job:
+            for _, _, waiter in job.queue:
+                waiter.future.cancel()
+    
+    def _ensure_dispatcher(self):
+        # Started lazily (and per event loop), like AdaptiveLimiter's condition
+        loop = asyncio.get_event_loop()
+        if self._dispatcher is None or self._dispatcher.done() or self._loop is not loop:
+            self._wakeup = asyncio.Event()
+            self._loop = loop
+            self._dispatcher = asyncio.ensure_future(self._dispatch())
+    
+    async def acquire(self, job_id: str, priority: Priority = Priority.NORMAL) -> float:
+        """Wait for this job's turn at a slot; returns the start timestamp"""
+        self._ensure_dispatcher()
+        job = self._jobs[job_id]
+        
+        if job.head() is None:
+            # Re-entering after idling: no credit for time spent idle
+            job.virtual_finish = max(job.virtual_finish, self._virtual_time)
+        
+        waiter = _Waiter(job, priority, asyncio.get_event_loop().create_future())
+        heapq.heappush(job.queue, (int(priority), next(self._sequence), waiter))
+        job.submitted += 1
+        QUEUED.inc(job=job_id)
+        self._wakeup.set()
+        
+        try:
+            return await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted a slot just as we were cancelled: hand it back
+                await self.release(job_id)
+            else:
+                QUEUED.dec(job=job_id)
+            raise
+    
+    async def release(self, job_id: str):
+        """Return a slot granted by acquire()"""
+        job = self._jobs.get(job_id)
+        if job:
+            job.in_flight -= 1
+            job.completed += 1
+        await self.limiter.release()
+        if self._wakeup:
+            # A per-job cap may have been the only thing blocking a job
+            self._wakeup.set()
+    
+    def record(self, started_at: float, kind: Optional[FailureKind]):
+        self.limiter.record(started_at, kind)
+    
+    def _pick(self) -> Optional[_Waiter]:
+        """Pop the next waiter by weighted fair queuing"""
+        eligible = [job for job in self._jobs.values() if job.eligible()]
+        if not eligible:
+            return None
+        
+        job = min(eligible, key=lambda j: j.virtual_finish)
+        self._virtual_time = job.virtual_finish
+        job.virtual_finish += 1.0 / job.weight
+        return heapq.heappop(job.queue)[2]
+    
+    async def _dispatch(self):
+        while True:
+            if not any(job.eligible() for job in self._jobs.values()):
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            
+            started_at = await self.limiter.acquire()
+            waiter = self._pick()
+            if waiter is None:
+                # Every waiter was cancelled while we waited for the slot
+                await self.limiter.release()
+                continue
+            
+            job = waiter.job
+            wait = time.monotonic() - waiter.enqueued_at
+            job.in_flight += 1
+            job.dispatched += 1
+            job.total_wait += wait
+            job.max_wait = max(job.max_wait, wait)
+            priority = waiter.priority.name.lower()
+            job.wait_by_priority[priority] = job.wait_by_priority.get(priority, 0.0) + wait
+            QUEUED.dec(job=job.job_id)
+            WAIT_SECONDS.observe(wait, job=job.job_id, priority=priority)
+            
+            waiter.future.set_result(started_at)
+    
+    async def close(self):
+        if self._dispatcher:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+            self._dispatcher = None
+    
+    def job_stats(self, job_id: str) -> Dict[str, Any]:
+        """Throughput and wait-time statistics for one job"""
+        job = self._jobs[job_id]
+        elapsed = time.monotonic() - job.registered_at
+        return {
+            'job_id': job.job_id,
+            'weight': job.weight,
+            'queued': len([w for _, _, w in job.queue if not w.future.done()]),
+            'in_flight': job.in_flight,
+            'submitted': job.submitted,
+            'dispatched': job.dispatched,
+            'completed': job.completed,
+            'throughput_per_minute': job.completed / elapsed * 60 if elapsed else 0.0,
+            'avg_wait': job.total_wait / job.dispatched if job.dispatched else 0.0,
+            'max_wait': job.max_wait,
+            'total_wait_by_priority': dict(job.wait_by_priority)
+        }
+    
+    def stats(self) -> Dict[str, Any]:
+        """Shared budget and per-job statistics"""
+        return {
+            'limit': self.limiter.limit,
+            'in_flight': self.limiter.in_flight,
+            'jobs': {job_id: self.job_stats(job_id) for job_id in self._jobs}
+        }
+
+
+class JobLimiter:
+    """
+    One job's view of a FairShareScheduler. Drop-in replacement for the
+    AdaptiveLimiter on a ClaudeInterface, so run_limited and execute_batch
+    are scheduled without further changes.
+    """
+    
+    def __init__(self, scheduler: FairShareScheduler, job_id: str):
+        self.scheduler = scheduler
+        self.job_id = job_id
+    
+    @property
+    def _job(self) -> _Job:
+        return self.scheduler._jobs[self.job_id]
+    
+    @property
+    def limit(self) -> int:
+        shared = self.scheduler.limiter.limit
+        cap = self._job.max_in_flight
+        return min(shared, cap) if cap else shared
+    
+    @property
+    def max_limit(self) -> int:
+        return self._job.max_in_flight or self.scheduler.limiter.max_limit
+    
+    @property
+    def in_flight(self) -> int:
+        return self._job.in_flight
+    
+    def set_limit(self, limit: int):
+        """Cap this job's share; the shared budget is left alone"""
+        self._job.max_in_flight = max(1, limit)
+    
+    async def acquire(self, priority: Priority = Priority.NORMAL) -> float:
+        return await self.scheduler.acquire(self.job_id, priority)
+    
+    async def release(self):
+        await self.scheduler.release(self.job_id)
+    
+    def record(self, started_at: float, kind: Optional[FailureKind]):
+        self.scheduler.record(started_at, kind)
+    
+    def metrics(self) -> Dict[str, Any]:
+        return self.scheduler.job_stats(self.job_id)
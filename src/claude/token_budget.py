@@ -0,0 +1,263 @@
+"""
+Token accounting and budget admission control.
+Actual usage reported by the CLI is persisted to a SQLite ledger and
+summed over a rolling 24-hour window; with TOKEN_ENFORCE_BUDGET, work is
+admitted against the daily budget using per-tier estimates before any
+agent is spawned.
+"""
+
+import itertools
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from ..core.config import get_config, TokenConfig
+from ..core.logging import get_logger
+from ..core.exceptions import TokenLimitError
+from ..utils.metrics import get_metrics_registry
+
+logger = get_logger(__name__)
+metrics = get_metrics_registry()
+
+TOKENS_USED = metrics.counter(
+    "claude_tokens_total",
+    "Tokens consumed by Claude executions (input, output, cache_read, estimated)",
+    ["kind"]
+)
+BUDGET_REMAINING = metrics.gauge(
+    "token_budget_remaining",
+    "Tokens left in the rolling daily budget, net of reservations"
+)
+ADMISSION_REJECTIONS = metrics.counter(
+    "token_admission_rejections_total",
+    "Work rejected because it would exceed the daily token budget"
+)
+
+WINDOW_SECONDS = 24 * 60 * 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recorded_at REAL NOT NULL,
+    agent TEXT,
+    input_tokens INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    cache_read_tokens INTEGER NOT NULL DEFAULT 0,
+    cost_usd REAL,
+    estimated INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS usage_recorded_at ON usage (recorded_at);
+"""
+
+
+class TokenBudget:
+    """
+    Rolling daily token budget shared by every execution in the process.
+    
+    Each execution reserves its tier estimate before it is spawned and
+    settles the reservation with the usage the CLI reported (or the
+    estimate, when a successful run's output format carries no usage; a
+    failed run without usage is charged nothing). Admission fails with
+    TokenLimitError when recorded usage plus outstanding reservations
+    plus the request would exceed the budget. Prompt-cache reads are
+    recorded separately and don't count against it. The ledger is shared
+    between processes through SQLite; reservations are per process.
+    
+    Usage is always recorded; admission is only enforced with
+    TOKEN_ENFORCE_BUDGET and a non-zero TOKEN_DAILY_BUDGET.
+    """
+    
+    def __init__(self, config: Optional[TokenConfig] = None, path: Optional[Path] = None):
+        self.config = config or get_config().tokens
+        self.path = Path(path or self.config.ledger_path)
+        self.daily_budget = self.config.daily_budget
+        self._reservations: Dict[int, int] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._warned = False
+    
+    @property
+    def enabled(self) -> bool:
+        return self.config.enforce_budget and self.daily_budget > 0
+    
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.path), isolation_level=None, timeout=30, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(usage)")}
+            if "cache_read_tokens" not in columns:
+                # Ledgers written before cache reads were kept apart
+                try:
+                    conn.execute(
+                        "ALTER TABLE usage ADD COLUMN "
+                        "cache_read_tokens INTEGER NOT NULL DEFAULT 0"
+                    )
+                except sqlite3.OperationalError:
+                    pass  # Another process added it first
+            self._conn = conn
+        return self._conn
+    
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
+    def tier_estimate(self, tier: int) -> int:
+        """Configured token estimate for an agent tier (1-4)"""
+        try:
+            return getattr(self.config, f"tier{tier}_estimate")
+        except AttributeError:
+            raise ValueError(f"Unknown token tier: {tier}")
+    
+    # Accounting
+    
+    def used(self) -> int:
+        """Tokens recorded in the last 24 hours, cache reads aside"""
+        row = self.conn.execute(
+            "SELECT COALESCE(SUM(input_tokens + output_tokens), 0) FROM usage "
+            "WHERE recorded_at > ?",
+            (time.time() - WINDOW_SECONDS,)
+        ).fetchone()
+        return row[0]
+    
+    @property
+    def reserved(self) -> int:
+        with self._lock:
+            return sum(self._reservations.values())
+    
+    def remaining(self) -> int:
+        """Budget left after recorded usage and outstanding reservations"""
+        return self.daily_budget - self.used() - self.reserved
+    
+    def record(
+        self,
+        input_tokens: int,
+        output_tokens: int,
+        agent: Optional[str] = None,
+        cost_usd: Optional[float] = None,
+        estimated: bool = False,
+        cache_read_tokens: int = 0
+    ):
+        """Append usage to the ledger, pruning rows past the retention period"""
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO usage (recorded_at, agent, input_tokens, output_tokens, "
+                "cache_read_tokens, cost_usd, estimated) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (now, agent, input_tokens, output_tokens, cache_read_tokens,
+                 cost_usd, int(estimated))
+            )
+            self.conn.execute(
+                "DELETE FROM usage WHERE recorded_at < ?",
+                (now - self.config.retention_days * WINDOW_SECONDS,)
+            )
+        
+        if estimated:
+            TOKENS_USED.inc(input_tokens + output_tokens, kind="estimated")
+        else:
+            TOKENS_USED.inc(input_tokens, kind="input")
+            TOKENS_USED.inc(output_tokens, kind="output")
+            TOKENS_USED.inc(cache_read_tokens, kind="cache_read")
+    
+    # Admission
+    
+    def check(self, tokens: int, what: str = "request"):
+        """Raise TokenLimitError if `tokens` more would exceed the budget"""
+        if not self.enabled:
+            return
+        
+        committed = self.used() + self.reserved
+        if committed + tokens > self.daily_budget:
+            ADMISSION_REJECTIONS.inc()
+            raise TokenLimitError(
+                committed + tokens,
+                self.daily_budget,
+                f"Token budget exceeded: {what} needs ~{tokens} tokens, "
+                f"{max(self.daily_budget - committed, 0)} of {self.daily_budget} left today"
+            )
+        
+        if not self._warned and committed + tokens > self.daily_budget * self.config.warning_threshold:
+            self._warned = True
+            logger.warning(
+                "Token usage approaching daily budget",
+                extra={'tokens_used': committed, 'token_budget': self.daily_budget}
+            )
+    
+    def reserve(self, tokens: int, what: str = "request") -> Optional[int]:
+        """Admit an execution, holding its estimate until settle()/cancel()"""
+        if not self.enabled:
+            return None
+        
+        with self._lock:
+            self.check(tokens, what)
+            reservation = next(self._ids)
+            self._reservations[reservation] = tokens
+        BUDGET_REMAINING.set(self.remaining())
+        return reservation
+    
+    def settle(
+        self,
+        reservation: Optional[int],
+        input_tokens: Optional[int],
+        output_tokens: Optional[int],
+        agent: Optional[str] = None,
+        cost_usd: Optional[float] = None,
+        cache_read_tokens: Optional[int] = None,
+        charge_estimate: bool = True
+    ):
+        """
+        Replace a reservation with actual usage. Without reported usage the
+        estimate is charged, unless ``charge_estimate`` is False (a run that
+        failed, which may have spent nothing).
+        """
+        with self._lock:
+            estimate = self._reservations.pop(reservation, 0)
+        
+        if input_tokens is None and output_tokens is None:
+            if charge_estimate and estimate:
+                self.record(estimate, 0, agent, cost_usd, estimated=True)
+        else:
+            self.record(
+                input_tokens or 0, output_tokens or 0, agent, cost_usd,
+                cache_read_tokens=cache_read_tokens or 0
+            )
+        
+        if self.enabled:
+            BUDGET_REMAINING.set(self.remaining())
+    
+    def cancel(self, reservation: Optional[int]):
+        """Drop a reservation for an execution that never ran"""
+        with self._lock:
+            self._reservations.pop(reservation, None)
+    
+    def stats(self) -> Dict[str, Any]:
+        used = self.used()
+        return {
+            'daily_budget': self.daily_budget,
+            'enforced': self.enabled,
+            'used_24h': used,
+            'reserved': self.reserved,
+            'remaining': self.daily_budget - used - self.reserved if self.enabled else None,
+            'ledger': str(self.path)
+        }
+
+
+_token_budget: Optional[TokenBudget] = None
+
+
+def get_token_budget() -> TokenBudget:
+    """Get the process-wide token budget"""
+    global _token_budget
+    config = get_config().tokens
+    if _token_budget is None or _token_budget.config is not config:
+        _token_budget = TokenBudget(config)
+    return _token_budget
@@ -7,16 +7,43 @@ import asyncio
 import subprocess
 import shutil
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from contextlib import asynccontextmanager
 import uuid
 import tempfile
+import time
 
 from ..core.config import get_config
 from ..core.logging import get_logger
 from ..core.exceptions import WorkspaceError
+from .workspace_pool import WorkspacePool
+from ..utils.metrics import get_metrics_registry
+from ..utils.tracing import traced
 
 logger = get_logger(__name__)
+metrics = get_metrics_registry()
+
+CREATE_SECONDS = metrics.histogram(
+    "workspace_create_seconds",
+    "Time to create a workspace and copy agent definitions",
+    ["type"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+CLEANUP_SECONDS = metrics.histogram(
+    "workspace_cleanup_seconds",
+    "Time to remove a workspace",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+LEASE_WAIT_SECONDS = metrics.histogram(
+    "workspace_lease_wait_seconds",
+    "Time a caller waited for a workspace lease",
+    ["mode"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+ACTIVE_WORKSPACES = metrics.gauge(
+    "workspaces_active",
+    "Workspaces currently on disk"
+)
 
 
 class WorkspaceManager:
@@ -25,12 +52,14 @@ class WorkspaceManager:
     def __init__(self):
         self.config = get_config()
         self.active_workspaces: Dict[str, Path] = {}
+        self.pool: Optional[WorkspacePool] = None
         self._ensure_base_dir()
     
     def _ensure_base_dir(self):
         """Ensure base workspace directory exists"""
         self.config.workspace.base_dir.mkdir(parents=True, exist_ok=True)
     
+    @traced("workspace.create", "workspace")
     async def create_workspace(
         self,
         agent_name: str,
@@ -40,16 +69,26 @@ class WorkspaceManager:
         
         workspace_id = f"{self.config.workspace.worktree_prefix}{agent_name}_{uuid.uuid4().hex[:8]}"
         use_worktree = use_worktree if use_worktree is not None else self.config.workspace.use_worktrees
+        start_time = time.monotonic()
         
-        if use_worktree and await self._is_git_repo():
-            workspace_path = await self._create_git_worktree(workspace_id)
-        else:
-            workspace_path = await self._create_temp_workspace(workspace_id)
-        
-        # Set up agent definitions
-        await self._setup_agent_definitions(workspace_path)
+        try:
+            if use_worktree and await self._is_git_repo():
+                workspace_path = await self._create_git_worktree(workspace_id)
+                workspace_type = 'worktree'
+            else:
+                workspace_path = await self._create_temp_workspace(workspace_id)
+                workspace_type = 'temp'
+            
+            # Set up agent definitions
+            await self._setup_agent_definitions(workspace_path)
+        except asyncio.CancelledError:
+            # Don't leak a workspace (and its branch) made before the cancel
+            await self.cleanup_workspace(self.config.workspace.base_dir / workspace_id)
+            raise
         
         self.active_workspaces[workspace_id] = workspace_path
+        CREATE_SECONDS.observe(time.monotonic() - start_time, type=workspace_type)
+        ACTIVE_WORKSPACES.set(len(self.active_workspaces))
         
         logger.info(
             "Created workspace",
@@ -123,6 +162,17 @@ class WorkspaceManager:
         
         return workspace_path
     
+    def _agent_sources(self) -> Dict[str, Tuple[int, int]]:
+        """Size and mtime of every agent definition copied into workspaces"""
+        sources = {}
+        for directory in (self.config.agent_dir, Path(".claude/agents")):
+            if directory.exists():
+                for agent_file in directory.glob("*.md"):
+                    stat = agent_file.stat()
+                    sources[str(agent_file.resolve())] = (stat.st_size, stat.st_mtime_ns)
+        return sources
+    
+    @traced("workspace.setup_agents", "workspace")
     async def _setup_agent_definitions(self, workspace_path: Path):
         """Copy agent definitions to workspace"""
         
@@ -143,6 +193,7 @@ class WorkspaceManager:
                 # Project agents override user agents
                 shutil.copy2(agent_file, agents_dir / agent_file.name)
     
+    @traced("workspace.cleanup", "workspace")
     async def cleanup_workspace(self, workspace_path: Path):
         """Clean up a workspace"""
         
@@ -152,6 +203,7 @@ class WorkspaceManager:
             logger.info(f"Skipping cleanup for workspace: {workspace_id}")
             return
         
+        start_time = time.monotonic()
         try:
             # If it's a worktree, remove it properly
             if await self._is_git_worktree(workspace_path):
@@ -162,9 +214,11 @@ class WorkspaceManager:
             
             # Remove from active workspaces
             self.active_workspaces.pop(workspace_id, None)
+            CLEANUP_SECONDS.observe(time.monotonic() - start_time)
+            ACTIVE_WORKSPACES.set(len(self.active_workspaces))
             
             logger.info(f"Cleaned up workspace: {workspace_id}")
-            
+        
         except Exception as e:
             logger.error(f"Failed to cleanup workspace {workspace_id}: {e}")
     
@@ -198,6 +252,10 @@ class WorkspaceManager:
     async def cleanup_all(self):
         """Clean up all active workspaces"""
         
+        if self.pool:
+            await self.pool.close()
+            self.pool = None
+        
         logger.info(f"Cleaning up {len(self.active_workspaces)} workspaces")
         
         cleanup_tasks = [
@@ -211,14 +269,26 @@ class WorkspaceManager:
         if self.config.workspace.use_worktrees:
             await self._run_command(["git", "worktree", "prune"])
     
-    async def _run_command(self, cmd: List[str]) -> subprocess.CompletedProcess:
+    async def _run_command(
+        self,
+        cmd: List[str],
+        cwd: Optional[Path] = None
+    ) -> subprocess.CompletedProcess:
         """Run a command asynchronously"""
         process = await asyncio.create_subprocess_exec(
             *cmd,
             stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
+            stderr=asyncio.subprocess.PIPE,
+            cwd=str(cwd) if cwd else None
         )
-        stdout, stderr = await process.communicate()
+        communicate = asyncio.ensure_future(process.communicate())
+        try:
+            stdout, stderr = await asyncio.shield(communicate)
+        except asyncio.CancelledError:
+            # Let git finish rather than orphan it mid-way through a
+            # worktree add or with its index lock held
+            await asyncio.wait({communicate})
+            raise
         
         return subprocess.CompletedProcess(
             cmd,
@@ -238,6 +308,41 @@ class WorkspaceManager:
             if workspace:
                 await self.cleanup_workspace(workspace)
     
+    async def start_pool(self, size: Optional[int] = None) -> WorkspacePool:
+        """Start a background-filled pool of pre-warmed workspaces"""
+        if self.pool is None:
+            self.pool = WorkspacePool(
+                self,
+                size if size is not None else self.config.workspace.pool_size
+            )
+            await self.pool.start()
+        return self.pool
+    
+    @asynccontextmanager
+    async def lease_workspace(self, agent_name: str):
+        """
+        Context manager for a pooled workspace.
+        
+        Uses the pre-warmed pool when WORKSPACE_POOL_SIZE > 0 (or after
+        start_pool()), otherwise falls back to isolated_workspace().
+        """
+        if self.pool is None and self.config.workspace.pool_size > 0:
+            await self.start_pool()
+        
+        start_time = time.monotonic()
+        if self.pool is None:
+            async with self.isolated_workspace(agent_name) as workspace:
+                LEASE_WAIT_SECONDS.observe(time.monotonic() - start_time, mode="isolated")
+                yield workspace
+        else:
+            async with self.pool.lease(agent_name) as workspace:
+                LEASE_WAIT_SECONDS.observe(time.monotonic() - start_time, mode="pool")
+                yield workspace
+    
+    def pool_stats(self) -> Optional[Dict[str, Any]]:
+        """Pool size and hit rate, or None when pooling is off"""
+        return self.pool.stats() if self.pool else None
+    
     def list_active_workspaces(self) -> List[Dict[str, str]]:
         """List all active workspaces"""
         return [
@@ -0,0 +1,210 @@
+"""
+Pre-warmed pool of agent workspaces.
+Keeps N worktrees checked out and populated in the background so leases
+are handed out without git subprocesses on the agent's critical path.
+"""
+
+import asyncio
+import shutil
+from pathlib import Path
+from typing import Dict, Any, Optional, Set, Tuple
+from contextlib import asynccontextmanager
+
+from ..core.logging import get_logger
+from ..core.exceptions import WorkspaceError
+
+logger = get_logger(__name__)
+
+
+class WorkspacePool:
+    """Background-filled pool of reusable workspaces"""
+    
+    def __init__(self, manager, size: int):
+        self.manager = manager
+        self.size = size
+        self._ready: "asyncio.Queue[Path]" = asyncio.Queue()
+        self._leased: Set[Path] = set()
+        self._base_commits: Dict[Path, Optional[str]] = {}
+        # Agent definition sources each workspace's copies were made from
+        self._agent_sources: Dict[Path, Dict[str, Tuple[int, int]]] = {}
+        self._creating = 0
+        self._wakeup = asyncio.Event()
+        self._fill_task: Optional[asyncio.Task] = None
+        self._closed = False
+        
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.recycled = 0
+        self.recycle_failures = 0
+        self.agent_refreshes = 0
+    
+    async def start(self):
+        """Start filling the pool in the background"""
+        if self._fill_task is None:
+            self._fill_task = asyncio.ensure_future(self._fill_loop())
+    
+    async def _fill_loop(self):
+        """Top the pool up to `size` ready workspaces whenever it drains"""
+        while not self._closed:
+            while (
+                not self._closed
+                and self._ready.qsize() + len(self._leased) + self._creating < self.size
+            ):
+                self._creating += 1
+                try:
+                    path = await self._create()
+                except Exception as e:
+                    logger.error(f"Failed to pre-warm workspace: {e}")
+                    await asyncio.sleep(1.0)
+                    continue
+                finally:
+                    self._creating -= 1
+                self._ready.put_nowait(path)
+            
+            self._wakeup.clear()
+            await self._wakeup.wait()
+    
+    async def _create(self) -> Path:
+        """Create a workspace owned by the pool"""
+        sources = self.manager._agent_sources()
+        path = await self.manager.create_workspace("pool")
+        self._base_commits[path] = await self._head_commit(path)
+        self._agent_sources[path] = sources
+        return path
+    
+    async def _head_commit(self, path: Path) -> Optional[str]:
+        if not await self.manager._is_git_worktree(path):
+            return None
+        result = await self.manager._run_command(
+            ["git", "rev-parse", "HEAD"], cwd=path
+        )
+        return result.stdout.strip() if result.returncode == 0 else None
+    
+    @asynccontextmanager
+    async def lease(self, agent_name: str):
+        """
+        Lease a ready workspace, creating one on demand if the pool is
+        empty. Agent definitions edited since it was warmed are recopied.
+        """
+        try:
+            path = self._ready.get_nowait()
+            self.hits += 1
+        except asyncio.QueueEmpty:
+            self.misses += 1
+            # Count the on-demand workspace so the filler doesn't overshoot
+            self._creating += 1
+            try:
+                path = await self._create()
+            finally:
+                self._creating -= 1
+        
+        self._leased.add(path)
+        self._wakeup.set()
+        
+        try:
+            await self._refresh_agents(path)
+        except BaseException:
+            await self._return(path)
+            raise
+        
+        logger.info(
+            "Leased workspace",
+            extra={'agent_name': agent_name, 'path': str(path)}
+        )
+        
+        try:
+            yield path
+        finally:
+            await self._return(path)
+    
+    async def _return(self, path: Path):
+        """Recycle a returned workspace, or destroy it if that fails"""
+        # The workspace stays counted as leased until it is back in the
+        # queue so the filler doesn't replace it while it's being reset
+        if not self._closed and self._ready.qsize() < self.size:
+            try:
+                await self._recycle(path)
+                self.recycled += 1
+                self._leased.discard(path)
+                self._ready.put_nowait(path)
+                return
+            except Exception as e:
+                self.recycle_failures += 1
+                logger.warning(f"Failed to recycle workspace {path.name}: {e}")
+        
+        self._leased.discard(path)
+        await self._destroy(path)
+        self._wakeup.set()
+    
+    async def _refresh_agents(self, path: Path):
+        """Recopy agent definitions edited since the workspace was warmed"""
+        sources = self.manager._agent_sources()
+        if self._agent_sources.get(path) != sources:
+            await self.manager._setup_agent_definitions(path)
+            self._agent_sources[path] = sources
+            self.agent_refreshes += 1
+    
+    async def _recycle(self, path: Path):
+        """Reset a workspace to its pristine state, keeping agent definitions"""
+        base = self._base_commits.get(path)
+        
+        if base:
+            for cmd in (
+                ["git", "reset", "--hard", base],
+                ["git", "clean", "-fdx", "-e", ".claude/agents"],
+            ):
+                result = await self.manager._run_command(cmd, cwd=path)
+                if result.returncode != 0:
+                    raise WorkspaceError(
+                        f"{' '.join(cmd[:2])} failed: {result.stderr}"
+                    )
+        else:
+            # Deleting a large tree would stall the event loop
+            await asyncio.to_thread(_clear_workspace, path)
+    
+    async def _destroy(self, path: Path):
+        self._base_commits.pop(path, None)
+        self._agent_sources.pop(path, None)
+        await self.manager.cleanup_workspace(path)
+    
+    async def close(self):
+        """Stop filling and destroy all idle workspaces"""
+        self._closed = True
+        self._wakeup.set()
+        
+        if self._fill_task is not None:
+            self._fill_task.cancel()
+            await asyncio.gather(self._fill_task, return_exceptions=True)
+            self._fill_task = None
+        
+        while not self._ready.empty():
+            await self._destroy(self._ready.get_nowait())
+        
+        logger.info("Workspace pool closed", extra=self.stats())
+    
+    def stats(self) -> Dict[str, Any]:
+        """Pool size, occupancy and hit rate"""
+        leases = self.hits + self.misses
+        return {
+            'pool_size': self.size,
+            'ready': self._ready.qsize(),
+            'leased': len(self._leased),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / leases if leases else 0.0,
+            'recycled': self.recycled,
+            'recycle_failures': self.recycle_failures,
+            'agent_refreshes': self.agent_refreshes
+        }
+
+
+def _clear_workspace(path: Path):
+    """Delete everything in a non-git workspace except its .claude directory"""
+    for entry in path.iterdir():
+        if entry.name == ".claude":
+            continue
+        if entry.is_dir() and not entry.is_symlink():
+            shutil.rmtree(entry)
+        else:
+            entry.unlink()
@@ -20,20 +20,50 @@ class ClaudeConfig:
     """Claude-specific configuration"""
     cli_path: str = field(default_factory=lambda: os.getenv("CLAUDE_CLI_PATH", "claude"))
     max_concurrent: int = field(default_factory=lambda: int(os.getenv("CLAUDE_MAX_CONCURRENT", "3")))
+    max_concurrent_ceiling: int = field(default_factory=lambda: int(os.getenv("CLAUDE_MAX_CONCURRENT_CEILING", "32")))
+    adaptive_concurrency: bool = field(default_factory=lambda: os.getenv("CLAUDE_ADAPTIVE_CONCURRENCY", "true").lower() == "true")
     default_timeout: int = field(default_factory=lambda: int(os.getenv("CLAUDE_TIMEOUT", "300")))
+    idle_timeout: float = field(default_factory=lambda: float(os.getenv("CLAUDE_IDLE_TIMEOUT", "0")))
+    kill_grace: float = field(default_factory=lambda: float(os.getenv("CLAUDE_KILL_GRACE", "5.0")))
+    limit_memory_mb: int = field(default_factory=lambda: int(os.getenv("CLAUDE_LIMIT_MEMORY_MB", "0")))
+    limit_data_mb: int = field(default_factory=lambda: int(os.getenv("CLAUDE_LIMIT_DATA_MB", "0")))
+    limit_cpu_seconds: int = field(default_factory=lambda: int(os.getenv("CLAUDE_LIMIT_CPU_SECONDS", "0")))
+    limit_nice: Optional[int] = field(default_factory=lambda: int(os.getenv("CLAUDE_LIMIT_NICE")) if os.getenv("CLAUDE_LIMIT_NICE") else None)
+    limit_cpu_affinity: str = field(default_factory=lambda: os.getenv("CLAUDE_LIMIT_CPU_AFFINITY", ""))
+    agent_limits: Dict[str, Dict[str, Any]] = field(default_factory=lambda: json.loads(os.getenv("CLAUDE_AGENT_LIMITS", "{}")))
     retry_attempts: int = field(default_factory=lambda: int(os.getenv("CLAUDE_RETRY_ATTEMPTS", "3")))
     rate_limit_delay: float = field(default_factory=lambda: float(os.getenv("CLAUDE_RATE_LIMIT_DELAY", "1.0")))
-    
+    retry_max_delay: float = field(default_factory=lambda: float(os.getenv("CLAUDE_RETRY_MAX_DELAY", "30.0")))
+    rate_limit_max_wait: float = field(default_factory=lambda: float(os.getenv("CLAUDE_RATE_LIMIT_MAX_WAIT", "900.0")))
+    circuit_enabled: bool = field(default_factory=lambda: os.getenv("CLAUDE_CIRCUIT_ENABLED", "true").lower() == "true")
+    circuit_failure_ratio: float = field(default_factory=lambda: float(os.getenv("CLAUDE_CIRCUIT_FAILURE_RATIO", "0.5")))
+    circuit_window: float = field(default_factory=lambda: float(os.getenv("CLAUDE_CIRCUIT_WINDOW", "60.0")))
+    circuit_min_calls: int = field(default_factory=lambda: int(os.getenv("CLAUDE_CIRCUIT_MIN_CALLS", "10")))
+    circuit_open_seconds: float = field(default_factory=lambda: float(os.getenv("CLAUDE_CIRCUIT_OPEN_SECONDS", "30.0")))
+    hedge_enabled: bool = field(default_factory=lambda: os.getenv("CLAUDE_HEDGE_ENABLED", "false").lower() == "true")
+    hedge_percentile: float = field(default_factory=lambda: float(os.getenv("CLAUDE_HEDGE_PERCENTILE", "0.95")))
+    hedge_min_samples: int = field(default_factory=lambda: int(os.getenv("CLAUDE_HEDGE_MIN_SAMPLES", "20")))
+    hedge_budget_ratio: float = field(default_factory=lambda: float(os.getenv("CLAUDE_HEDGE_BUDGET_RATIO", "0.1")))
+    model: Optional[str] = field(default_factory=lambda: os.getenv("CLAUDE_MODEL") or None)
+    prompt_delivery: str = field(default_factory=lambda: os.getenv("CLAUDE_PROMPT_DELIVERY", "auto"))
+    stdin_prompt_threshold: int = field(default_factory=lambda: int(os.getenv("CLAUDE_STDIN_PROMPT_THRESHOLD", "65536")))
+    host_max_concurrent: int = field(default_factory=lambda: int(os.getenv("CLAUDE_HOST_MAX_CONCURRENT", "0")))
+    runtime_dir: Optional[Path] = field(default_factory=lambda: Path(os.getenv("CLAUDE_RUNTIME_DIR")) if os.getenv("CLAUDE_RUNTIME_DIR") else None)
+    output_format: str = field(default_factory=lambda: os.getenv("CLAUDE_OUTPUT_FORMAT", "stream-json"))
+
 
 @dataclass
 class TokenConfig:
     """Token management configuration"""
     daily_budget: int = field(default_factory=lambda: int(os.getenv("TOKEN_DAILY_BUDGET", "100000")))
+    enforce_budget: bool = field(default_factory=lambda: os.getenv("TOKEN_ENFORCE_BUDGET", "false").lower() == "true")
     warning_threshold: float = field(default_factory=lambda: float(os.getenv("TOKEN_WARNING_THRESHOLD", "0.8")))
     tier1_estimate: int = field(default_factory=lambda: int(os.getenv("TOKEN_TIER1_ESTIMATE", "3000")))
     tier2_estimate: int = field(default_factory=lambda: int(os.getenv("TOKEN_TIER2_ESTIMATE", "5000")))
     tier3_estimate: int = field(default_factory=lambda: int(os.getenv("TOKEN_TIER3_ESTIMATE", "8000")))
     tier4_estimate: int = field(default_factory=lambda: int(os.getenv("TOKEN_TIER4_ESTIMATE", "10000")))
+    ledger_path: Path = field(default_factory=lambda: Path(os.getenv("TOKEN_LEDGER_PATH", "~/.cache/headless_research/token_usage.db")).expanduser())
+    retention_days: int = field(default_factory=lambda: int(os.getenv("TOKEN_RETENTION_DAYS", "30")))
 
 
 @dataclass
@@ -43,6 +73,7 @@ class WorkspaceConfig:
     use_worktrees: bool = field(default_factory=lambda: os.getenv("USE_GIT_WORKTREES", "true").lower() == "true")
     cleanup_on_exit: bool = field(default_factory=lambda: os.getenv("CLEANUP_WORKSPACES", "true").lower() == "true")
     worktree_prefix: str = field(default_factory=lambda: os.getenv("WORKTREE_PREFIX", "research_"))
+    pool_size: int = field(default_factory=lambda: int(os.getenv("WORKSPACE_POOL_SIZE", "0")))
 
 
 @dataclass
@@ -54,6 +85,32 @@ class CacheConfig:
     cache_dir: Path = field(default_factory=lambda: Path(os.getenv("CACHE_DIR", "~/.cache/headless_research")).expanduser())
 
 
+@dataclass
+class OrchestrationConfig:
+    """Research pipeline configuration"""
+    stream_planning: bool = field(default_factory=lambda: os.getenv("STREAM_PLANNING", "true").lower() == "true")
+    task_queue_size: int = field(default_factory=lambda: int(os.getenv("TASK_QUEUE_SIZE", "16")))
+    synthesis_fan_in: int = field(default_factory=lambda: int(os.getenv("SYNTHESIS_FAN_IN", "8")))
+    accept_partial_research: bool = field(default_factory=lambda: os.getenv("ACCEPT_PARTIAL_RESEARCH", "true").lower() == "true")
+    research_resume_attempts: int = field(default_factory=lambda: int(os.getenv("RESEARCH_RESUME_ATTEMPTS", "1")))
+
+
+@dataclass
+class MetricsConfig:
+    """Metrics export configuration"""
+    http_port: int = field(default_factory=lambda: int(os.getenv("METRICS_PORT", "0")))
+    http_host: str = field(default_factory=lambda: os.getenv("METRICS_HOST", "127.0.0.1"))
+    textfile: Optional[Path] = field(default_factory=lambda: Path(os.getenv("METRICS_TEXTFILE")) if os.getenv("METRICS_TEXTFILE") else None)
+    textfile_interval: float = field(default_factory=lambda: float(os.getenv("METRICS_TEXTFILE_INTERVAL", "5.0")))
+
+
+@dataclass
+class TracingConfig:
+    """Span tracing configuration"""
+    enabled: bool = field(default_factory=lambda: os.getenv("TRACE_ENABLED", "false").lower() == "true")
+    trace_file: Optional[Path] = field(default_factory=lambda: Path(os.getenv("TRACE_FILE")) if os.getenv("TRACE_FILE") else None)
+
+
 @dataclass
 class LoggingConfig:
     """Logging configuration"""
@@ -62,6 +119,9 @@ class LoggingConfig:
     log_dir: Path = field(default_factory=lambda: Path(os.getenv("LOG_DIR", "./logs")))
     log_to_file: bool = field(default_factory=lambda: os.getenv("LOG_TO_FILE", "true").lower() == "true")
     log_claude_output: bool = field(default_factory=lambda: os.getenv("LOG_CLAUDE_OUTPUT", "false").lower() == "true")
+    async_logging: bool = field(default_factory=lambda: os.getenv("LOG_ASYNC", "false").lower() == "true")
+    queue_size: int = field(default_factory=lambda: int(os.getenv("LOG_QUEUE_SIZE", "10000")))
+    drop_policy: str = field(default_factory=lambda: os.getenv("LOG_DROP_POLICY", "drop_newest"))
 
 
 @dataclass
@@ -71,7 +131,10 @@ class ResearchConfig:
     tokens: TokenConfig = field(default_factory=TokenConfig)
     workspace: WorkspaceConfig = field(default_factory=WorkspaceConfig)
     cache: CacheConfig = field(default_factory=CacheConfig)
+    orchestration: OrchestrationConfig = field(default_factory=OrchestrationConfig)
     logging: LoggingConfig = field(default_factory=LoggingConfig)
+    metrics: MetricsConfig = field(default_factory=MetricsConfig)
+    tracing: TracingConfig = field(default_factory=TracingConfig)
     
     # Additional settings
     dry_run: bool = field(default_factory=lambda: os.getenv("DRY_RUN", "false").lower() == "true")
@@ -113,9 +176,33 @@ class ResearchConfig:
         self.logging.log_dir.mkdir(parents=True, exist_ok=True)
         
         # Validate numeric ranges
-        if not 0 < self.claude.max_concurrent <= 10:
+        if not 0 < self.claude.max_concurrent <= self.claude.max_concurrent_ceiling:
             raise ValueError(f"Invalid max_concurrent: {self.claude.max_concurrent}")
         
+        if self.claude.host_max_concurrent < 0:
+            raise ValueError(f"Invalid host_max_concurrent: {self.claude.host_max_concurrent}")
+        
+        if not 0 < self.claude.circuit_failure_ratio <= 1:
+            raise ValueError(f"Invalid circuit_failure_ratio: {self.claude.circuit_failure_ratio}")
+        
+        if not 0 < self.claude.hedge_percentile < 1:
+            raise ValueError(f"Invalid hedge_percentile: {self.claude.hedge_percentile}")
+        
+        if self.claude.output_format not in ("text", "json", "stream-json"):
+            raise ValueError(f"Invalid output_format: {self.claude.output_format}")
+        
+        if self.claude.prompt_delivery not in ("auto", "argv", "stdin"):
+            raise ValueError(f"Invalid prompt_delivery: {self.claude.prompt_delivery}")
+        
+        if self.logging.drop_policy not in ("drop_newest", "drop_oldest", "block"):
+            raise ValueError(f"Invalid log drop_policy: {self.logging.drop_policy}")
+        
+        if self.orchestration.synthesis_fan_in < 2:
+            raise ValueError(f"Invalid synthesis_fan_in: {self.orchestration.synthesis_fan_in}")
+        
+        if self.tokens.daily_budget < 0:
+            raise ValueError(f"Invalid daily_budget: {self.tokens.daily_budget}")
+        
         if not 0 < self.tokens.warning_threshold <= 1:
             raise ValueError(f"Invalid warning_threshold: {self.tokens.warning_threshold}")
     
@@ -39,9 +39,20 @@ class ClaudeExecutionError(ClaudeError):
 class ClaudeTimeoutError(ClaudeError):
     """Claude execution timed out"""
     
-    def __init__(self, message: str, timeout_seconds: int):
+    def __init__(self, message: str, timeout_seconds: int, partial_result: Any = None):
         super().__init__(message, {'timeout_seconds': timeout_seconds})
         self.timeout_seconds = timeout_seconds
+        # ClaudeResult (truncated=True) with the output captured before the kill
+        self.partial_result = partial_result
+
+
+class ClaudeStalledError(ClaudeError):
+    """Claude process produced no output for too long"""
+    
+    def __init__(self, message: str, idle_seconds: float, partial_result: Any = None):
+        super().__init__(message, {'idle_seconds': idle_seconds})
+        self.idle_seconds = idle_seconds
+        self.partial_result = partial_result
 
 
 class AgentError(HeadlessResearchError):
@@ -4,8 +4,12 @@ Provides JSON logging, performance tracking, and Claude output capture.
 """
 
 import logging
+import logging.handlers
 import json
 import sys
+import copy
+import queue
+import atexit
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, Optional
@@ -157,8 +161,119 @@ class ClaudeOutputLogger:
             self.logger.debug("Claude output captured", extra=log_data)
 
 
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that never does I/O on the calling thread.
+    
+    Records are only snapshotted here; formatting and writing happen on the
+    listener thread. When the queue is full the drop policy decides between
+    discarding the new record, evicting the oldest one, or blocking.
+    """
+    
+    def __init__(self, log_queue: queue.Queue, drop_policy: str = "drop_newest"):
+        super().__init__(log_queue)
+        self.drop_policy = drop_policy
+        self.dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args now so later mutation can't change the message, but
+        # leave formatting (including tracebacks) to the listener
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+    
+    def enqueue(self, record: logging.LogRecord):
+        if self.drop_policy == "block":
+            self.queue.put(record)
+            return
+        
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        
+        if self.drop_policy == "drop_oldest":
+            try:
+                self.queue.get_nowait()
+                self.dropped += 1
+                self.queue.put_nowait(record)
+                return
+            except (queue.Empty, queue.Full):
+                pass
+        
+        self.dropped += 1
+
+
+class BoundedQueueListener(logging.handlers.QueueListener):
+    """
+    Queue listener whose stop() also works with a full queue.
+    
+    The stock listener stops by put_nowait()-ing a sentinel, which raises
+    queue.Full when producers have filled the queue. Wait for the listener
+    thread to make room instead, and if it can't, discard what is queued
+    (counted by the handler) so shutdown still completes.
+    """
+    
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        *handlers: logging.Handler,
+        handler: Optional[BoundedQueueHandler] = None,
+        stop_timeout: float = 5.0,
+        respect_handler_level: bool = False
+    ):
+        super().__init__(log_queue, *handlers, respect_handler_level=respect_handler_level)
+        self.handler = handler
+        self.stop_timeout = stop_timeout
+    
+    def enqueue_sentinel(self):
+        try:
+            self.queue.put(self._sentinel, timeout=self.stop_timeout)
+            return
+        except queue.Full:
+            pass
+        
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if self.handler is not None:
+                self.handler.dropped += 1
+        self.queue.put(self._sentinel, timeout=self.stop_timeout)
+
+
+# Background listener for queue-based logging
+_queue_listener: Optional[BoundedQueueListener] = None
+_queue_handler: Optional[BoundedQueueHandler] = None
+
+
+def stop_logging_listener():
+    """Flush queued records and stop the background listener"""
+    global _queue_listener, _queue_handler
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+    if _queue_handler is not None and _queue_handler.dropped:
+        sys.stderr.write(
+            f"headless_research: dropped {_queue_handler.dropped} log records\n"
+        )
+    _queue_handler = None
+
+
+atexit.register(stop_logging_listener)
+
+
+def get_dropped_log_count() -> int:
+    """Records discarded by the queue handler since setup_logging()"""
+    return _queue_handler.dropped if _queue_handler else 0
+
+
 def setup_logging() -> logging.Logger:
     """Set up the logging system"""
+    global _queue_listener, _queue_handler
     config = get_config()
     
     # Create root logger
@@ -166,7 +281,9 @@ def setup_logging() -> logging.Logger:
     root_logger.setLevel(getattr(logging, config.logging.level))
     
     # Remove existing handlers
+    stop_logging_listener()
     root_logger.handlers = []
+    handlers = []
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
@@ -178,14 +295,28 @@ def setup_logging() -> logging.Logger:
                 '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
             )
         )
-    root_logger.addHandler(console_handler)
+    handlers.append(console_handler)
     
     # File handler
     if config.logging.log_to_file:
         log_file = config.logging.log_dir / f"research_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
         file_handler = logging.FileHandler(log_file)
         file_handler.setFormatter(StructuredFormatter())
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
+    
+    if config.logging.async_logging:
+        # Format and write on a listener thread so logging never blocks
+        # the event loop on disk or terminal I/O
+        log_queue = queue.Queue(maxsize=config.logging.queue_size)
+        _queue_handler = BoundedQueueHandler(log_queue, config.logging.drop_policy)
+        _queue_listener = BoundedQueueListener(
+            log_queue, *handlers, handler=_queue_handler, respect_handler_level=True
+        )
+        _queue_listener.start()
+        root_logger.addHandler(_queue_handler)
+    else:
+        for handler in handlers:
+            root_logger.addHandler(handler)
     
     return root_logger
 
@@ -0,0 +1,136 @@
+"""
+Incremental extraction of task lists from streamed planner output.
+Emits each element of the planner's task array as soon as its JSON text
+is complete, without waiting for the rest of the document.
+"""
+
+import json
+from typing import Any, List, Optional
+
+from ..core.exceptions import ExtractionError
+
+
+class IncrementalTaskParser:
+    """
+    Streaming parser for ``{"research_tasks": [...]}`` documents.
+    
+    Feed it text chunks as they arrive; ``feed`` returns the array
+    elements (strings or objects) completed by that chunk. Only the array
+    under ``key`` in a top-level object is taken as the task list; text
+    outside top-level objects (preambles, code fences, bracketed asides
+    like "[draft]") is ignored.
+    """
+    
+    def __init__(self, key: str = "research_tasks"):
+        self.key = key
+        self.count = 0
+        self.done = False
+        
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._expect_key = False
+        self._key_chars: Optional[List[str]] = None
+        self._last_key: Optional[str] = None
+        self._target_depth: Optional[int] = None
+        self._element: Optional[List[str]] = None
+    
+    @property
+    def found(self) -> bool:
+        """Whether the task array has been located"""
+        return self._target_depth is not None
+    
+    def feed(self, text: str) -> List[Any]:
+        """Consume a chunk and return any task elements it completed"""
+        items = []
+        for ch in text:
+            if self.done:
+                break
+            item = self._consume(ch)
+            if item is not None:
+                items.append(item)
+        return items
+    
+    def _at_target(self) -> bool:
+        return self._target_depth is not None and len(self._stack) == self._target_depth
+    
+    def _emit(self, text: str) -> Any:
+        self._element = None
+        try:
+            value = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ExtractionError(f"Malformed task element: {e}", text)
+        self.count += 1
+        return value
+    
+    def _consume(self, ch: str) -> Any:
+        if self._element is not None:
+            self._element.append(ch)
+        
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif ch == "\\":
+                self._escape = True
+            elif ch == '"':
+                self._in_string = False
+                if self._key_chars is not None:
+                    self._last_key = json.loads('"' + "".join(self._key_chars) + '"')
+                    self._key_chars = None
+                    return None
+                if self._element is not None and self._at_target():
+                    return self._emit("".join(self._element))
+                return None
+            if self._key_chars is not None:
+                self._key_chars.append(ch)
+            return None
+        
+        if not self._stack and ch != "{":
+            # Preamble before the document starts
+            return None
+        
+        if ch == '"':
+            self._in_string = True
+            if self._stack[-1] == "{" and self._expect_key:
+                self._key_chars = []
+            elif self._at_target() and self._element is None:
+                self._element = [ch]
+        
+        elif ch in "{[":
+            if self._at_target() and self._element is None:
+                self._element = [ch]
+            self._stack.append(ch)
+            self._expect_key = ch == "{"
+            if (
+                ch == "[" and self._target_depth is None
+                and len(self._stack) == 2 and self._last_key == self.key
+            ):
+                self._target_depth = len(self._stack)
+        
+        elif ch in "}]":
+            if self._at_target():
+                # End of the task array; flush a trailing scalar element
+                item = None
+                if self._element is not None:
+                    text = "".join(self._element[:-1]).strip()
+                    item = self._emit(text) if text else None
+                self.done = True
+                return item
+            self._stack.pop()
+            if self._element is not None and self._at_target():
+                return self._emit("".join(self._element))
+        
+        elif ch == ",":
+            if self._at_target() and self._element is not None:
+                return self._emit("".join(self._element[:-1]).strip())
+            if self._stack[-1] == "{":
+                self._expect_key = True
+        
+        elif ch == ":":
+            self._expect_key = False
+        
+        elif not ch.isspace() and self._at_target() and self._element is None:
+            # Start of a number/literal element
+            self._element = [ch]
+        
+        return None
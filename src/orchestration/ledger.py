@@ -0,0 +1,380 @@
+"""
+Durable task ledger for resumable research jobs.
+A WAL-mode SQLite database in the project directory records each task's
+state, attempts, output hash, timings and token usage, so a resumed run
+finds its pending work with a single query instead of scanning files.
+"""
+
+import hashlib
+import json
+import os
+import socket
+import sqlite3
+import time
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Iterable, Tuple
+
+from ..core.logging import get_logger
+from ..core.exceptions import OrchestrationError
+from ..claude.host_limiter import process_alive, process_start_time
+
+logger = get_logger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    idx INTEGER PRIMARY KEY,
+    description TEXT NOT NULL,
+    description_hash TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    output_hash TEXT,
+    output_size INTEGER,
+    output_mtime_ns INTEGER,
+    error TEXT,
+    claimed_at REAL,
+    finished_at REAL,
+    execution_time REAL,
+    input_tokens INTEGER,
+    output_tokens INTEGER
+);
+CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, idx);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Columns added since the first release, for ledgers created before them
+MIGRATIONS = {
+    'output_size': "ALTER TABLE tasks ADD COLUMN output_size INTEGER",
+    'output_mtime_ns': "ALTER TABLE tasks ADD COLUMN output_mtime_ns INTEGER",
+}
+
+# Stored error text is capped; the full output lives in task_N_error.txt
+MAX_ERROR_LENGTH = 2000
+
+
+class TaskState(str, Enum):
+    """Lifecycle of a research task"""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def plan_hash(descriptions: Iterable[str]) -> str:
+    return content_hash(json.dumps(list(descriptions)))
+
+
+def default_worker_id() -> str:
+    """host:pid:start-time, so a reused PID isn't mistaken for this worker"""
+    pid = os.getpid()
+    return f"{socket.gethostname()}:{pid}:{process_start_time(pid) or ''}"
+
+
+def output_stat(output_file: Path) -> Tuple[Optional[int], Optional[int]]:
+    """Size and mtime (ns) of an output file, or (None, None) if missing"""
+    try:
+        stat = output_file.stat()
+    except OSError:
+        return None, None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class TaskLedger:
+    """
+    SQLite-backed record of a job's research tasks.
+    
+    Claims are single UPDATE ... RETURNING statements, so several
+    orchestrator processes can share one project without running a task
+    twice. Rows left "running" by a process that has died are returned to
+    pending by recover().
+    """
+    
+    def __init__(self, path: Path, worker_id: Optional[str] = None):
+        self.path = Path(path)
+        self.worker_id = worker_id or default_worker_id()
+        self._conn: Optional[sqlite3.Connection] = None
+    
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(str(self.path), isolation_level=None, timeout=30)
+                conn.row_factory = sqlite3.Row
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.executescript(SCHEMA)
+                columns = {row["name"] for row in conn.execute("PRAGMA table_info(tasks)")}
+                for column, statement in MIGRATIONS.items():
+                    if column not in columns:
+                        conn.execute(statement)
+            except sqlite3.Error as e:
+                raise OrchestrationError(
+                    f"Failed to open task ledger: {e}",
+                    {'path': str(self.path)}
+                )
+            self._conn = conn
+        return self._conn
+    
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
+    def _execute(self, sql: str, params: Tuple = ()) -> sqlite3.Cursor:
+        try:
+            return self.conn.execute(sql, params)
+        except sqlite3.Error as e:
+            raise OrchestrationError(f"Task ledger query failed: {e}", {'sql': sql})
+    
+    # Plan
+    
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self._execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+    
+    def set_meta(self, key: str, value: Optional[str]):
+        self._execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value)
+        )
+    
+    def has_plan(self, descriptions: List[str]) -> bool:
+        """Whether the ledger tracks exactly this task list"""
+        return self.get_meta("plan_hash") == plan_hash(descriptions)
+    
+    def reset_plan(self):
+        """Forget all tasks before a new plan is recorded"""
+        self._execute("DELETE FROM tasks")
+        self.set_meta("plan_hash", None)
+    
+    def add_task(self, index: int, description: str):
+        """Record a planned task as pending (idempotent)"""
+        self._execute(
+            "INSERT INTO tasks (idx, description, description_hash) VALUES (?, ?, ?) "
+            "ON CONFLICT(idx) DO NOTHING",
+            (index, description, content_hash(description))
+        )
+    
+    def commit_plan(self, descriptions: List[str]):
+        """Record the full task list and mark the plan complete"""
+        try:
+            with self.conn:
+                self.conn.execute("BEGIN IMMEDIATE")
+                for index, description in enumerate(descriptions):
+                    self.add_task(index, description)
+                self.set_meta("plan_hash", plan_hash(descriptions))
+        except sqlite3.Error as e:
+            raise OrchestrationError(f"Failed to record plan: {e}")
+    
+    def import_outputs(self, output_for_index) -> int:
+        """
+        Mark tasks completed whose output files already exist. Used once
+        when a project predating the ledger is resumed.
+        """
+        imported = 0
+        for row in self._execute("SELECT idx FROM tasks WHERE state != 'completed'").fetchall():
+            output_file = output_for_index(row["idx"])
+            if output_file.exists():
+                self.complete(
+                    row["idx"], output_file.read_text(encoding="utf-8"),
+                    output_file=output_file
+                )
+                imported += 1
+        return imported
+    
+    # Claims
+    
+    def claim(self, index: Optional[int] = None) -> Optional[sqlite3.Row]:
+        """
+        Atomically move a pending task to running. Claims the given index,
+        or the lowest pending one; returns None if nothing could be claimed.
+        """
+        if index is None:
+            target = "(SELECT idx FROM tasks WHERE state = 'pending' ORDER BY idx LIMIT 1)"
+            params: Tuple = (self.worker_id, time.time())
+        else:
+            target = "? AND state = 'pending'"
+            params = (self.worker_id, time.time(), index)
+        
+        # Exhaust the cursor so the write completes before returning
+        rows = self._execute(
+            "UPDATE tasks SET state = 'running', attempts = attempts + 1, "
+            "worker = ?, claimed_at = ?, error = NULL "
+            f"WHERE idx = {target} "
+            "RETURNING idx, description, attempts",
+            params
+        ).fetchall()
+        return rows[0] if rows else None
+    
+    def complete(
+        self,
+        index: int,
+        output: str,
+        execution_time: Optional[float] = None,
+        input_tokens: Optional[int] = None,
+        output_tokens: Optional[int] = None,
+        output_file: Optional[Path] = None
+    ):
+        """
+        Mark a task completed, recording the hash of its output and the
+        size and mtime of ``output_file`` (already written) for cheap
+        verification on resume.
+        """
+        size, mtime_ns = output_stat(output_file) if output_file else (None, None)
+        self._execute(
+            "UPDATE tasks SET state = 'completed', output_hash = ?, output_size = ?, "
+            "output_mtime_ns = ?, finished_at = ?, execution_time = ?, "
+            "input_tokens = ?, output_tokens = ? WHERE idx = ?",
+            (content_hash(output), size, mtime_ns, time.time(), execution_time,
+             input_tokens, output_tokens, index)
+        )
+    
+    def fail(self, index: int, error: str, execution_time: Optional[float] = None):
+        """Mark a task failed so the next run retries it"""
+        self._execute(
+            "UPDATE tasks SET state = 'failed', error = ?, finished_at = ?, "
+            "execution_time = ? WHERE idx = ?",
+            (error[-MAX_ERROR_LENGTH:], time.time(), execution_time, index)
+        )
+    
+    def release(self, index: int):
+        """Return a claimed task to pending without counting it as failed"""
+        self._execute(
+            "UPDATE tasks SET state = 'pending', worker = NULL "
+            "WHERE idx = ? AND state = 'running'",
+            (index,)
+        )
+    
+    def requeue_failed(self) -> int:
+        """Make failed tasks claimable again (on resume)"""
+        return self._execute(
+            "UPDATE tasks SET state = 'pending', worker = NULL WHERE state = 'failed'"
+        ).rowcount
+    
+    def requeue_unverified(self, output_for_index) -> int:
+        """
+        Make completed tasks claimable again if their output file is
+        missing or no longer matches the recorded hash (on resume).
+        
+        Files whose size and mtime match those recorded on completion are
+        trusted; only the rest are read and hashed.
+        """
+        rows = self._execute(
+            "SELECT idx, output_hash, output_size, output_mtime_ns "
+            "FROM tasks WHERE state = 'completed'"
+        ).fetchall()
+        
+        unverified = []
+        for row in rows:
+            output_file = output_for_index(row["idx"])
+            size, mtime_ns = output_stat(output_file)
+            if size is None:
+                unverified.append(row["idx"])
+            elif (size, mtime_ns) != (row["output_size"], row["output_mtime_ns"]):
+                # Touched, copied or edited: the content decides
+                if content_hash(output_file.read_text(encoding="utf-8")) != row["output_hash"]:
+                    unverified.append(row["idx"])
+                else:
+                    self._execute(
+                        "UPDATE tasks SET output_size = ?, output_mtime_ns = ? WHERE idx = ?",
+                        (size, mtime_ns, row["idx"])
+                    )
+        
+        requeued = 0
+        if unverified:
+            placeholders = ", ".join("?" * len(unverified))
+            requeued = self._execute(
+                "UPDATE tasks SET state = 'pending', worker = NULL, output_hash = NULL, "
+                f"output_size = NULL, output_mtime_ns = NULL WHERE idx IN ({placeholders})",
+                tuple(unverified)
+            ).rowcount
+        
+        if requeued:
+            logger.warning(f"Requeued {requeued} completed tasks with missing or changed output")
+        return requeued
+    
+    def reset_tasks(self):
+        """Make every task claimable again (force rerun)"""
+        self._execute(
+            "UPDATE tasks SET state = 'pending', worker = NULL, output_hash = NULL, "
+            "output_size = NULL, output_mtime_ns = NULL, error = NULL"
+        )
+    
+    def recover(self) -> int:
+        """
+        Return tasks held by dead processes on this host to pending. A
+        worker whose PID now belongs to a process started at a different
+        time is dead too.
+        """
+        host = socket.gethostname()
+        rows = self._execute(
+            "SELECT DISTINCT worker FROM tasks WHERE state = 'running'"
+        ).fetchall()
+        
+        recovered = 0
+        for row in rows:
+            worker = row["worker"] or ""
+            # host:pid[:start-time]; ids from older runs have no start time
+            worker_host, _, process = worker.partition(":")
+            pid, _, started = process.partition(":")
+            if worker_host != host or not pid.isdigit() or process_alive(int(pid), started or None):
+                continue
+            recovered += self._execute(
+                "UPDATE tasks SET state = 'pending', worker = NULL "
+                "WHERE state = 'running' AND worker = ?",
+                (worker,)
+            ).rowcount
+        
+        if recovered:
+            logger.info(f"Recovered {recovered} tasks from interrupted runs")
+        return recovered
+    
+    # Queries
+    
+    def pending(self) -> List[int]:
+        """Indices of tasks waiting to be claimed"""
+        return [
+            row["idx"] for row in self._execute(
+                "SELECT idx FROM tasks WHERE state = 'pending' ORDER BY idx"
+            ).fetchall()
+        ]
+    
+    def counts(self) -> Dict[str, int]:
+        """Number of tasks in each state"""
+        counts = {state.value: 0 for state in TaskState}
+        for row in self._execute(
+            "SELECT state, COUNT(*) AS n FROM tasks GROUP BY state"
+        ).fetchall():
+            counts[row["state"]] = row["n"]
+        return counts
+    
+    def task(self, index: int) -> Optional[Dict[str, Any]]:
+        row = self._execute("SELECT * FROM tasks WHERE idx = ?", (index,)).fetchone()
+        return dict(row) if row else None
+    
+    def verify_output(self, index: int, output_file: Path) -> bool:
+        """Whether an output file matches the hash recorded on completion"""
+        task = self.task(index)
+        if not task or task["state"] != TaskState.COMPLETED or not output_file.exists():
+            return False
+        return content_hash(output_file.read_text(encoding="utf-8")) == task["output_hash"]
+    
+    def summary(self) -> Dict[str, Any]:
+        """Aggregate timings and token usage"""
+        row = self._execute(
+            "SELECT COUNT(*) AS tasks, SUM(attempts) AS attempts, "
+            "SUM(execution_time) AS execution_time, "
+            "SUM(input_tokens) AS input_tokens, SUM(output_tokens) AS output_tokens "
+            "FROM tasks"
+        ).fetchone()
+        return {**dict(row), 'states': self.counts()}
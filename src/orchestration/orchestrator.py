@@ -0,0 +1,890 @@
+"""
+Asyncio-native research orchestrator.
+Drives the Decompose/Allocate/Execute/Synthesize/Review pipeline from a
+single event loop, with every agent running as a CLI subprocess and all
+job state persisted to the project directory so runs can resume.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Dict, Any, Optional, List, AsyncIterator, Callable
+
+from ..core.config import get_config
+from ..core.logging import get_logger
+from ..core.exceptions import (
+    ClaudeError, OrchestrationError, ExtractionError, TokenLimitError
+)
+from ..claude.cli_interface import ClaudeSubAgentInterface, ClaudeResult
+from ..claude.hedging import HedgeBudget
+from ..claude.workspace_manager import get_workspace_manager, WorkspaceManager
+from ..claude.concurrency import AdaptiveLimiter, Priority
+from ..claude.scheduler import FairShareScheduler
+from ..extraction.json_stream import IncrementalTaskParser
+from ..utils.metrics import start_metrics_exporters
+from ..utils.tracing import get_tracer
+from .synthesis import TreeSynthesizer, synthesis_calls
+from .ledger import TaskLedger
+
+logger = get_logger(__name__)
+
+# Agent names
+PLANNER_AGENT = "helios-planner"
+RESEARCHER_AGENT = "helios-researcher"
+SYNTHESIZER_AGENT = "helios-synthesizer"
+CRITIC_AGENT = "helios-critic"
+
+# Agents on a job's critical path are scheduled ahead of bulk research
+AGENT_PRIORITIES = {
+    PLANNER_AGENT: Priority.CRITICAL,
+    SYNTHESIZER_AGENT: Priority.CRITICAL,
+    CRITIC_AGENT: Priority.CRITICAL
+}
+
+# Token estimate tier (TOKEN_TIER<n>_ESTIMATE) of each agent, in pipeline order
+AGENT_TOKEN_TIERS = {
+    PLANNER_AGENT: 1,
+    RESEARCHER_AGENT: 2,
+    SYNTHESIZER_AGENT: 3,
+    CRITIC_AGENT: 4
+}
+
+PLANNER_QUERY = "decompose this research prompt into a JSON task list:\n\n"
+
+# Appended to research output salvaged from a run that was cut off, so the
+# synthesizer knows it may be incomplete
+PARTIAL_RESEARCH_NOTE = "\n\n[Research incomplete: the researcher ran out of time here.]\n"
+
+
+class Phase(str, Enum):
+    """Pipeline phases"""
+    DECOMPOSE = "decompose"
+    ALLOCATE = "allocate"
+    EXECUTE = "execute"
+    SYNTHESIZE = "synthesize"
+    REVIEW = "review"
+
+
+@dataclass
+class PhaseEvent:
+    """A phase transition or progress update streamed from a run"""
+    phase: Phase
+    status: str  # started, progress, skipped, completed, failed
+    message: str = ""
+    details: Dict[str, Any] = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+
+
+class ResearchProject:
+    """On-disk layout of a research job"""
+    
+    def __init__(self, root: Path):
+        self.root = root
+        self.output_dir = root / "output"
+        self.synthesis_dir = root / "synthesis"
+        self.prompt_file = root / "prompt.txt"
+        self.tasks_file = root / "tasks.json"
+        self.ledger_file = root / "ledger.db"
+        self.planner_error_file = root / "planner_error_output.txt"
+        self.draft_report = self.synthesis_dir / "draft_report.md"
+        self.final_report = root / "final_report.md"
+        self.final_critique = self.synthesis_dir / "final_critique.md"
+        self.critic_raw_output = self.synthesis_dir / "critic_raw_output.md"
+    
+    def ensure_dirs(self):
+        for directory in (self.root, self.output_dir, self.synthesis_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+    
+    def task_output(self, index: int) -> Path:
+        return self.output_dir / f"task_{index + 1}_output.md"
+    
+    def task_error(self, index: int) -> Path:
+        return self.output_dir / f"task_{index + 1}_error.txt"
+    
+    def reset_task_outputs(self):
+        """Drop outputs of a previous plan before planning afresh"""
+        for pattern in ("task_*_output.md", "task_*_error.txt"):
+            for path in self.output_dir.glob(pattern):
+                path.unlink()
+
+
+def write_atomic(path: Path, content: str):
+    """Write a file so readers never observe a partial write"""
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def extract_json(output: str) -> Dict[str, Any]:
+    """Parse the JSON object in an agent's output, tolerating code fences"""
+    fenced = re.search(r"```(?:json)?\s*(\{.*\})\s*```", output, re.DOTALL)
+    candidate = fenced.group(1) if fenced else output
+    start, end = candidate.find("{"), candidate.rfind("}")
+    if start == -1 or end == -1:
+        raise ValueError("no JSON object found")
+    return json.loads(candidate[start:end + 1])
+
+
+def describe_task(task: Any) -> str:
+    """Researcher query for a planned task (a string or a JSON object)"""
+    if isinstance(task, dict):
+        for key in ("task", "question", "description"):
+            if isinstance(task.get(key), str):
+                return task[key]
+        return json.dumps(task)
+    return str(task)
+
+
+class ResearchOrchestrator:
+    """Runs a research job end to end on a single event loop"""
+    
+    def __init__(
+        self,
+        project_path: Path,
+        prompt: Optional[str] = None,
+        interface: Optional[ClaudeSubAgentInterface] = None,
+        workspace_manager: Optional[WorkspaceManager] = None,
+        max_concurrent: Optional[int] = None,
+        force_rerun: bool = False,
+        stream_planning: Optional[bool] = None,
+        task_queue_size: Optional[int] = None,
+        synthesis_fan_in: Optional[int] = None,
+        scheduler: Optional[FairShareScheduler] = None,
+        job_weight: float = 1.0
+    ):
+        self.config = get_config()
+        self.project = ResearchProject(Path(project_path))
+        self.prompt = prompt
+        self.interface = interface or ClaudeSubAgentInterface()
+        self.workspace_manager = workspace_manager or get_workspace_manager()
+        self.ledger = TaskLedger(self.project.ledger_file)
+        self.token_budget = self.interface.token_budget
+        self.hedge_budget = (
+            HedgeBudget(self.config.claude.hedge_budget_ratio)
+            if self.config.claude.hedge_enabled else None
+        )
+        self.force_rerun = force_rerun
+        # A forced re-run must not be answered from the response cache
+        self.use_cache = False if force_rerun else None
+        
+        settings = self.config.orchestration
+        self.stream_planning = (
+            stream_planning if stream_planning is not None else settings.stream_planning
+        )
+        self.task_queue_size = task_queue_size or settings.task_queue_size
+        self.synthesis_fan_in = synthesis_fan_in or settings.synthesis_fan_in
+        
+        if scheduler:
+            # Share one budget with the scheduler's other jobs; the
+            # interface must be this job's own
+            self.interface.concurrency_limiter = scheduler.register_job(
+                str(self.project.root), job_weight
+            )
+        
+        if max_concurrent:
+            self.interface.concurrency_limiter.set_limit(max_concurrent)
+    
+    async def run(self) -> AsyncIterator[PhaseEvent]:
+        """Run (or resume) the job, streaming phase events as they happen"""
+        self.project.ensure_dirs()
+        self._load_prompt()
+        
+        if self.stream_planning and self._should_run(self.project.tasks_file):
+            # Researchers start on each task as soon as the planner emits it
+            async for event in self._traced("decompose+execute", self._plan_and_execute()):
+                yield event
+            tasks = self._load_tasks()
+        else:
+            async for event in self._traced(Phase.DECOMPOSE.value, self._decompose()):
+                yield event
+            
+            tasks = self._load_tasks()
+            with get_tracer().span(f"phase.{Phase.ALLOCATE.value}", "orchestration"):
+                self._sync_ledger(tasks)
+                allocation = self._allocate(tasks)
+            
+            try:
+                self._admit_plan(len(tasks), len(self.ledger.pending()))
+            except TokenLimitError as e:
+                yield PhaseEvent(Phase.ALLOCATE, "failed", str(e), dict(e.details))
+                raise
+            yield allocation
+            
+            async for event in self._traced(Phase.EXECUTE.value, self._execute(tasks)):
+                yield event
+        
+        async for event in self._traced(Phase.SYNTHESIZE.value, self._synthesize(tasks)):
+            yield event
+        
+        async for event in self._traced(Phase.REVIEW.value, self._review()):
+            yield event
+    
+    @staticmethod
+    async def _traced(
+        phase: str,
+        events: AsyncIterator[PhaseEvent]
+    ) -> AsyncIterator[PhaseEvent]:
+        """Wrap a phase's event stream in a trace span"""
+        with get_tracer().span(f"phase.{phase}", "orchestration"):
+            async for event in events:
+                yield event
+    
+    async def run_to_completion(self) -> Path:
+        """Run the job, logging events, and return the final report path"""
+        async for event in self.run():
+            logger.info(
+                f"[{event.phase.value}] {event.status}: {event.message}",
+                extra=event.details
+            )
+        return self.project.final_report
+    
+    def _load_prompt(self):
+        """Persist the prompt on first run, reload it on resume"""
+        if self.prompt:
+            write_atomic(self.project.prompt_file, self.prompt)
+        elif self.project.prompt_file.exists():
+            self.prompt = self.project.prompt_file.read_text(encoding="utf-8")
+        elif not self.project.tasks_file.exists():
+            raise OrchestrationError(
+                "No prompt given and no saved prompt to resume from",
+                {'project': str(self.project.root)}
+            )
+    
+    def _should_run(self, *outputs: Path) -> bool:
+        return self.force_rerun or not all(path.exists() for path in outputs)
+    
+    def _token_estimate(self, agent_name: str) -> int:
+        return self.token_budget.tier_estimate(AGENT_TOKEN_TIERS[agent_name])
+    
+    def _admit_plan(self, total: int, to_run: int):
+        """
+        Fail fast if the rest of the job would exceed the daily token
+        budget: `to_run` researchers, the synthesis tree over `total`
+        outputs and the critic, less any phases already done.
+        """
+        estimate = to_run * self._token_estimate(RESEARCHER_AGENT)
+        if self._should_run(self.project.draft_report):
+            estimate += (
+                synthesis_calls(total, self.synthesis_fan_in)
+                * self._token_estimate(SYNTHESIZER_AGENT)
+            )
+        if self._should_run(self.project.final_report, self.project.final_critique):
+            estimate += self._token_estimate(CRITIC_AGENT)
+        
+        self.token_budget.check(estimate, f"a plan of {total} tasks")
+    
+    async def _run_agent(
+        self,
+        agent_name: str,
+        query: str,
+        claim: Optional[Callable[[], bool]] = None
+    ) -> Optional[ClaudeResult]:
+        """
+        Run one agent in a leased workspace under the shared limiter.
+        ``claim`` is called once a slot is held; if it returns False the
+        agent isn't run and None is returned.
+        """
+        settings = self.config.orchestration
+        priority = AGENT_PRIORITIES.get(agent_name, Priority.NORMAL)
+        
+        # A researcher cut off by its timeout keeps what it found, and
+        # its session is resumed rather than the research rerun
+        allow_partial = agent_name == RESEARCHER_AGENT and (
+            settings.accept_partial_research or settings.research_resume_attempts > 0
+        )
+        
+        async def run() -> Optional[ClaudeResult]:
+            if claim and not claim():
+                return None
+            # Leased only once a slot is free, so queued agents don't each
+            # hold a workspace (and a `git worktree add`) while they wait
+            async with self.workspace_manager.lease_workspace(agent_name) as workspace:
+                if self.hedge_budget and agent_name == RESEARCHER_AGENT:
+                    # Researchers are the wide fan-out: duplicate stragglers
+                    result = await self.interface.execute_hedged(
+                        self.interface.format_agent_prompt(agent_name, query),
+                        workspace,
+                        agent_name=agent_name,
+                        token_estimate=self._token_estimate(agent_name),
+                        budget=self.hedge_budget,
+                        fresh_workspace=lambda: self.workspace_manager.lease_workspace(agent_name),
+                        allow_partial=allow_partial,
+                        use_cache=self.use_cache
+                    )
+                else:
+                    result = await self.interface.execute_with_agent(
+                        agent_name, query, workspace=workspace,
+                        token_estimate=self._token_estimate(agent_name),
+                        allow_partial=allow_partial,
+                        use_cache=self.use_cache
+                    )
+                
+                # Resumes run in the same workspace (the CLI keeps sessions
+                # per directory) and under the same slot
+                resumes = 0
+                while (
+                    result.truncated
+                    and result.session_id
+                    and not result.hedged  # its session lives in another workspace
+                    and resumes < settings.research_resume_attempts
+                ):
+                    resumes += 1
+                    try:
+                        resumed = await self.interface.resume_agent(
+                            agent_name, result.session_id, workspace,
+                            token_estimate=self._token_estimate(agent_name),
+                            allow_partial=True
+                        )
+                    except ClaudeError as e:
+                        logger.warning(
+                            f"Could not resume {agent_name} session: {e}",
+                            extra={'session_id': result.session_id}
+                        )
+                        break
+                    if resumed.success or (resumed.truncated and resumed.output.strip()):
+                        result = resumed
+                    else:
+                        break
+                
+                return result
+        
+        return await self.interface.run_limited(run, priority=priority)
+    
+    # Phase 1
+    
+    async def _decompose(self) -> AsyncIterator[PhaseEvent]:
+        if not self._should_run(self.project.tasks_file):
+            yield PhaseEvent(Phase.DECOMPOSE, "skipped", "tasks.json already exists")
+            return
+        
+        yield PhaseEvent(Phase.DECOMPOSE, "started", "Decomposing prompt")
+        self.project.reset_task_outputs()
+        self.ledger.reset_plan()
+        
+        result = await self._run_agent(PLANNER_AGENT, PLANNER_QUERY + self.prompt)
+        
+        try:
+            if not result.success:
+                raise ValueError(f"planner exited with {result.exit_code}")
+            tasks_data = extract_json(result.output)
+        except ValueError as e:
+            write_atomic(self.project.planner_error_file, result.combined_output)
+            yield PhaseEvent(Phase.DECOMPOSE, "failed", str(e))
+            raise OrchestrationError(
+                f"Planner did not return a valid task list: {e}",
+                {'raw_output': str(self.project.planner_error_file)}
+            )
+        
+        write_atomic(self.project.tasks_file, json.dumps(tasks_data, indent=2))
+        self.ledger.commit_plan(
+            [describe_task(task) for task in tasks_data.get("research_tasks", [])]
+        )
+        yield PhaseEvent(
+            Phase.DECOMPOSE,
+            "completed",
+            f"Planned {len(tasks_data.get('research_tasks', []))} tasks"
+        )
+    
+    # Phases 1-3, pipelined
+    
+    async def _plan_and_execute(self) -> AsyncIterator[PhaseEvent]:
+        """Stream the plan and run researchers on tasks as they are parsed"""
+        self.project.reset_task_outputs()
+        self.ledger.reset_plan()
+        
+        events: asyncio.Queue = asyncio.Queue()
+        task_queue: asyncio.Queue = asyncio.Queue(maxsize=self.task_queue_size)
+        planned: List[Any] = []
+        counts = {'completed': 0, 'failed': 0}
+        
+        async def plan():
+            try:
+                async for task in self._stream_plan():
+                    # Researchers reserve their own estimates once started;
+                    # the queued ones and the phases after them must fit too
+                    self._admit_plan(len(planned) + 1, task_queue.qsize() + 1)
+                    self.ledger.add_task(len(planned), describe_task(task))
+                    planned.append(task)
+                    events.put_nowait(PhaseEvent(
+                        Phase.DECOMPOSE,
+                        "progress",
+                        f"Task {len(planned)} planned",
+                        {'task_index': len(planned) - 1}
+                    ))
+                    # Blocks when researchers fall behind, which in turn
+                    # stops us draining the planner's stdout
+                    await task_queue.put((len(planned) - 1, task))
+            except (OrchestrationError, ExtractionError, TokenLimitError) as e:
+                events.put_nowait(PhaseEvent(Phase.DECOMPOSE, "failed", str(e)))
+                raise
+            events.put_nowait(PhaseEvent(
+                Phase.DECOMPOSE,
+                "completed",
+                f"Planned {len(planned)} tasks"
+            ))
+        
+        async def work():
+            while True:
+                index, task = await task_queue.get()
+                try:
+                    outcome = await self._research(index, describe_task(task))
+                    if outcome is None:
+                        continue
+                    index, ok, message = outcome
+                    counts['completed' if ok else 'failed'] += 1
+                    events.put_nowait(PhaseEvent(
+                        Phase.EXECUTE,
+                        "progress",
+                        f"Task {index + 1} {'completed' if ok else 'failed'}: {message}",
+                        {'task_index': index, **counts}
+                    ))
+                finally:
+                    task_queue.task_done()
+        
+        planner = asyncio.ensure_future(plan())
+        workers = [
+            asyncio.ensure_future(work())
+            for _ in range(self.interface.concurrency_limiter.max_limit)
+        ]
+        
+        async def supervise():
+            try:
+                await planner
+                await task_queue.join()
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                events.put_nowait(None)
+        
+        supervisor = asyncio.ensure_future(supervise())
+        
+        yield PhaseEvent(Phase.DECOMPOSE, "started", "Streaming plan from planner")
+        yield PhaseEvent(Phase.EXECUTE, "started", "Running researchers as tasks are planned")
+        
+        try:
+            while True:
+                event = await events.get()
+                if event is None:
+                    break
+                yield event
+            # Surface planner failures
+            await supervisor
+        finally:
+            for task in (supervisor, planner, *workers):
+                task.cancel()
+            await asyncio.gather(supervisor, planner, *workers, return_exceptions=True)
+        
+        yield PhaseEvent(
+            Phase.EXECUTE,
+            "completed" if not counts['failed'] else "failed",
+            f"{counts['completed']} completed, {counts['failed']} failed",
+            dict(counts)
+        )
+    
+    async def _stream_plan(self) -> AsyncIterator[Any]:
+        """Yield planned tasks as soon as each is complete in the planner's output"""
+        parser = IncrementalTaskParser()
+        result = None
+        streamed = []
+        
+        # The planner runs outside the concurrency limiter: while the task
+        # queue is full it waits on researchers, and holding a slot then
+        # could leave them none (limit 1, or a scheduler whose every slot
+        # is held by a job's planner)
+        async with self.workspace_manager.lease_workspace(PLANNER_AGENT) as workspace:
+            async for item in self.interface.stream_with_agent(
+                PLANNER_AGENT, PLANNER_QUERY + self.prompt, workspace=workspace,
+                token_estimate=self._token_estimate(PLANNER_AGENT)
+            ):
+                if isinstance(item, ClaudeResult):
+                    result = item
+                else:
+                    for task in parser.feed(item):
+                        streamed.append(task)
+                        yield task
+        
+        try:
+            if not result.success:
+                raise ValueError(f"planner exited with {result.exit_code}")
+            tasks_data = extract_json(result.output)
+            if tasks_data.get("research_tasks", [])[:len(streamed)] != streamed:
+                # Researchers were started on tasks the plan doesn't have
+                raise ValueError("streamed tasks don't match the final task list")
+        except ValueError as e:
+            write_atomic(self.project.planner_error_file, result.combined_output)
+            raise OrchestrationError(
+                f"Planner did not return a valid task list: {e}",
+                {'raw_output': str(self.project.planner_error_file)}
+            )
+        
+        # Queue anything the incremental parser couldn't locate
+        for task in tasks_data.get("research_tasks", [])[parser.count:]:
+            yield task
+        
+        write_atomic(self.project.tasks_file, json.dumps(tasks_data, indent=2))
+        self.ledger.commit_plan(
+            [describe_task(task) for task in tasks_data.get("research_tasks", [])]
+        )
+    
+    # Phase 2
+    
+    def _load_tasks(self) -> List[Any]:
+        with open(self.project.tasks_file, "r", encoding="utf-8") as f:
+            tasks = json.load(f).get("research_tasks", [])
+        
+        if not tasks:
+            raise OrchestrationError(
+                "No research tasks found in tasks.json",
+                {'tasks_file': str(self.project.tasks_file)}
+            )
+        return tasks
+    
+    def _sync_ledger(self, tasks: List[Any]):
+        """Bring the ledger in line with tasks.json before resuming"""
+        descriptions = [describe_task(task) for task in tasks]
+        if not self.ledger.has_plan(descriptions):
+            # Plan edited by hand, or a project that predates the ledger
+            self.ledger.reset_plan()
+            self.ledger.commit_plan(descriptions)
+            self.ledger.import_outputs(self.project.task_output)
+        
+        self.ledger.recover()
+        if self.force_rerun:
+            self.ledger.reset_tasks()
+        else:
+            self.ledger.requeue_failed()
+            self.ledger.requeue_unverified(self.project.task_output)
+    
+    def _allocate(self, tasks: List[Any]) -> PhaseEvent:
+        pending = self.ledger.pending()
+        return PhaseEvent(
+            Phase.ALLOCATE,
+            "completed",
+            f"{len(pending)} of {len(tasks)} tasks to run",
+            {'total': len(tasks), 'pending': len(pending), **self.ledger.counts()}
+        )
+    
+    # Phase 3
+    
+    async def _execute(self, tasks: List[Any]) -> AsyncIterator[PhaseEvent]:
+        pending = self.ledger.pending()
+        
+        if not pending:
+            yield PhaseEvent(Phase.EXECUTE, "skipped", "All research tasks already completed")
+            return
+        
+        yield PhaseEvent(
+            Phase.EXECUTE,
+            "started",
+            f"Running {len(pending)} researchers",
+            {'pending': len(pending)}
+        )
+        
+        running = [
+            asyncio.ensure_future(self._research(index, describe_task(tasks[index])))
+            for index in pending
+        ]
+        completed = failed = skipped = 0
+        
+        try:
+            for next_done in asyncio.as_completed(running):
+                outcome = await next_done
+                if outcome is None:
+                    skipped += 1
+                    continue
+                index, ok, message = outcome
+                if ok:
+                    completed += 1
+                else:
+                    failed += 1
+                yield PhaseEvent(
+                    Phase.EXECUTE,
+                    "progress",
+                    f"Task {index + 1} {'completed' if ok else 'failed'}: {message}",
+                    {
+                        'task_index': index,
+                        'completed': completed,
+                        'failed': failed,
+                        'remaining': len(running) - completed - failed - skipped
+                    }
+                )
+        finally:
+            for task in running:
+                task.cancel()
+        
+        yield PhaseEvent(
+            Phase.EXECUTE,
+            "completed" if not failed else "failed",
+            f"{completed} completed, {failed} failed",
+            {'completed': completed, 'failed': failed}
+        )
+    
+    async def _research(self, index: int, description: str):
+        """
+        Claim and run one researcher task once a limiter slot is free, so
+        queued tasks stay pending for other processes. Returns None if
+        another process claimed it first; failures are recorded, never raised.
+        """
+        claimed = False
+        
+        def claim() -> bool:
+            nonlocal claimed
+            claimed = self.ledger.claim(index) is not None
+            return claimed
+        
+        try:
+            result = await self._run_agent(RESEARCHER_AGENT, description, claim=claim)
+        except asyncio.CancelledError:
+            if claimed:
+                self.ledger.release(index)
+            raise
+        except Exception as e:
+            if not claimed:
+                # Failed before it started (e.g. a rate-limit pause too
+                # long to wait out): leave it pending for the next run
+                return index, False, str(e)
+            write_atomic(self.project.task_error(index), str(e))
+            self.ledger.fail(index, str(e))
+            return index, False, str(e)
+        
+        if result is None:
+            return None
+        
+        partial = (
+            result.truncated
+            and result.output.strip()
+            and self.config.orchestration.accept_partial_research
+        )
+        if not result.success and not partial:
+            write_atomic(self.project.task_error(index), result.combined_output)
+            self.ledger.fail(index, result.combined_output, result.execution_time)
+            return index, False, f"exit code {result.exit_code}" + (
+                f" ({result.failure_kind})" if result.failure_kind else ""
+            )
+        
+        output = result.output
+        if result.truncated:
+            logger.warning(
+                "Accepting truncated research output",
+                extra={'task': index + 1, 'output_length': len(output)}
+            )
+            output += PARTIAL_RESEARCH_NOTE
+        
+        write_atomic(self.project.task_output(index), output)
+        self.ledger.complete(
+            index,
+            output,
+            result.execution_time,
+            result.input_tokens,
+            result.output_tokens,
+            output_file=self.project.task_output(index)
+        )
+        self.project.task_error(index).unlink(missing_ok=True)
+        return index, True, str(self.project.task_output(index))
+    
+    # Phase 4
+    
+    def _collect_outputs(self, tasks: List[Any]) -> List[str]:
+        outputs = []
+        for index in range(len(tasks)):
+            output_file = self.project.task_output(index)
+            if output_file.exists():
+                outputs.append(
+                    f"--- Snippet from Task {index + 1} ---\n\n"
+                    + output_file.read_text(encoding="utf-8")
+                )
+        return outputs
+    
+    async def _synthesize(self, tasks: List[Any]) -> AsyncIterator[PhaseEvent]:
+        if not self._should_run(self.project.draft_report):
+            yield PhaseEvent(Phase.SYNTHESIZE, "skipped", "draft_report.md already exists")
+            return
+        
+        outputs = self._collect_outputs(tasks)
+        if not outputs:
+            yield PhaseEvent(Phase.SYNTHESIZE, "failed", "No research outputs to synthesize")
+            raise OrchestrationError("No research outputs found to synthesize")
+        
+        yield PhaseEvent(
+            Phase.SYNTHESIZE,
+            "started",
+            f"Synthesizing {len(outputs)} outputs",
+            {'fan_in': self.synthesis_fan_in}
+        )
+        
+        # Outputs beyond the fan-in are reduced level by level in parallel
+        synthesizer = TreeSynthesizer(
+            self.interface,
+            SYNTHESIZER_AGENT,
+            fan_in=self.synthesis_fan_in,
+            workspace_manager=self.workspace_manager,
+            token_estimate=self._token_estimate(SYNTHESIZER_AGENT),
+            use_cache=self.use_cache
+        )
+        draft = None
+        
+        try:
+            async for level in synthesizer.reduce(outputs):
+                yield PhaseEvent(
+                    Phase.SYNTHESIZE,
+                    "progress",
+                    f"Level {level.level}: {level.inputs} inputs -> "
+                    f"{len(level.outputs)} syntheses",
+                    {
+                        'level': level.level,
+                        'inputs': level.inputs,
+                        'outputs': len(level.outputs),
+                        'execution_time': level.execution_time
+                    }
+                )
+                if level.is_final:
+                    draft = level.outputs[0]
+        except OrchestrationError as e:
+            yield PhaseEvent(Phase.SYNTHESIZE, "failed", str(e))
+            raise
+        
+        write_atomic(self.project.draft_report, draft)
+        yield PhaseEvent(Phase.SYNTHESIZE, "completed", str(self.project.draft_report))
+    
+    # Phase 5
+    
+    async def _review(self) -> AsyncIterator[PhaseEvent]:
+        if not self._should_run(self.project.final_report, self.project.final_critique):
+            yield PhaseEvent(Phase.REVIEW, "skipped", "final report already exists")
+            return
+        
+        yield PhaseEvent(Phase.REVIEW, "started", "Reviewing draft report")
+        
+        draft = self.project.draft_report.read_text(encoding="utf-8")
+        result = await self._run_agent(CRITIC_AGENT, draft)
+        if not result.success:
+            yield PhaseEvent(Phase.REVIEW, "failed", f"exit code {result.exit_code}")
+            raise OrchestrationError(
+                "Critic failed",
+                {'exit_code': result.exit_code, 'stderr': result.error[:500]}
+            )
+        
+        # The critic outputs the critique and the revised report separated by '---'
+        parts = result.output.split("\n---\n", 1)
+        if len(parts) != 2:
+            write_atomic(self.project.critic_raw_output, result.output)
+            yield PhaseEvent(
+                Phase.REVIEW,
+                "failed",
+                "Critic output was not in the expected format",
+                {'raw_output': str(self.project.critic_raw_output)}
+            )
+            raise OrchestrationError(
+                "Critic output was not in the expected format",
+                {'raw_output': str(self.project.critic_raw_output)}
+            )
+        
+        critique, final_report = parts
+        write_atomic(self.project.final_critique, critique)
+        write_atomic(self.project.final_report, final_report)
+        yield PhaseEvent(Phase.REVIEW, "completed", str(self.project.final_report))
+
+
+async def _print_events(orchestrator: ResearchOrchestrator, label: str = ""):
+    async for event in orchestrator.run():
+        print(f"{label}[{event.phase.value}] {event.status}: {event.message}")
+
+
+async def _main(args):
+    metrics = start_metrics_exporters()
+    tracer = get_tracer()
+    if args.trace:
+        tracer.enable()
+    
+    scheduler = None
+    if len(args.project_name) > 1:
+        # Several jobs share one fair-share budget; -w sets its initial size
+        limiter = AdaptiveLimiter.from_config(get_config().claude)
+        if args.max_concurrent:
+            limiter.set_limit(args.max_concurrent)
+        scheduler = FairShareScheduler(limiter)
+    
+    orchestrators = [
+        ResearchOrchestrator(
+            Path(project_name),
+            prompt=args.prompt,
+            max_concurrent=None if scheduler else args.max_concurrent,
+            force_rerun=args.force_rerun,
+            scheduler=scheduler
+        )
+        for project_name in args.project_name
+    ]
+    try:
+        if scheduler is None:
+            await _print_events(orchestrators[0])
+        else:
+            results = await asyncio.gather(
+                *(_print_events(o, f"{o.project.root.name} ") for o in orchestrators),
+                return_exceptions=True
+            )
+            for orchestrator, result in zip(orchestrators, results):
+                if isinstance(result, Exception):
+                    print(f"{orchestrator.project.root.name} failed: {result}")
+            print(json.dumps(scheduler.stats(), indent=2))
+    finally:
+        if scheduler:
+            await scheduler.close()
+        await orchestrators[0].workspace_manager.cleanup_all()
+        for orchestrator in orchestrators:
+            orchestrator.ledger.close()
+        metrics.stop()
+        if tracer.enabled:
+            trace_file = get_config().tracing.trace_file or (
+                orchestrators[0].project.root / "trace.json" if scheduler is None
+                else Path("trace.json")
+            )
+            tracer.write(trace_file)
+            print(f"Trace written to {trace_file}")
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(
+        description="Helios Research Swarm: asyncio research orchestrator",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter
+    )
+    parser.add_argument(
+        "-p", "--prompt",
+        help="The high-level research prompt (omit to resume an existing project)"
+    )
+    parser.add_argument(
+        "-n", "--project_name",
+        required=True,
+        nargs="+",
+        help="Project directory where all job state is stored; several run "
+             "as concurrent jobs under one fair-share scheduler"
+    )
+    parser.add_argument(
+        "-w", "--max_concurrent",
+        type=int,
+        default=None,
+        help="Initial number of parallel agents (defaults to CLAUDE_MAX_CONCURRENT)"
+    )
+    parser.add_argument(
+        "-f", "--force_rerun",
+        action="store_true",
+        help="Force re-running all phases, even if output files exist"
+    )
+    parser.add_argument(
+        "-t", "--trace",
+        action="store_true",
+        help="Write a Chrome trace of the run (TRACE_FILE, or trace.json in the project)"
+    )
+    
+    asyncio.run(_main(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
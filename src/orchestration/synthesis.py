@@ -0,0 +1,168 @@
+"""
+Hierarchical (map-reduce) synthesis of research outputs.
+Groups of outputs are summarised in parallel and the summaries combined
+level by level, so no single synthesizer call sees the whole fan-out.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import List, Optional, AsyncIterator
+
+from ..core.config import get_config
+from ..core.logging import get_logger
+from ..core.exceptions import OrchestrationError
+from ..claude.cli_interface import ClaudeSubAgentInterface
+from ..claude.workspace_manager import WorkspaceManager
+from ..claude.concurrency import Priority
+from ..utils.tracing import get_tracer
+
+logger = get_logger(__name__)
+
+INTERMEDIATE_QUERY = (
+    "produce an intermediate synthesis of the research snippets below. "
+    "It will be merged with other summaries, so keep every key finding, "
+    "figure and source:\n\n"
+)
+
+
+def synthesis_calls(outputs: int, fan_in: int) -> int:
+    """Number of synthesizer executions needed to reduce `outputs` inputs"""
+    calls = 0
+    while outputs > fan_in:
+        outputs = -(-outputs // fan_in)
+        calls += outputs
+    return calls + 1 if outputs else 0
+
+
+@dataclass
+class SynthesisLevel:
+    """One level of the reduction tree"""
+    level: int
+    inputs: int
+    outputs: List[str]
+    execution_time: float
+    
+    @property
+    def is_final(self) -> bool:
+        return len(self.outputs) == 1
+
+
+class TreeSynthesizer:
+    """Tree-reduction synthesizer built on ClaudeInterface.execute_batch"""
+    
+    def __init__(
+        self,
+        interface: ClaudeSubAgentInterface,
+        agent_name: str,
+        fan_in: Optional[int] = None,
+        workspace_manager: Optional[WorkspaceManager] = None,
+        priority: Priority = Priority.CRITICAL,
+        token_estimate: Optional[int] = None,
+        use_cache: Optional[bool] = None
+    ):
+        self.interface = interface
+        self.agent_name = agent_name
+        self.fan_in = fan_in or get_config().orchestration.synthesis_fan_in
+        self.workspace_manager = workspace_manager
+        self.priority = priority
+        self.token_estimate = token_estimate
+        self.use_cache = use_cache
+        
+        if self.fan_in < 2:
+            raise ValueError(f"fan_in must be at least 2, got {self.fan_in}")
+    
+    async def reduce(self, outputs: List[str]) -> AsyncIterator[SynthesisLevel]:
+        """
+        Reduce outputs to a single synthesis, yielding each level as it
+        completes. The last level yielded holds the final synthesis.
+        """
+        if not outputs:
+            raise OrchestrationError("No outputs to synthesize")
+        
+        items = list(outputs)
+        level = 0
+        
+        while True:
+            level += 1
+            final = len(items) <= self.fan_in
+            groups = [items] if final else self._balanced_groups(items)
+            
+            start = time.monotonic()
+            with get_tracer().span("synthesis.level", "orchestration", level=level, groups=len(groups)):
+                summaries = await self._synthesize_groups(groups, final)
+            
+            yield SynthesisLevel(
+                level=level,
+                inputs=len(items),
+                outputs=summaries,
+                execution_time=time.monotonic() - start
+            )
+            
+            if final:
+                return
+            items = summaries
+    
+    async def synthesize(self, outputs: List[str]) -> str:
+        """Reduce outputs and return the final synthesis"""
+        result = None
+        async for level in self.reduce(outputs):
+            result = level.outputs[0] if level.is_final else None
+        return result
+    
+    async def _synthesize_groups(self, groups: List[List[str]], final: bool) -> List[str]:
+        """Synthesize every group of a level in one batch"""
+        prompts = [
+            (
+                self.interface.format_agent_prompt(
+                    self.agent_name,
+                    self._group_query(group, final)
+                ),
+                None
+            )
+            for group in groups
+        ]
+        
+        # Each group leases its workspace once it holds a slot, like _run_agent
+        results = await self.interface.execute_batch(
+            prompts,
+            agent_name=self.agent_name,
+            priority=self.priority,
+            token_estimate=self.token_estimate,
+            lease_workspace=(
+                (lambda: self.workspace_manager.lease_workspace(self.agent_name))
+                if self.workspace_manager else None
+            ),
+            use_cache=self.use_cache
+        )
+        
+        summaries = []
+        for index, result in enumerate(results):
+            if isinstance(result, Exception):
+                raise OrchestrationError(
+                    f"Synthesis of group {index + 1} failed: {result}",
+                    {'group': index}
+                )
+            if not result.success:
+                raise OrchestrationError(
+                    f"Synthesis of group {index + 1} failed",
+                    {'group': index, 'exit_code': result.exit_code, 'stderr': result.error[:500]}
+                )
+            summaries.append(result.output)
+        
+        return summaries
+    
+    def _balanced_groups(self, items: List[str]) -> List[List[str]]:
+        """Split into the fewest groups within fan_in, sized as evenly as possible"""
+        count = -(-len(items) // self.fan_in)
+        size, extra = divmod(len(items), count)
+        groups, start = [], 0
+        for index in range(count):
+            end = start + size + (1 if index < extra else 0)
+            groups.append(items[start:end])
+            start = end
+        return groups
+    
+    @staticmethod
+    def _group_query(group: List[str], final: bool) -> str:
+        combined = "\n\n".join(group)
+        return combined if final else INTERMEDIATE_QUERY + combined
@@ -0,0 +1,211 @@
+"""
+Lightweight span tracing with Chrome Trace Event export.
+Spans nest through contextvars, so they follow asyncio tasks, and a run
+can be opened in chrome://tracing or Perfetto as a timeline.
+"""
+
+import asyncio
+import functools
+import json
+import os
+import threading
+import time
+import weakref
+from contextlib import nullcontext
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, Any, Optional, List, Callable
+
+from ..core.config import get_config
+from ..core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Shared no-op context manager returned while tracing is disabled
+_NOOP_SPAN = nullcontext()
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    """A timed region, recorded as a Chrome "complete" (X) event on exit"""
+    
+    __slots__ = ("tracer", "name", "category", "args", "span_id", "parent", "start_ns", "_token")
+    
+    def __init__(self, tracer: "Tracer", name: str, category: str, args: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.span_id = tracer._next_span_id()
+        self.parent: Optional[Span] = None
+        self.start_ns = 0
+        self._token = None
+    
+    def set(self, **args):
+        """Attach extra arguments to the span"""
+        self.args.update(args)
+    
+    def __enter__(self) -> "Span":
+        self.parent = _current_span.get()
+        self._token = _current_span.set(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        end_ns = time.perf_counter_ns()
+        try:
+            _current_span.reset(self._token)
+        except ValueError:
+            # Exited from another context (e.g. an async generator closed
+            # by the garbage collector); restore the parent explicitly
+            _current_span.set(self.parent)
+        
+        if exc_type is not None:
+            self.args['error'] = exc_type.__name__
+        self.tracer._record(self, end_ns)
+        return False
+
+
+class Tracer:
+    """Collects spans in memory and writes them as Chrome Trace Event JSON"""
+    
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._events: List[Dict[str, Any]] = []
+        self._origin_ns = time.perf_counter_ns()
+        self._span_ids = 0
+        self._lock = threading.Lock()
+        self._task_tids: "weakref.WeakKeyDictionary[asyncio.Task, int]" = weakref.WeakKeyDictionary()
+        self._next_tid = 1
+    
+    def enable(self):
+        self.enabled = True
+    
+    def disable(self):
+        self.enabled = False
+    
+    def span(self, name: str, category: str = "helios", **args):
+        """Context manager timing a region; a shared no-op when disabled"""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, name, category, args)
+    
+    def instant(self, name: str, category: str = "helios", **args):
+        """Record a point-in-time marker"""
+        if not self.enabled:
+            return
+        self._events.append({
+            'name': name,
+            'cat': category,
+            'ph': 'i',
+            's': 't',
+            'ts': self._micros(time.perf_counter_ns()),
+            'pid': os.getpid(),
+            'tid': self._tid(),
+            'args': args
+        })
+    
+    def _next_span_id(self) -> int:
+        with self._lock:
+            self._span_ids += 1
+            return self._span_ids
+    
+    def _micros(self, ns: int) -> float:
+        return (ns - self._origin_ns) / 1000
+    
+    def _tid(self) -> int:
+        """One timeline lane per asyncio task (or per thread outside a loop)"""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        
+        if task is None:
+            return threading.get_ident() % 100000
+        
+        tid = self._task_tids.get(task)
+        if tid is None:
+            with self._lock:
+                tid = self._next_tid
+                self._next_tid += 1
+            self._task_tids[task] = tid
+            self._events.append({
+                'name': 'thread_name',
+                'ph': 'M',
+                'pid': os.getpid(),
+                'tid': tid,
+                'args': {'name': task.get_name()}
+            })
+        return tid
+    
+    def _record(self, span: Span, end_ns: int):
+        args = dict(span.args, span_id=span.span_id)
+        if span.parent is not None:
+            args['parent_id'] = span.parent.span_id
+        
+        self._events.append({
+            'name': span.name,
+            'cat': span.category,
+            'ph': 'X',
+            'ts': self._micros(span.start_ns),
+            'dur': (end_ns - span.start_ns) / 1000,
+            'pid': os.getpid(),
+            'tid': self._tid(),
+            'args': args
+        })
+    
+    @property
+    def events(self) -> List[Dict[str, Any]]:
+        return list(self._events)
+    
+    def clear(self):
+        self._events.clear()
+        self._origin_ns = time.perf_counter_ns()
+    
+    def write(self, path: Path) -> Path:
+        """Write collected events as a Chrome Trace Event JSON file"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        trace = {
+            'traceEvents': self.events,
+            'displayTimeUnit': 'ms'
+        }
+        path.write_text(json.dumps(trace, default=str), encoding="utf-8")
+        logger.info(f"Wrote trace with {len(trace['traceEvents'])} events to {path}")
+        return path
+
+
+def current_span() -> Optional[Span]:
+    """The innermost active span in this context"""
+    return _current_span.get()
+
+
+def traced(name: Optional[str] = None, category: str = "helios"):
+    """Decorator wrapping a coroutine function in a span"""
+    def decorator(func: Callable):
+        span_name = name or func.__qualname__
+        
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            tracer = get_tracer()
+            if not tracer.enabled:
+                return await func(*args, **kwargs)
+            with tracer.span(span_name, category):
+                return await func(*args, **kwargs)
+        
+        return wrapper
+    return decorator
+
+
+# Global tracer instance
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    """Get the global tracer, enabled from TracingConfig on first use"""
+    global _tracer
+    if _tracer is None:
+        config = get_config().tracing
+        _tracer = Tracer(enabled=config.enabled or config.trace_file is not None)
+    return _tracer
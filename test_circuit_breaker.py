@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+test_circuit_breaker.py - Tests for the circuit breaker around the CLI
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.core.exceptions import CircuitBreakerError
+from src.claude.circuit_breaker import CircuitBreaker, CircuitState, get_circuit_breaker
+from src.claude.cli_interface import ClaudeInterface
+from src.claude.retry import FailureKind
+
+
+def tripped(open_seconds: float = 60.0) -> CircuitBreaker:
+    """A breaker opened by a window of failures"""
+    breaker = CircuitBreaker("test", failure_ratio=0.5, min_calls=4, open_seconds=open_seconds)
+    for kind in [None, FailureKind.TRANSIENT, None, FailureKind.TIMEOUT]:
+        breaker.before_call()
+        breaker.record(kind)
+    return breaker
+
+
+def test_opens_at_failure_ratio():
+    breaker = tripped()
+    
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.times_opened == 1
+
+
+def test_stays_closed_below_min_calls():
+    breaker = CircuitBreaker("test", failure_ratio=0.5, min_calls=4)
+    for _ in range(3):
+        breaker.record(FailureKind.TRANSIENT)
+    
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_stays_closed_below_failure_ratio():
+    breaker = CircuitBreaker("test", failure_ratio=0.5, min_calls=4)
+    for kind in [None, None, None, FailureKind.TRANSIENT]:
+        breaker.record(kind)
+    
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_rate_limits_do_not_count_as_failures():
+    breaker = CircuitBreaker("test", failure_ratio=0.5, min_calls=4)
+    for _ in range(10):
+        breaker.record(FailureKind.RATE_LIMITED)
+    
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_refuses_calls_while_open():
+    breaker = tripped()
+    
+    with pytest.raises(CircuitBreakerError):
+        breaker.before_call()
+
+
+def test_half_open_admits_a_single_probe():
+    breaker = tripped(open_seconds=0)
+    
+    assert breaker.before_call() is True
+    assert breaker.state == CircuitState.HALF_OPEN
+    with pytest.raises(CircuitBreakerError):
+        breaker.before_call()
+
+
+def test_successful_probe_closes():
+    breaker = tripped(open_seconds=0)
+    breaker.record(None, probe=breaker.before_call())
+    
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.before_call() is False
+
+
+def test_failed_probe_reopens():
+    breaker = tripped(open_seconds=0)
+    breaker.record(FailureKind.TRANSIENT, probe=breaker.before_call())
+    
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.times_opened == 2
+
+
+def test_abandoned_probe_frees_the_probe_slot():
+    breaker = tripped(open_seconds=0)
+    breaker.abandon(breaker.before_call())
+    
+    assert breaker.before_call() is True
+
+
+def test_no_breaker_when_disabled(fake_claude):
+    # CLAUDE_CIRCUIT_ENABLED=false in the fixture
+    assert get_circuit_breaker("claude", "opus") is None
+
+
+def test_breakers_keyed_by_cli_and_model(fake_claude, monkeypatch):
+    monkeypatch.setenv("CLAUDE_CIRCUIT_ENABLED", "true")
+    
+    assert get_circuit_breaker("claude", "opus") is get_circuit_breaker("claude", "opus")
+    assert get_circuit_breaker("claude", "opus") is not get_circuit_breaker("claude", "sonnet")
+    assert get_circuit_breaker("claude") is not get_circuit_breaker("other-claude")
+
+
+def test_failing_cli_fails_fast_once_open(fake_claude, monkeypatch):
+    monkeypatch.setenv("CLAUDE_CIRCUIT_ENABLED", "true")
+    monkeypatch.setenv("CLAUDE_CIRCUIT_MIN_CALLS", "3")
+    monkeypatch.setenv("CLAUDE_CIRCUIT_OPEN_SECONDS", "60")
+    fake_claude(exit_codes="1:1", stderr="backend unavailable")
+    
+    async def main():
+        interface = ClaudeInterface()
+        results = [await interface.execute(f"prompt {index}") for index in range(3)]
+        with pytest.raises(CircuitBreakerError):
+            await interface.execute("one more")
+        return results, interface.circuit_breaker
+    
+    results, breaker = asyncio.run(main())
+    
+    assert not any(result.success for result in results)
+    assert breaker.state == CircuitState.OPEN
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+test_concurrency.py - Tests for the AIMD concurrency limiter
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.claude.cli_interface import ClaudeInterface
+from src.claude.concurrency import AdaptiveLimiter
+from src.claude.retry import FailureKind
+
+
+def saturated(limiter: AdaptiveLimiter, outcomes) -> AdaptiveLimiter:
+    """Record outcomes with every slot of the limiter in use"""
+    async def main():
+        slots = limiter.limit
+        for _ in range(slots):
+            await limiter.acquire()
+        for kind in outcomes:
+            # A steady one-second latency, so none looks unhealthy
+            limiter.record(time.monotonic() - 1.0, kind)
+        for _ in range(slots):
+            await limiter.release()
+    asyncio.run(main())
+    return limiter
+
+
+def test_grows_additively_while_healthy():
+    limiter = saturated(AdaptiveLimiter(initial_limit=2, max_limit=10), [None] * 3)
+    
+    # Each success adds 1/limit: about one slot per limit-sized window
+    assert limiter.limit == 3
+    assert [limit for _, limit in limiter.history] == [2, 3]
+
+
+def test_stops_at_max_limit():
+    limiter = saturated(AdaptiveLimiter(initial_limit=3, max_limit=3), [None] * 20)
+    
+    assert limiter.limit == 3
+
+
+def test_does_not_grow_while_underused():
+    limiter = AdaptiveLimiter(initial_limit=4, max_limit=10)
+    for _ in range(20):
+        limiter.record(time.monotonic(), None)
+    
+    assert limiter.limit == 4
+
+
+@pytest.mark.parametrize("kind", [FailureKind.RATE_LIMITED, FailureKind.TIMEOUT])
+def test_backs_off_multiplicatively_on_congestion(kind):
+    limiter = AdaptiveLimiter(initial_limit=8, max_limit=10)
+    limiter.record(time.monotonic(), kind)
+    
+    assert limiter.limit == 4
+
+
+def test_backs_off_once_per_congestion_event():
+    limiter = AdaptiveLimiter(initial_limit=8, max_limit=10)
+    started_at = time.monotonic()
+    # Executions that started before the decrease saw the old limit
+    for _ in range(3):
+        limiter.record(started_at, FailureKind.RATE_LIMITED)
+    
+    assert limiter.limit == 4
+    
+    limiter.record(time.monotonic(), FailureKind.RATE_LIMITED)
+    
+    assert limiter.limit == 2
+
+
+def test_ordinary_failures_do_not_back_off():
+    limiter = AdaptiveLimiter(initial_limit=8, max_limit=10)
+    limiter.record(time.monotonic(), FailureKind.TRANSIENT)
+    
+    assert limiter.limit == 8
+    assert limiter.success_rate == 0.0
+
+
+def test_never_drops_below_min_limit():
+    limiter = AdaptiveLimiter(initial_limit=2, min_limit=1, max_limit=10)
+    for _ in range(5):
+        limiter.record(time.monotonic(), FailureKind.TIMEOUT)
+    
+    assert limiter.limit == 1
+
+
+def test_fixed_limit_when_not_adaptive():
+    limiter = AdaptiveLimiter(initial_limit=4, max_limit=10, adaptive=False)
+    limiter.record(time.monotonic(), FailureKind.RATE_LIMITED)
+    saturated(limiter, [None] * 20)
+    
+    assert limiter.limit == 4
+
+
+def test_acquire_waits_for_a_free_slot():
+    async def main():
+        limiter = AdaptiveLimiter(initial_limit=1, max_limit=1)
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0.05)
+        blocked = not waiter.done()
+        await limiter.release()
+        await asyncio.wait_for(waiter, 1)
+        return blocked, limiter.in_flight
+    
+    assert asyncio.run(main()) == (True, 1)
+
+
+def test_metrics_report_limit_history():
+    limiter = AdaptiveLimiter(initial_limit=8, max_limit=10)
+    limiter.record(time.monotonic(), FailureKind.TIMEOUT)
+    metrics = limiter.metrics()
+    
+    assert metrics['limit'] == 4
+    assert [entry['limit'] for entry in metrics['history']] == [8, 4]
+
+
+def test_batch_cap_leaves_shared_limit_alone(fake_claude):
+    fake_claude(latency="fixed:0.2")
+    interface = ClaudeInterface()
+    interface.concurrency_limiter = AdaptiveLimiter(initial_limit=4, max_limit=4)
+    
+    running = peak = 0
+    execute = interface.execute
+    
+    async def counted(*args, **kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        try:
+            return await execute(*args, **kwargs)
+        finally:
+            running -= 1
+    
+    interface.execute = counted
+    prompts = [(f"prompt {index}", None) for index in range(6)]
+    results = asyncio.run(interface.execute_batch(prompts, max_concurrent=2, hedge=False))
+    
+    assert all(result.success for result in results)
+    assert peak == 2
+    assert interface.concurrency_limiter.limit == 4
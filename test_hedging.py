@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+test_hedging.py - Tests for hedged executions
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.claude.cli_interface import ClaudeInterface
+from src.claude.hedging import HedgeBudget
+from src.claude.process_tree import group_alive
+
+
+@pytest.fixture
+def hedging_cli(fake_claude, monkeypatch, tmp_path):
+    """A fake CLI with a call log, hedging after a few samples; returns the log"""
+    monkeypatch.setenv("CLAUDE_HEDGE_MIN_SAMPLES", "5")
+    call_log = tmp_path / "calls.log"
+    fake_claude(call_log=call_log)
+    return fake_claude, call_log
+
+
+def cli_pids(call_log: Path) -> list:
+    if not call_log.exists():
+        return []
+    return [int(line.split()[1]) for line in call_log.read_text().splitlines()]
+
+
+def with_history(seconds: float) -> ClaudeInterface:
+    """An interface whose p95 latency is ``seconds``"""
+    interface = ClaudeInterface()
+    for _ in range(5):
+        interface.latency_history.record(None, seconds)
+    return interface
+
+
+def test_budget_caps_hedges_at_ratio_of_primaries():
+    budget = HedgeBudget(0.1)
+    for _ in range(10):
+        budget.register()
+    
+    assert budget.try_acquire()
+    assert not budget.try_acquire()
+    
+    for _ in range(10):
+        budget.register()
+    assert budget.try_acquire()
+    assert budget.hedges == 2
+
+
+def test_no_hedge_without_history(hedging_cli):
+    configure, call_log = hedging_cli
+    budget = HedgeBudget(1.0)
+    
+    result = asyncio.run(ClaudeInterface().execute_hedged("prompt", budget=budget))
+    
+    assert result.success and not result.hedged
+    assert budget.hedges == 0
+    assert len(cli_pids(call_log)) == 1
+
+
+def test_no_hedge_over_budget(hedging_cli):
+    configure, call_log = hedging_cli
+    configure(latency="fixed:1")
+    budget = HedgeBudget(0.0)
+    
+    result = asyncio.run(with_history(0.2).execute_hedged("prompt", budget=budget))
+    
+    assert result.success and not result.hedged
+    assert len(cli_pids(call_log)) == 1
+
+
+def test_hedge_wins_and_loser_group_is_killed(hedging_cli):
+    configure, call_log = hedging_cli
+    configure(latency="fixed:30", tool_procs=2)
+    interface = with_history(0.5)
+    budget = HedgeBudget(1.0)
+    
+    async def main():
+        execution = asyncio.ensure_future(interface.execute_hedged("prompt", budget=budget))
+        while not cli_pids(call_log):
+            await asyncio.sleep(0.05)
+        # Only the duplicate, spawned after this, is fast
+        configure(latency="fixed:0")
+        return await asyncio.wait_for(execution, 20)
+    
+    result = asyncio.run(main())
+    
+    assert result.success and result.hedged
+    assert budget.hedges == 1
+    primary, duplicate = cli_pids(call_log)
+    assert not group_alive(primary)
+    assert not group_alive(duplicate)
+
+
+def test_hedge_delay_starts_at_spawn(hedging_cli):
+    configure, call_log = hedging_cli
+    interface = with_history(1.0)
+    budget = HedgeBudget(1.0)
+    
+    async def main():
+        # Closed for longer than the hedge delay before the primary can spawn
+        interface.rate_limit_gate.trip(1.5)
+        return await interface.execute_hedged("prompt", budget=budget)
+    
+    result = asyncio.run(main())
+    
+    assert result.success and not result.hedged
+    assert budget.hedges == 0
+    assert len(cli_pids(call_log)) == 1
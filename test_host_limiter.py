@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+test_host_limiter.py - Tests for the host-wide slot limiter
+"""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+ROOT = Path(__file__).parent
+sys.path.insert(0, str(ROOT))
+
+from src.claude.host_limiter import HostLimiter, STATE_FILE, process_start_time
+
+# Holds slots from many tasks at once, logging "<time> <+1|-1>" per change
+WORKER = """
+import asyncio, sys, time
+from src.claude.host_limiter import HostLimiter
+
+limiter = HostLimiter(int(sys.argv[1]), sys.argv[2], poll_interval=0.01, max_poll_interval=0.05)
+
+async def hold():
+    for _ in range(3):
+        async with limiter.slot():
+            with open(sys.argv[3], "a") as log:
+                log.write(f"{time.time()} 1\\n")
+            await asyncio.sleep(0.05)
+            with open(sys.argv[3], "a") as log:
+                log.write(f"{time.time()} -1\\n")
+
+async def main():
+    await asyncio.gather(*[hold() for _ in range(6)])
+
+asyncio.run(main())
+"""
+
+
+def dead_pid() -> int:
+    process = subprocess.Popen(["true"])
+    process.wait()
+    return process.pid
+
+
+def write_holders(runtime_dir: Path, holders: dict):
+    runtime_dir.mkdir(parents=True, exist_ok=True)
+    (runtime_dir / STATE_FILE).write_text(json.dumps(holders))
+
+
+def test_processes_sharing_a_runtime_dir_stay_within_slots(tmp_path):
+    log = tmp_path / "holds.log"
+    workers = [
+        subprocess.Popen(
+            [sys.executable, "-c", WORKER, "2", str(tmp_path / "runtime"), str(log)],
+            cwd=ROOT
+        )
+        for _ in range(2)
+    ]
+    for worker in workers:
+        assert worker.wait(timeout=60) == 0
+    
+    # Each hold is logged inside the time the slot was held
+    changes = sorted(
+        (float(at), int(change))
+        for at, change in (line.split() for line in log.read_text().splitlines())
+    )
+    held = peak = 0
+    for _, change in changes:
+        held += change
+        peak = max(peak, held)
+    
+    assert len(changes) == 2 * 6 * 3 * 2
+    assert peak == 2
+    assert HostLimiter(2, tmp_path / "runtime").in_use() == 0
+
+
+def test_reclaims_slots_of_dead_processes(tmp_path):
+    write_holders(tmp_path, {'dead': {'pid': dead_pid(), 'started': None}})
+    limiter = HostLimiter(1, tmp_path)
+    
+    assert limiter.try_acquire() is not None
+
+
+def test_reclaims_slots_of_reused_pids(tmp_path):
+    # A live PID with another start time belongs to a different process
+    write_holders(tmp_path, {'reused': {'pid': os.getpid(), 'started': "1"}})
+    limiter = HostLimiter(1, tmp_path)
+    
+    assert limiter.try_acquire() is not None
+
+
+def test_keeps_slots_of_live_processes(tmp_path):
+    started = process_start_time(os.getpid())
+    write_holders(tmp_path, {'live': {'pid': os.getpid(), 'started': started}})
+    limiter = HostLimiter(1, tmp_path)
+    
+    assert limiter.try_acquire() is None
+    assert limiter.in_use() == 1
+
+
+def test_cancelled_acquire_does_not_leak_a_slot(tmp_path):
+    limiter = HostLimiter(1, tmp_path, poll_interval=0.01)
+    
+    async def main():
+        held = await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0.05)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        await limiter.release_async(held)
+        return await asyncio.wait_for(limiter.acquire(), 1)
+    
+    token = asyncio.run(main())
+    
+    assert limiter.in_use() == 1
+    limiter.release(token)
+    assert limiter.in_use() == 0
+
+
+def test_slot_won_after_cancel_is_released(tmp_path, monkeypatch):
+    limiter = HostLimiter(1, tmp_path)
+    try_acquire = limiter.try_acquire
+    
+    def slow_try_acquire():
+        time.sleep(0.2)
+        return try_acquire()
+    
+    monkeypatch.setattr(limiter, "try_acquire", slow_try_acquire)
+    
+    async def main():
+        waiter = asyncio.ensure_future(limiter.acquire())
+        # Cancelled while the worker thread is about to take the slot
+        await asyncio.sleep(0.05)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.sleep(0.4)
+    
+    asyncio.run(main())
+    
+    assert limiter.in_use() == 0
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+test_json_stream.py - Tests for the incremental planner output parser
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.core.exceptions import ExtractionError
+from src.extraction.json_stream import IncrementalTaskParser
+
+PLAN = {
+    "research_tasks": [
+        "Survey prior work",
+        {"task": "Benchmark the \"fast\" path", "priority": 1},
+        ["nested", "list"],
+        42
+    ]
+}
+
+
+def parse(text: str, chunk_size: int = 1) -> tuple:
+    """Feed text in chunks and return (tasks, parser)"""
+    parser = IncrementalTaskParser()
+    tasks = []
+    for start in range(0, len(text), chunk_size):
+        tasks.extend(parser.feed(text[start:start + chunk_size]))
+    return tasks, parser
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 10_000])
+def test_emits_every_element(chunk_size):
+    tasks, parser = parse(json.dumps(PLAN, indent=2), chunk_size)
+    
+    assert tasks == PLAN["research_tasks"]
+    assert parser.count == len(PLAN["research_tasks"])
+    assert parser.done
+
+
+def test_emits_elements_before_document_ends():
+    parser = IncrementalTaskParser()
+    
+    assert parser.feed('{"research_tasks": ["one", "tw') == ["one"]
+    assert parser.feed('o", ') == ["two"]
+    assert not parser.done
+
+
+def test_ignores_code_fence_and_preamble():
+    text = "Here is the plan:\n```json\n" + json.dumps(PLAN) + "\n```\n"
+    tasks, _ = parse(text)
+    
+    assert tasks == PLAN["research_tasks"]
+
+
+@pytest.mark.parametrize("preamble", [
+    "I split this into [3] parts.\n",
+    "Plan for topic [draft]:\n",
+    "Tasks [a, b] and {braces} aside, here it is:\n",
+])
+def test_ignores_brackets_before_the_plan(preamble):
+    tasks, parser = parse(preamble + json.dumps(PLAN))
+    
+    assert tasks == PLAN["research_tasks"]
+    assert parser.count == len(PLAN["research_tasks"])
+
+
+def test_ignores_other_arrays_in_the_object():
+    text = json.dumps({
+        "notes": ["not", "a", "task"],
+        "meta": {"research_tasks": ["nested, not the plan"]},
+        "research_tasks": ["real"]
+    })
+    tasks, _ = parse(text)
+    
+    assert tasks == ["real"]
+
+
+def test_bare_array_is_not_a_plan():
+    tasks, parser = parse('["a", "b"]')
+    
+    assert tasks == []
+    assert not parser.found
+
+
+def test_malformed_element_raises():
+    with pytest.raises(ExtractionError):
+        parse('{"research_tasks": [nope]}')
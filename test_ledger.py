@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+test_ledger.py - Tests for the SQLite task ledger
+"""
+
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.claude.workspace_manager import WorkspaceManager
+from src.orchestration.ledger import TaskLedger, TaskState, default_worker_id
+from src.orchestration.orchestrator import ResearchOrchestrator
+
+PLAN = ["First question", "Second question", "Third question"]
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    ledger = TaskLedger(tmp_path / "ledger.db", worker_id="test:1")
+    ledger.commit_plan(PLAN)
+    yield ledger
+    ledger.close()
+
+
+def dead_worker_id() -> str:
+    process = subprocess.Popen(["true"])
+    process.wait()
+    return f"{socket.gethostname()}:{process.pid}"
+
+
+def test_commit_plan(ledger):
+    assert ledger.has_plan(PLAN)
+    assert not ledger.has_plan(PLAN[:2])
+    assert ledger.pending() == [0, 1, 2]
+
+
+def test_claims_lowest_pending_task(ledger):
+    first = ledger.claim()
+    second = ledger.claim()
+    
+    assert (first["idx"], first["description"], first["attempts"]) == (0, PLAN[0], 1)
+    assert second["idx"] == 1
+    assert ledger.task(0)["state"] == TaskState.RUNNING
+
+
+def test_claim_by_index_only_once(ledger):
+    assert ledger.claim(2)["idx"] == 2
+    assert ledger.claim(2) is None
+
+
+def test_workers_never_claim_the_same_task(ledger, tmp_path):
+    other = TaskLedger(tmp_path / "ledger.db", worker_id="test:2")
+    claimed = []
+    for worker in [ledger, other, other, ledger]:
+        row = worker.claim()
+        if row:
+            claimed.append(row["idx"])
+    other.close()
+    
+    assert sorted(claimed) == [0, 1, 2]
+
+
+def test_failed_tasks_requeue_with_attempts(ledger):
+    ledger.claim(0)
+    ledger.fail(0, "exit code 1")
+    
+    assert ledger.task(0)["state"] == TaskState.FAILED
+    assert ledger.requeue_failed() == 1
+    assert ledger.claim(0)["attempts"] == 2
+
+
+def test_release_does_not_fail_the_task(ledger):
+    ledger.claim(0)
+    ledger.release(0)
+    
+    assert ledger.task(0)["state"] == TaskState.PENDING
+    assert ledger.counts()["failed"] == 0
+
+
+def test_recovers_tasks_of_dead_workers(ledger, tmp_path):
+    dead = TaskLedger(tmp_path / "ledger.db", worker_id=dead_worker_id())
+    dead.claim(0)
+    dead.close()
+    live = TaskLedger(tmp_path / "ledger.db")
+    live.claim(1)
+    live.close()
+    
+    assert ledger.recover() == 1
+    assert ledger.task(0)["state"] == TaskState.PENDING
+    assert ledger.task(1)["state"] == TaskState.RUNNING
+
+
+def test_recovers_tasks_of_reused_pids(ledger, tmp_path):
+    # This process's PID with another start time: a dead worker whose PID was reused
+    reused = TaskLedger(tmp_path / "ledger.db", worker_id=f"{socket.gethostname()}:{os.getpid()}:1")
+    reused.claim(0)
+    reused.close()
+    
+    assert default_worker_id() != reused.worker_id
+    assert ledger.recover() == 1
+    assert ledger.task(0)["state"] == TaskState.PENDING
+
+
+def test_verify_output(ledger, tmp_path):
+    output_file = tmp_path / "task_1_output.md"
+    output_file.write_text("findings")
+    ledger.claim(0)
+    ledger.complete(0, "findings")
+    
+    assert ledger.verify_output(0, output_file)
+    
+    output_file.write_text("edited")
+    
+    assert not ledger.verify_output(0, output_file)
+    assert not ledger.verify_output(0, tmp_path / "missing.md")
+    assert not ledger.verify_output(1, output_file)
+
+
+def test_requeue_unverified(ledger, tmp_path):
+    def output_for_index(index: int) -> Path:
+        return tmp_path / f"task_{index + 1}_output.md"
+    
+    for index in range(3):
+        output_for_index(index).write_text(f"findings {index}")
+        ledger.claim(index)
+        ledger.complete(index, f"findings {index}", output_file=output_for_index(index))
+    output_for_index(1).write_text("truncated")
+    output_for_index(2).unlink()
+    
+    assert ledger.requeue_unverified(output_for_index) == 2
+    assert ledger.pending() == [1, 2]
+
+
+def test_requeue_unverified_trusts_unchanged_stat(ledger, tmp_path):
+    output_file = tmp_path / "task_1_output.md"
+    output_file.write_text("findings")
+    ledger.claim(0)
+    ledger.complete(0, "findings", output_file=output_file)
+    recorded = output_file.stat()
+    
+    # Same size and mtime: trusted without reading the file
+    output_file.write_text("FINDINGS")
+    os.utime(output_file, ns=(recorded.st_atime_ns, recorded.st_mtime_ns))
+    assert ledger.requeue_unverified(lambda index: tmp_path / f"task_{index + 1}_output.md") == 0
+    
+    # A touched file with the recorded content is kept and re-stamped
+    output_file.write_text("findings")
+    assert ledger.requeue_unverified(lambda index: tmp_path / f"task_{index + 1}_output.md") == 0
+    assert ledger.task(0)["output_mtime_ns"] == output_file.stat().st_mtime_ns
+
+
+def test_import_outputs(ledger, tmp_path):
+    (tmp_path / "task_2_output.md").write_text("findings")
+    
+    assert ledger.import_outputs(lambda index: tmp_path / f"task_{index + 1}_output.md") == 1
+    assert ledger.pending() == [0, 2]
+
+
+def test_summary(ledger):
+    ledger.claim(0)
+    ledger.complete(0, "findings", execution_time=2.0, input_tokens=10, output_tokens=5)
+    summary = ledger.summary()
+    
+    assert (summary["tasks"], summary["attempts"]) == (3, 1)
+    assert (summary["input_tokens"], summary["output_tokens"]) == (10, 5)
+    assert summary["states"]["completed"] == 1
+
+
+def test_resume_reruns_tasks_with_changed_output(fake_claude, tmp_path):
+    orchestrator = ResearchOrchestrator(
+        tmp_path / "project", "Study things", workspace_manager=WorkspaceManager()
+    )
+    orchestrator.project.ensure_dirs()
+    orchestrator.ledger.commit_plan(PLAN)
+    for index in range(3):
+        orchestrator.project.task_output(index).write_text(f"findings {index}")
+        orchestrator.ledger.claim(index)
+        orchestrator.ledger.complete(index, f"findings {index}")
+    orchestrator.project.task_output(0).write_text("edited by hand")
+    
+    orchestrator._sync_ledger(PLAN)
+    
+    assert orchestrator.ledger.pending() == [0]
+    orchestrator.ledger.close()
+
+
+def test_tasks_are_claimed_only_with_a_slot(fake_claude, monkeypatch, tmp_path):
+    monkeypatch.setenv("CLAUDE_MAX_CONCURRENT", "1")
+    monkeypatch.setenv("CLAUDE_ADAPTIVE_CONCURRENCY", "false")
+    fake_claude(latency="fixed:0.2")
+    orchestrator = ResearchOrchestrator(
+        tmp_path / "project", "Study things", workspace_manager=WorkspaceManager()
+    )
+    orchestrator.project.ensure_dirs()
+    orchestrator.ledger.commit_plan(PLAN)
+    running = []
+    
+    async def main():
+        execution = asyncio.ensure_future(asyncio.gather(*[
+            orchestrator._research(index, description) for index, description in enumerate(PLAN)
+        ]))
+        while not execution.done():
+            running.append(orchestrator.ledger.counts()["running"])
+            await asyncio.sleep(0.05)
+        return await execution
+    
+    outcomes = asyncio.run(main())
+    orchestrator.ledger.close()
+    
+    assert [ok for _, ok, _ in outcomes] == [True] * 3
+    assert max(running) == 1
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+test_logging.py - Tests for the queue-based logging mode
+"""
+
+import logging
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.core.logging import BoundedQueueHandler, BoundedQueueListener
+
+
+class CollectingHandler(logging.Handler):
+    """Keeps emitted messages, optionally waiting for a release first"""
+    
+    def __init__(self, released: threading.Event = None):
+        super().__init__()
+        self.messages = []
+        self.released = released
+    
+    def emit(self, record: logging.LogRecord):
+        if self.released is not None:
+            self.released.wait()
+        self.messages.append(record.getMessage())
+
+
+def log(handler: logging.Handler, *messages: str):
+    for message in messages:
+        handler.handle(logging.makeLogRecord({'msg': message}))
+
+
+def wait_until_taken(log_queue: queue.Queue):
+    """Wait for the listener to pick up what's queued"""
+    while not log_queue.empty():
+        time.sleep(0.01)
+
+
+def queued(log_queue: queue.Queue) -> list:
+    return [record.getMessage() for record in list(log_queue.queue)]
+
+
+def test_drop_newest_discards_records_that_dont_fit():
+    log_queue = queue.Queue(maxsize=2)
+    handler = BoundedQueueHandler(log_queue, "drop_newest")
+    
+    log(handler, "one", "two", "three")
+    
+    assert queued(log_queue) == ["one", "two"]
+    assert handler.dropped == 1
+
+
+def test_drop_oldest_evicts_to_make_room():
+    log_queue = queue.Queue(maxsize=2)
+    handler = BoundedQueueHandler(log_queue, "drop_oldest")
+    
+    log(handler, "one", "two", "three", "four")
+    
+    assert queued(log_queue) == ["three", "four"]
+    assert handler.dropped == 2
+
+
+def test_records_are_snapshotted_when_queued():
+    log_queue = queue.Queue()
+    handler = BoundedQueueHandler(log_queue)
+    args = ["before"]
+    
+    handler.handle(logging.makeLogRecord({'msg': "%s", 'args': (args,)}))
+    args[0] = "after"
+    
+    assert queued(log_queue) == ["['before']"]
+
+
+def test_stop_waits_for_room_in_a_full_queue():
+    log_queue = queue.Queue(maxsize=3)
+    handler = BoundedQueueHandler(log_queue)
+    release = threading.Event()
+    output = CollectingHandler(release)
+    listener = BoundedQueueListener(log_queue, output, handler=handler)
+    listener.start()
+    
+    log(handler, "one")
+    wait_until_taken(log_queue)
+    log(handler, "two", "three", "four")
+    assert log_queue.full()
+    threading.Timer(0.2, release.set).start()
+    listener.stop()
+    
+    assert output.messages == ["one", "two", "three", "four"]
+    assert handler.dropped == 0
+
+
+def test_stop_discards_the_queue_when_the_listener_is_stuck():
+    log_queue = queue.Queue(maxsize=3)
+    handler = BoundedQueueHandler(log_queue)
+    release = threading.Event()
+    output = CollectingHandler(release)
+    listener = BoundedQueueListener(log_queue, output, handler=handler, stop_timeout=0.1)
+    listener.start()
+    
+    log(handler, "one")
+    wait_until_taken(log_queue)
+    log(handler, "two", "three", "four")
+    # Still stuck on "one" when stop() gives up waiting for room
+    threading.Timer(0.5, release.set).start()
+    listener.stop()
+    
+    assert output.messages == ["one"]
+    assert handler.dropped == 3
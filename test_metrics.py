@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+test_metrics.py - Tests for the metrics registry and its Prometheus export
+"""
+
+import re
+import sys
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.utils.metrics import MetricsRegistry
+
+# One sample line of the text exposition format: name{labels} value
+SAMPLE = re.compile(
+    r'^[a-zA-Z_:][a-zA-Z0-9_:]*'
+    r'(\{[a-zA-Z_][a-zA-Z0-9_]*="(\\.|[^"\\])*"(,[a-zA-Z_][a-zA-Z0-9_]*="(\\.|[^"\\])*")*\})?'
+    r' (-?[0-9.e+-]+|[+-]Inf|NaN)$'
+)
+
+
+def parse(text: str) -> dict:
+    """Check every line is well formed; returns {sample without value: value}"""
+    assert text.endswith("\n")
+    samples = {}
+    typed = set()
+    for line in text.splitlines():
+        if line.startswith("# TYPE "):
+            _, _, name, kind = line.split(" ")
+            assert kind in ("counter", "gauge", "histogram")
+            typed.add(name)
+        elif line.startswith("# HELP "):
+            continue
+        else:
+            assert SAMPLE.match(line), line
+            sample, value = line.rsplit(" ", 1)
+            assert re.sub(r"(_bucket|_sum|_count)?(\{.*)?$", "", sample) in typed
+            samples[sample] = float(value)
+    return samples
+
+
+def test_counters_and_gauges_render_with_labels():
+    registry = MetricsRegistry()
+    registry.counter("runs_total", "Runs", ["outcome"]).inc(outcome="ok")
+    registry.counter("runs_total", "Runs", ["outcome"]).inc(2, outcome="ok")
+    registry.gauge("in_flight", "Running now").set(3)
+    
+    samples = parse(registry.render())
+    
+    assert samples['runs_total{outcome="ok"}'] == 3
+    assert samples['in_flight'] == 3
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.counter("errors_total", "Errors", ["message"]).inc(message='a "quoted"\\path\nline')
+    
+    samples = parse(registry.render())
+    
+    assert samples['errors_total{message="a \\"quoted\\"\\\\path\\nline"}'] == 1
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", buckets=(1.0, 5.0))
+    for value in (0.5, 2.0, 3.0, 10.0):
+        histogram.observe(value)
+    
+    samples = parse(registry.render())
+    
+    assert samples['latency_seconds_bucket{le="1"}'] == 1
+    assert samples['latency_seconds_bucket{le="5"}'] == 3
+    assert samples['latency_seconds_bucket{le="+Inf"}'] == 4
+    assert samples['latency_seconds_sum'] == 15.5
+    assert samples['latency_seconds_count'] == 4
+
+
+def test_conflicting_registrations_are_rejected():
+    registry = MetricsRegistry()
+    registry.counter("things", "Things")
+    
+    with pytest.raises(ValueError):
+        registry.gauge("things", "Things")
+    with pytest.raises(ValueError):
+        registry.counter("things", "Things").inc(kind="x")
+
+
+def test_textfile_and_http_exports_match_render(tmp_path):
+    registry = MetricsRegistry()
+    registry.counter("runs_total", "Runs").inc()
+    registry.write_textfile(tmp_path / "metrics.prom")
+    
+    server = registry.start_http_server(0)
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/metrics"
+        with urllib.request.urlopen(url) as response:
+            body = response.read().decode("utf-8")
+            content_type = response.headers["Content-Type"]
+    finally:
+        registry.stop()
+    
+    assert (tmp_path / "metrics.prom").read_text() == registry.render()
+    assert body == registry.render()
+    assert content_type.startswith("text/plain; version=0.0.4")
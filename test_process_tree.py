@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+test_process_tree.py - Tests that CLI process groups are torn down
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.core.exceptions import ClaudeTimeoutError
+from src.claude.cli_interface import ClaudeInterface
+from src.claude.process_tree import group_alive
+
+
+@pytest.fixture
+def tool_cli(fake_claude, tmp_path):
+    """A fake CLI that leaves two tool processes running; returns its call log"""
+    call_log = tmp_path / "calls.log"
+    fake_claude(call_log=call_log, tool_procs=2)
+    return fake_claude, call_log
+
+
+def cli_pids(call_log: Path) -> list:
+    if not call_log.exists():
+        return []
+    return [int(line.split()[1]) for line in call_log.read_text().splitlines()]
+
+
+def test_group_is_gone_after_normal_exit(tool_cli):
+    _, call_log = tool_cli
+    
+    result = asyncio.run(ClaudeInterface().execute("prompt"))
+    
+    assert result.success
+    assert not group_alive(cli_pids(call_log)[0])
+
+
+def test_group_is_gone_after_timeout(tool_cli):
+    configure, call_log = tool_cli
+    configure(latency="fixed:30")
+    
+    with pytest.raises(ClaudeTimeoutError):
+        asyncio.run(ClaudeInterface().execute("prompt", timeout=1))
+    
+    assert not group_alive(cli_pids(call_log)[0])
+
+
+def test_group_is_gone_after_cancel(tool_cli):
+    configure, call_log = tool_cli
+    configure(latency="fixed:30")
+    
+    async def main():
+        execution = asyncio.ensure_future(ClaudeInterface().execute("prompt"))
+        while not cli_pids(call_log):
+            await asyncio.sleep(0.05)
+        # Let the CLI start its tools
+        await asyncio.sleep(0.5)
+        pgid = cli_pids(call_log)[0]
+        assert group_alive(pgid)
+        
+        execution.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await execution
+        return pgid
+    
+    assert not group_alive(asyncio.run(main()))
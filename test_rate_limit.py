@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+test_rate_limit.py - Tests for failure classification and the rate-limit gate
+"""
+
+import asyncio
+import signal
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.core.exceptions import ClaudeTimeoutError, RateLimitError
+from src.claude.cli_interface import ClaudeInterface, ClaudeResult
+from src.claude.rate_limit import RateLimitGate, parse_retry_after
+from src.claude.retry import FailureKind, RetryPolicy, classify_failure
+
+
+def failed(output: str = "", error: str = "", exit_code: int = 1, envelope_error: str = None):
+    return ClaudeResult(
+        success=False, output=output, error=error, exit_code=exit_code,
+        execution_time=0.1, command="claude", envelope_error=envelope_error
+    )
+
+
+@pytest.mark.parametrize("text, seconds", [
+    ("Claude AI usage limit reached|1700000060", 60.0),
+    ("429 Too Many Requests, retry-after: 30", 30.0),
+    ("Rate limited. Try again in 2 minutes.", 120.0),
+    ('{"error": "rate_limit", "retry_after_ms": 1500}', None),
+    ("rate limit; retry in 500ms", 0.5),
+    ("resets in 1 hour", 3600.0),
+    ("Too many requests", None),
+])
+def test_parse_retry_after(text, seconds):
+    assert parse_retry_after(text, now=1700000000.0) == seconds
+
+
+@pytest.mark.parametrize("result, kind", [
+    (failed(error="Error: 429 Too Many Requests"), FailureKind.RATE_LIMITED),
+    (failed(envelope_error="Claude AI usage limit reached|1735689600"), FailureKind.RATE_LIMITED),
+    (failed(error="FATAL ERROR: Reached heap limit"), FailureKind.MEMORY_LIMIT),
+    (failed(exit_code=-signal.SIGXCPU), FailureKind.CPU_LIMIT),
+    (failed(exit_code=127), FailureKind.FATAL),
+    (failed(error="Invalid API key"), FailureKind.FATAL),
+    (failed(error="No conversation found with session ID: abc"), FailureKind.FATAL),
+    (failed(error="socket hang up"), FailureKind.TRANSIENT),
+])
+def test_classify_failure(result, kind):
+    assert classify_failure(result) == kind
+
+
+def test_model_output_is_not_a_diagnostic():
+    # A report about rate limits (or authentication) says nothing about the run
+    result = failed(output="APIs answer 429 when the rate limit is hit; "
+                           "authentication errors return 401.")
+    
+    assert classify_failure(result) == FailureKind.TRANSIENT
+
+
+@pytest.mark.parametrize("error, kind", [
+    (RateLimitError(retry_after=5), FailureKind.RATE_LIMITED),
+    (ClaudeTimeoutError("timed out", 10), FailureKind.TIMEOUT),
+    (FileNotFoundError("claude"), FailureKind.FATAL),
+    (BlockingIOError("EAGAIN"), FailureKind.TRANSIENT),
+])
+def test_classify_exceptions(error, kind):
+    assert classify_failure(error=error) == kind
+
+
+def test_success_has_no_failure_kind():
+    result = ClaudeResult(success=True, output="rate limit", error="", exit_code=0,
+                          execution_time=0.1, command="claude")
+    
+    assert classify_failure(result) is None
+
+
+def test_retry_delays_use_bounded_jitter():
+    policy = RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=5.0)
+    delay = 0.0
+    for _ in range(50):
+        delay = policy.next_delay(delay)
+        assert 1.0 <= delay <= 5.0
+    
+    assert policy.should_retry(FailureKind.RATE_LIMITED, 2)
+    assert not policy.should_retry(FailureKind.RATE_LIMITED, 3)
+    assert not policy.should_retry(FailureKind.CPU_LIMIT, 1)
+
+
+def test_gate_pauses_until_hinted_reset():
+    gate = RateLimitGate(release_jitter=0)
+    gate.trip(0.2)
+    
+    assert gate.closed
+    waited = asyncio.run(gate.wait())
+    assert 0.15 <= waited < 1.0
+    assert not gate.closed
+
+
+def test_gate_backoff_is_bounded_and_resets():
+    gate = RateLimitGate(base_delay=1.0, max_delay=30.0)
+    pauses = [gate.trip() for _ in range(5)]
+    
+    assert all(1.0 <= pause <= 30.0 for pause in pauses)
+    assert gate.trips == 5
+    
+    gate.reset()
+    assert gate.trip() == 1.0
+
+
+def test_gate_fails_fast_beyond_max_wait():
+    gate = RateLimitGate(max_wait=1.0)
+    gate.trip(600)
+    
+    with pytest.raises(RateLimitError) as excinfo:
+        asyncio.run(gate.wait())
+    assert excinfo.value.retry_after > 500
+
+
+def test_usage_limit_closes_the_gate(fake_claude, monkeypatch):
+    monkeypatch.setenv("CLAUDE_RATE_LIMIT_MAX_WAIT", "1")
+    fake_claude(rate_limit_until=time.time() + 600)
+    interface = ClaudeInterface()
+    
+    with pytest.raises(RateLimitError) as excinfo:
+        asyncio.run(interface.execute("prompt"))
+    
+    assert 500 < excinfo.value.retry_after <= 600
+    assert interface.rate_limit_gate.closed
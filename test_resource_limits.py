@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+test_resource_limits.py - Tests for per-agent resource limits
+"""
+
+import asyncio
+import json
+import os
+import signal
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.core.config import get_config
+from src.core.exceptions import ConfigurationError
+from src.claude.cli_interface import ClaudeInterface
+from src.claude.circuit_breaker import CircuitState
+from src.claude.resource_limits import ResourceLimits, resolve_limits
+from src.claude.retry import FailureKind
+
+
+def write_agent(directory: Path, name: str, limits: dict) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    agent_file = directory / f"{name}.md"
+    frontmatter = json.dumps({'name': name, 'resource_limits': limits})
+    agent_file.write_text(f"---\n{frontmatter}\n---\nYou help.\n")
+    return agent_file
+
+
+def test_frontmatter_overrides_env_defaults(fake_claude, monkeypatch, tmp_path):
+    monkeypatch.setenv("CLAUDE_LIMIT_MEMORY_MB", "1000")
+    monkeypatch.setenv("CLAUDE_LIMIT_CPU_SECONDS", "60")
+    write_agent(tmp_path / "agents", "helper", {'memory_mb': 2000})
+    
+    limits = resolve_limits(get_config().claude, "helper", [tmp_path / "agents"])
+    
+    assert (limits.memory_mb, limits.cpu_seconds) == (2000, 60)
+
+
+def test_agent_overrides_take_precedence_over_frontmatter(fake_claude, monkeypatch, tmp_path):
+    monkeypatch.setenv("CLAUDE_LIMIT_MEMORY_MB", "1000")
+    monkeypatch.setenv("CLAUDE_AGENT_LIMITS", json.dumps({'helper': {'memory_mb': 3000}}))
+    write_agent(tmp_path / "agents", "helper", {'memory_mb': 2000, 'nice': 5})
+    
+    limits = resolve_limits(get_config().claude, "helper", [tmp_path / "agents"])
+    
+    assert (limits.memory_mb, limits.nice) == (3000, 5)
+
+
+def test_unlimited_agents_resolve_to_none(fake_claude, tmp_path):
+    assert resolve_limits(get_config().claude, "helper", [tmp_path / "agents"]) is None
+
+
+def test_wrap_execs_the_cli_through_limit_tools():
+    cpu = min(os.sched_getaffinity(0))
+    limits = ResourceLimits(
+        memory_mb=1024, cpu_seconds=10, cpu_affinity=frozenset({cpu}),
+        nice=os.getpriority(os.PRIO_PROCESS, 0) + 5
+    )
+    wrapped = limits.wrap(["claude", "-p", "prompt"])
+    
+    assert Path(wrapped[0]).name == "prlimit"
+    assert f"--as={1024 * 2**20}:{1024 * 2**20}" in wrapped
+    assert "--cpu=10:15" in wrapped
+    assert wrapped[wrapped.index("--cpu-list") + 1] == str(cpu)
+    assert wrapped[wrapped.index("-n") + 1] == "5"
+    assert wrapped[-3:] == ["claude", "-p", "prompt"]
+
+
+def test_wrap_rejects_cpus_outside_affinity():
+    limits = ResourceLimits(cpu_affinity=frozenset({max(os.sched_getaffinity(0)) + 1}))
+    
+    with pytest.raises(ConfigurationError):
+        limits.wrap(["claude"])
+
+
+def test_ungrantable_limits_fail_before_the_breaker(fake_claude, monkeypatch):
+    monkeypatch.setenv("CLAUDE_CIRCUIT_ENABLED", "true")
+    monkeypatch.setenv("CLAUDE_CIRCUIT_MIN_CALLS", "1")
+    monkeypatch.setenv("CLAUDE_LIMIT_CPU_AFFINITY", str(max(os.sched_getaffinity(0)) + 1))
+    interface = ClaudeInterface()
+    
+    for _ in range(3):
+        with pytest.raises(ConfigurationError):
+            asyncio.run(interface.execute("prompt"))
+    
+    assert interface.circuit_breaker.state == CircuitState.CLOSED
+
+
+def test_cpu_limit_kills_with_sigxcpu(fake_claude, monkeypatch):
+    monkeypatch.setenv("CLAUDE_LIMIT_CPU_SECONDS", "1")
+    fake_claude(burn_cpu=10)
+    
+    result = asyncio.run(ClaudeInterface().execute("prompt"))
+    
+    assert not result.success
+    assert result.exit_code == -signal.SIGXCPU
+    assert result.failure_kind == FailureKind.CPU_LIMIT.value
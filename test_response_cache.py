@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+test_response_cache.py - Tests for the response cache
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.core.config import CacheConfig
+from src.claude.cli_interface import ClaudeInterface
+from src.claude.response_cache import ResponseCache
+from src.claude.workspace_manager import WorkspaceManager
+from src.orchestration.orchestrator import ResearchOrchestrator, CRITIC_AGENT
+
+
+@pytest.fixture
+def cached_cli(fake_claude, monkeypatch, tmp_path):
+    """The fake CLI with the response cache on; returns its call log"""
+    monkeypatch.setenv("CACHE_ENABLED", "true")
+    call_log = tmp_path / "calls.log"
+    fake_claude(call_log=call_log)
+    return call_log
+
+
+def calls(call_log: Path) -> int:
+    return len(call_log.read_text().splitlines()) if call_log.exists() else 0
+
+
+def entries(interface: ClaudeInterface) -> int:
+    return interface.cache.stats()['entries']
+
+
+def run_critic(tmp_path: Path, force_rerun: bool):
+    orchestrator = ResearchOrchestrator(
+        tmp_path / "project", "Study things",
+        workspace_manager=WorkspaceManager(), force_rerun=force_rerun
+    )
+    try:
+        return asyncio.run(orchestrator._run_agent(CRITIC_AGENT, "review this draft"))
+    finally:
+        orchestrator.ledger.close()
+
+
+def test_repeat_run_is_served_from_cache(cached_cli, tmp_path):
+    first = run_critic(tmp_path, force_rerun=False)
+    second = run_critic(tmp_path, force_rerun=False)
+    
+    assert not first.cached
+    assert second.cached
+    assert calls(cached_cli) == 1
+
+
+def test_force_rerun_bypasses_cache(cached_cli, tmp_path):
+    run_critic(tmp_path, force_rerun=False)
+    rerun = run_critic(tmp_path, force_rerun=True)
+    
+    assert rerun.success
+    assert not rerun.cached
+    assert calls(cached_cli) == 2
+
+
+def test_entries_expire_after_ttl(tmp_path):
+    cache = ResponseCache(CacheConfig(enabled=True, ttl_seconds=1, cache_dir=tmp_path))
+    key = ResponseCache.make_key("prompt")
+    cache.set(key, {'output': "findings"})
+    
+    assert cache.get(key) == {'output': "findings"}
+    time.sleep(1.1)
+    assert cache.get(key) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+    cache.close()
+
+
+def test_key_follows_the_agent_definition(cached_cli, tmp_path):
+    agent_file = tmp_path / "agents" / "helper.md"
+    agent_file.parent.mkdir()
+    agent_file.write_text("You help.")
+    interface = ClaudeInterface()
+    
+    async def run():
+        return await interface.execute("prompt", agent_name="helper")
+    
+    assert not asyncio.run(run()).cached
+    assert asyncio.run(run()).cached
+    
+    agent_file.write_text("You help, briefly.")
+    
+    assert not asyncio.run(run()).cached
+    assert calls(cached_cli) == 2
+    assert entries(interface) == 2
+
+
+def test_failed_results_are_not_cached(cached_cli, fake_claude):
+    fake_claude(exit_codes="1:1", stderr="backend unavailable")
+    interface = ClaudeInterface()
+    
+    for _ in range(2):
+        assert not asyncio.run(interface.execute("prompt")).success
+    
+    assert calls(cached_cli) == 2
+    assert entries(interface) == 0
+
+
+def test_dry_run_results_are_not_cached(cached_cli, monkeypatch):
+    monkeypatch.setenv("DRY_RUN", "true")
+    interface = ClaudeInterface()
+    
+    for _ in range(2):
+        result = asyncio.run(interface.execute("prompt"))
+        assert result.output.startswith("[DRY RUN]")
+        assert not result.cached
+    
+    assert entries(interface) == 0
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+test_resume.py - Tests for session resume against the fake CLI
+"""
+
+import asyncio
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.claude.cli_interface import ClaudeSubAgentInterface
+from src.claude.workspace_manager import WorkspaceManager
+from src.orchestration.orchestrator import ResearchOrchestrator, RESEARCHER_AGENT
+
+AGENT = "test-agent"
+
+
+@pytest.fixture
+def workspace(fake_claude, tmp_path):
+    path = tmp_path / "workspace"
+    path.mkdir()
+    return path
+
+
+def run_and_resume(workspace: Path, session_id: str = None):
+    """Run an agent, then resume its session (or session_id instead)"""
+    async def main():
+        interface = ClaudeSubAgentInterface()
+        first = await interface.execute_with_agent(AGENT, "research things", workspace)
+        resumed = await interface.resume_agent(AGENT, session_id or first.session_id, workspace)
+        return first, resumed
+    return asyncio.run(main())
+
+
+def test_result_records_session_id(workspace):
+    first, _ = run_and_resume(workspace)
+    
+    assert first.success
+    assert uuid.UUID(first.session_id)
+
+
+def test_resume_continues_session(workspace):
+    first, resumed = run_and_resume(workspace)
+    
+    assert resumed.success
+    assert "--resume" in resumed.command
+    assert resumed.session_id == first.session_id
+    # The original prompt is paid for as cache reads, not input again
+    assert resumed.cache_read_tokens > 0
+    assert resumed.output.strip()
+
+
+def test_resume_unknown_session_fails_without_retrying(workspace, monkeypatch):
+    monkeypatch.setenv("CLAUDE_RETRY_ATTEMPTS", "2")
+    
+    _, resumed = run_and_resume(workspace, session_id=str(uuid.uuid4()))
+    
+    assert not resumed.success
+    assert resumed.failure_kind == "fatal"
+    assert resumed.attempts == 1
+
+
+def test_resume_from_another_directory_fails(workspace, tmp_path):
+    async def main():
+        interface = ClaudeSubAgentInterface()
+        first = await interface.execute_with_agent(AGENT, "research things", workspace)
+        elsewhere = tmp_path / "elsewhere"
+        elsewhere.mkdir()
+        return await interface.resume_agent(AGENT, first.session_id, elsewhere)
+    
+    assert not asyncio.run(main()).success
+
+
+@pytest.fixture
+def orchestrator(fake_claude, monkeypatch, tmp_path):
+    """An orchestrator whose researchers time out after partial output"""
+    monkeypatch.setenv("CLAUDE_TIMEOUT", "1")
+    monkeypatch.setenv("RESEARCH_RESUME_ATTEMPTS", "1")
+    fake_claude(latency="fixed:3", chunks=10, output_bytes=4096)
+    return ResearchOrchestrator(
+        tmp_path / "project", "Study things", workspace_manager=WorkspaceManager()
+    )
+
+
+def resume_with(orchestrator, monkeypatch, before_resume):
+    """Run a researcher, calling before_resume() ahead of any resume"""
+    interface = orchestrator.interface
+    resume_agent = interface.resume_agent
+    resumed_sessions = []
+    
+    async def resume(agent_name, session_id, *args, **kwargs):
+        resumed_sessions.append(session_id)
+        before_resume()
+        return await resume_agent(agent_name, session_id, *args, **kwargs)
+    
+    monkeypatch.setattr(interface, "resume_agent", resume)
+    result = asyncio.run(orchestrator._run_agent(RESEARCHER_AGENT, "research things"))
+    return result, resumed_sessions
+
+
+def test_timed_out_researcher_is_resumed(orchestrator, monkeypatch, fake_claude):
+    result, resumed_sessions = resume_with(
+        orchestrator, monkeypatch, lambda: fake_claude(latency="fixed:0")
+    )
+    
+    assert len(resumed_sessions) == 1
+    assert result.success
+    assert not result.truncated
+    assert result.session_id == resumed_sessions[0]
+
+
+def test_stale_session_keeps_partial_output(orchestrator, monkeypatch, tmp_path):
+    def forget_sessions():
+        for session in (tmp_path / "sessions").glob("*.json"):
+            session.unlink()
+    
+    result, resumed_sessions = resume_with(orchestrator, monkeypatch, forget_sessions)
+    
+    assert len(resumed_sessions) == 1
+    # The failed resume falls back to what the timed-out run produced
+    assert result.truncated
+    assert result.output.strip()
+    assert "--resume" not in result.command
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+test_retry.py - Tests for retries around CLI executions
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.claude.cli_interface import ClaudeInterface, ClaudeResult
+from src.claude.retry import FailureKind
+
+
+@pytest.fixture
+def retrying_cli(fake_claude, monkeypatch, tmp_path):
+    """Two retries with short backoff, under a single concurrency slot"""
+    monkeypatch.setenv("CLAUDE_RETRY_ATTEMPTS", "2")
+    monkeypatch.setenv("CLAUDE_RATE_LIMIT_DELAY", "0.05")
+    monkeypatch.setenv("CLAUDE_RETRY_MAX_DELAY", "0.2")
+    monkeypatch.setenv("CLAUDE_MAX_CONCURRENT", "1")
+    monkeypatch.setenv("CLAUDE_ADAPTIVE_CONCURRENCY", "false")
+    call_log = tmp_path / "calls.log"
+    fake_claude(call_log=call_log)
+    return fake_claude, call_log
+
+
+def calls(call_log: Path) -> int:
+    return len(call_log.read_text().splitlines()) if call_log.exists() else 0
+
+
+def test_retries_are_recorded_on_the_result(retrying_cli):
+    configure, call_log = retrying_cli
+    configure(exit_codes="1:1", stderr="socket hang up")
+    
+    result = asyncio.run(ClaudeInterface().execute("prompt"))
+    
+    assert not result.success
+    assert result.failure_kind == FailureKind.TRANSIENT.value
+    assert result.attempts == 3
+    assert 0.1 <= result.retry_backoff <= 0.4
+    assert calls(call_log) == 3
+
+
+def test_non_retryable_failures_are_not_retried(retrying_cli):
+    configure, call_log = retrying_cli
+    configure(exit_codes="1:1", stderr="Invalid API key")
+    
+    result = asyncio.run(ClaudeInterface().execute("prompt"))
+    
+    assert result.failure_kind == FailureKind.FATAL.value
+    assert result.attempts == 1
+    assert calls(call_log) == 1
+
+
+def test_retry_without_retry_flag(retrying_cli):
+    configure, call_log = retrying_cli
+    configure(exit_codes="1:1", stderr="socket hang up")
+    
+    result = asyncio.run(ClaudeInterface().execute("prompt", retry=False))
+    
+    assert result.attempts == 1
+    assert calls(call_log) == 1
+
+
+def test_backoff_does_not_hold_a_slot(retrying_cli, monkeypatch):
+    configure, _ = retrying_cli
+    monkeypatch.setenv("CLAUDE_RATE_LIMIT_DELAY", "1.0")
+    monkeypatch.setenv("CLAUDE_RETRY_MAX_DELAY", "1.0")
+    monkeypatch.setenv("CLAUDE_RETRY_ATTEMPTS", "1")
+    configure(exit_codes="1:1", stderr="socket hang up")
+    interface = ClaudeInterface()
+    
+    async def other_work() -> ClaudeResult:
+        return ClaudeResult(success=True, output="", error="", exit_code=0,
+                            execution_time=0.0, command="")
+    
+    async def main():
+        failing = asyncio.ensure_future(
+            interface.run_limited(lambda: interface.execute("prompt"))
+        )
+        await asyncio.sleep(0.5)
+        # The failing execution is backing off and has given up the only slot
+        start = time.monotonic()
+        await interface.run_limited(other_work)
+        waited = time.monotonic() - start
+        result = await failing
+        return waited, result
+    
+    waited, result = asyncio.run(main())
+    
+    assert result.attempts == 2
+    assert waited < 0.3
+    assert interface.concurrency_limiter.in_flight == 0
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+test_scheduler.py - Tests for the fair-share job scheduler
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.claude.concurrency import AdaptiveLimiter, Priority
+from src.claude.scheduler import FairShareScheduler
+
+
+def grant_order(limit: int, requests, caps=None, weights=None) -> tuple:
+    """
+    Queue (job, priority) requests before any slot is free, then let them
+    run. Returns the order slots were granted in, the scheduler and each
+    job's peak slots in use. Holders keep a slot for a few loop iterations.
+    """
+    async def main():
+        limiter = AdaptiveLimiter(initial_limit=limit, max_limit=limit, adaptive=False)
+        scheduler = FairShareScheduler(limiter)
+        jobs = {}
+        for job, _ in requests:
+            if job not in jobs:
+                weight = (weights or {}).get(job, 1.0)
+                jobs[job] = scheduler.register_job(job, weight, (caps or {}).get(job))
+        
+        order = []
+        peak = {job: 0 for job in jobs}
+        
+        async def run(job: str, priority: Priority):
+            started_at = await jobs[job].acquire(priority)
+            order.append((job, priority))
+            peak[job] = max(peak[job], jobs[job].in_flight)
+            for _ in range(3):
+                await asyncio.sleep(0)
+            jobs[job].record(started_at, None)
+            await jobs[job].release()
+        
+        # Hold every slot until all requests are queued
+        for _ in range(limit):
+            await limiter.acquire()
+        tasks = [asyncio.ensure_future(run(job, priority)) for job, priority in requests]
+        await asyncio.sleep(0.01)
+        for _ in range(limit):
+            await limiter.release()
+        await asyncio.gather(*tasks)
+        await scheduler.close()
+        return order, scheduler, peak
+    
+    return asyncio.run(main())
+
+
+def test_slots_follow_job_weights():
+    requests = [("a", Priority.NORMAL)] * 6 + [("b", Priority.NORMAL)] * 6
+    order, _, _ = grant_order(1, requests, weights={"a": 2.0, "b": 1.0})
+    jobs = [job for job, _ in order]
+    
+    assert jobs[:6].count("a") == 4
+    assert jobs[:6].count("b") == 2
+
+
+def test_equal_weights_alternate():
+    requests = [("a", Priority.NORMAL)] * 4 + [("b", Priority.NORMAL)] * 4
+    order, _, _ = grant_order(1, requests)
+    jobs = [job for job, _ in order]
+    
+    assert jobs == ["a", "b"] * 4
+
+
+def test_critical_work_runs_first_within_a_job():
+    requests = [("a", Priority.NORMAL)] * 3 + [("a", Priority.CRITICAL)]
+    order, _, _ = grant_order(1, requests)
+    
+    assert order[0] == ("a", Priority.CRITICAL)
+
+
+def test_job_cap_limits_its_share():
+    requests = [("a", Priority.NORMAL)] * 6 + [("b", Priority.NORMAL)] * 6
+    _, _, peak = grant_order(4, requests, caps={"a": 1})
+    
+    assert peak["a"] == 1
+    assert peak["b"] == 3
+
+
+def test_job_stats():
+    requests = [("a", Priority.NORMAL)] * 3 + [("a", Priority.CRITICAL)]
+    _, scheduler, _ = grant_order(1, requests)
+    stats = scheduler.job_stats("a")
+    
+    assert stats['submitted'] == stats['dispatched'] == stats['completed'] == 4
+    assert stats['queued'] == stats['in_flight'] == 0
+    assert set(stats['total_wait_by_priority']) == {"normal", "critical"}
+    assert stats['max_wait'] >= stats['avg_wait'] > 0
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    async def main():
+        limiter = AdaptiveLimiter(initial_limit=1, max_limit=1, adaptive=False)
+        scheduler = FairShareScheduler(limiter)
+        job = scheduler.register_job("a")
+        
+        await job.acquire()
+        waiter = asyncio.ensure_future(job.acquire())
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        await job.release()
+        
+        # The slot is free again for the next request
+        await asyncio.wait_for(job.acquire(), 1)
+        await job.release()
+        await scheduler.close()
+        return limiter.in_flight
+    
+    assert asyncio.run(main()) == 0
+
+
+def test_register_job_validation():
+    scheduler = FairShareScheduler(AdaptiveLimiter(initial_limit=1))
+    scheduler.register_job("a")
+    
+    with pytest.raises(ValueError):
+        scheduler.register_job("a")
+    with pytest.raises(ValueError):
+        scheduler.register_job("b", weight=0)
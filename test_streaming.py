@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+test_streaming.py - Tests for execute_stream() and prompt delivery
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.claude.cli_interface import ClaudeInterface, ClaudeResult, STDERR_TAIL_SIZE
+from src.claude.process_tree import group_alive
+
+
+def cli_pids(call_log: Path) -> list:
+    if not call_log.exists():
+        return []
+    return [int(line.split()[1]) for line in call_log.read_text().splitlines()]
+
+
+def test_large_prompts_go_over_stdin(fake_claude, monkeypatch):
+    monkeypatch.setenv("CLAUDE_STDIN_PROMPT_THRESHOLD", "1024")
+    # The fake only answers as the planner if it read the whole prompt
+    prompt = "x" * 4096 + " Use helios-planner"
+    fake_claude(tasks=3)
+    
+    result = asyncio.run(ClaudeInterface().execute(prompt))
+    
+    assert result.success
+    assert prompt not in result.command
+    assert len(json.loads(result.output)['research_tasks']) == 3
+
+
+def test_small_prompts_stay_in_argv(fake_claude, monkeypatch):
+    monkeypatch.setenv("CLAUDE_STDIN_PROMPT_THRESHOLD", "1024")
+    
+    result = asyncio.run(ClaudeInterface().execute("short prompt"))
+    
+    assert result.success
+    assert "short prompt" in result.command
+
+
+def test_lines_are_yielded_before_the_cli_exits(fake_claude, tmp_path):
+    call_log = tmp_path / "calls.log"
+    fake_claude(call_log=call_log, latency="fixed:2", chunks=4, output_bytes=4096)
+    
+    async def main():
+        alive_at_first_line = None
+        items = []
+        async for item in ClaudeInterface().execute_stream("prompt"):
+            if alive_at_first_line is None and isinstance(item, str):
+                alive_at_first_line = group_alive(cli_pids(call_log)[0])
+            items.append(item)
+        return alive_at_first_line, items
+    
+    alive_at_first_line, items = asyncio.run(main())
+    
+    assert alive_at_first_line
+    assert isinstance(items[-1], ClaudeResult) and items[-1].success
+    assert "".join(items[:-1]) == items[-1].output
+
+
+def test_unbuffered_runs_keep_only_the_stderr_tail(fake_claude):
+    fake_claude(stderr="a" * 60000 + "b" * 60000, stderr_on="always")
+    
+    async def main():
+        return [item async for item in ClaudeInterface().execute_stream(
+            "prompt", buffer_output=False
+        )]
+    
+    result = asyncio.run(main())[-1]
+    
+    assert result.success
+    assert result.output == ""
+    assert len(result.error) == STDERR_TAIL_SIZE
+    assert result.error.endswith("b" * 60000)
+
+
+def test_buffered_runs_keep_all_of_stderr(fake_claude):
+    fake_claude(stderr="a" * 60000 + "b" * 60000, stderr_on="always")
+    
+    result = asyncio.run(ClaudeInterface().execute("prompt"))
+    
+    assert len(result.error) >= 120000
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+test_timeouts.py - Tests for the idle watchdog, timeouts and partial output
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.core.exceptions import ClaudeStalledError, ClaudeTimeoutError
+from src.claude.cli_interface import ClaudeInterface
+from src.claude.process_tree import group_alive
+
+
+def test_stalled_cli_is_killed_after_idle_timeout(fake_claude, monkeypatch, tmp_path):
+    monkeypatch.setenv("CLAUDE_IDLE_TIMEOUT", "1")
+    call_log = tmp_path / "calls.log"
+    fake_claude(hang=1, latency="fixed:0.1", call_log=call_log)
+    
+    start = time.monotonic()
+    with pytest.raises(ClaudeStalledError) as excinfo:
+        asyncio.run(ClaudeInterface().execute("prompt", timeout=60))
+    
+    assert time.monotonic() - start < 10
+    assert excinfo.value.partial_result.truncated
+    assert not group_alive(int(call_log.read_text().split()[1]))
+
+
+def test_steady_output_outlives_idle_timeout(fake_claude, monkeypatch):
+    monkeypatch.setenv("CLAUDE_IDLE_TIMEOUT", "1")
+    # Silent for at most half a second at a time, for three seconds
+    fake_claude(latency="fixed:3", chunks=6)
+    
+    result = asyncio.run(ClaudeInterface().execute("prompt", timeout=60))
+    
+    assert result.success
+
+
+def test_timeout_returns_partial_output_with_allow_partial(fake_claude):
+    fake_claude(latency="fixed:3", chunks=10, output_bytes=4096)
+    
+    result = asyncio.run(ClaudeInterface().execute("prompt", timeout=1, allow_partial=True))
+    
+    assert not result.success
+    assert result.truncated
+    assert 0 < len(result.output) < 4096
+    assert result.session_id
+
+
+def test_timeout_raises_without_allow_partial(fake_claude):
+    fake_claude(latency="fixed:3", chunks=10, output_bytes=4096)
+    
+    with pytest.raises(ClaudeTimeoutError) as excinfo:
+        asyncio.run(ClaudeInterface().execute("prompt", timeout=1))
+    
+    assert excinfo.value.partial_result.truncated
+    assert excinfo.value.partial_result.output
+
+
+def test_stall_returns_partial_result_with_allow_partial(fake_claude, monkeypatch):
+    monkeypatch.setenv("CLAUDE_IDLE_TIMEOUT", "1")
+    fake_claude(hang=1, latency="fixed:0.1")
+    
+    result = asyncio.run(ClaudeInterface().execute("prompt", timeout=60, allow_partial=True))
+    
+    assert not result.success
+    assert result.truncated
+    # Cut off before any text: kept for its session, to be resumed
+    assert result.session_id
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+test_token_budget.py - Tests for token budget accounting around executions
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.core.exceptions import TokenLimitError
+from src.claude.cli_interface import ClaudeInterface, ClaudeResult
+
+
+@pytest.fixture
+def budget(fake_claude, monkeypatch, tmp_path):
+    """Enforce a 10k token daily budget; returns the fake CLI's call log"""
+    monkeypatch.setenv("TOKEN_ENFORCE_BUDGET", "true")
+    monkeypatch.setenv("TOKEN_DAILY_BUDGET", "10000")
+    call_log = tmp_path / "calls.log"
+    fake_claude(call_log=call_log)
+    return call_log
+
+
+def stream(interface: ClaudeInterface, **kwargs):
+    async def main():
+        return [item async for item in interface.execute_stream("prompt", **kwargs)]
+    
+    return asyncio.run(main())
+
+
+def test_execute_settles_reported_usage(budget):
+    interface = ClaudeInterface()
+    result = asyncio.run(interface.execute("prompt", token_estimate=5000))
+    
+    assert interface.token_budget.used() == result.total_tokens
+    assert interface.token_budget.reserved == 0
+
+
+def test_stream_settles_reported_usage(budget):
+    interface = ClaudeInterface()
+    result = stream(interface, token_estimate=5000)[-1]
+    
+    assert isinstance(result, ClaudeResult)
+    assert result.total_tokens
+    assert interface.token_budget.used() == result.total_tokens
+    assert interface.token_budget.reserved == 0
+
+
+def test_stream_over_budget_is_refused_before_spawning(budget):
+    interface = ClaudeInterface()
+    
+    with pytest.raises(TokenLimitError):
+        stream(interface, token_estimate=20000)
+    
+    assert not budget.exists()
+    assert interface.token_budget.reserved == 0
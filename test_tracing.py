@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+test_tracing.py - Tests for span tracing and the Chrome trace export
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.utils.tracing import Tracer, current_span
+
+
+def load_trace(tracer: Tracer, path: Path) -> list:
+    """Write and reload the trace, checking the Trace Event fields"""
+    trace = json.loads(tracer.write(path).read_text())
+    assert trace['displayTimeUnit'] == 'ms'
+    for event in trace['traceEvents']:
+        assert event['ph'] in ('X', 'i', 'M')
+        assert isinstance(event['pid'], int) and isinstance(event['tid'], int)
+        if event['ph'] == 'X':
+            assert event['ts'] >= 0 and event['dur'] >= 0
+    return trace['traceEvents']
+
+
+def spans(events: list) -> dict:
+    return {event['name']: event for event in events if event['ph'] == 'X'}
+
+
+def test_nested_spans_link_to_their_parent(tmp_path):
+    tracer = Tracer(enabled=True)
+    
+    with tracer.span("outer", "test", run=1):
+        with tracer.span("inner", "test") as inner:
+            inner.set(items=3)
+    
+    by_name = spans(load_trace(tracer, tmp_path / "trace.json"))
+    outer, inner = by_name['outer'], by_name['inner']
+    
+    assert inner['args']['parent_id'] == outer['args']['span_id']
+    assert 'parent_id' not in outer['args']
+    assert outer['args']['run'] == 1 and inner['args']['items'] == 3
+    assert outer['ts'] <= inner['ts']
+    assert inner['ts'] + inner['dur'] <= outer['ts'] + outer['dur']
+    assert current_span() is None
+
+
+def test_spans_nest_across_tasks_in_their_own_lanes(tmp_path):
+    tracer = Tracer(enabled=True)
+    
+    async def work(name: str):
+        with tracer.span(name, "test"):
+            await asyncio.sleep(0.01)
+    
+    async def main():
+        with tracer.span("batch", "test"):
+            await asyncio.gather(work("a"), work("b"))
+    
+    asyncio.run(main())
+    events = load_trace(tracer, tmp_path / "trace.json")
+    by_name = spans(events)
+    
+    batch_id = by_name['batch']['args']['span_id']
+    assert by_name['a']['args']['parent_id'] == batch_id
+    assert by_name['b']['args']['parent_id'] == batch_id
+    assert len({by_name[name]['tid'] for name in ("batch", "a", "b")}) == 3
+    lanes = [event for event in events if event['ph'] == 'M']
+    assert {event['tid'] for event in lanes} >= {by_name['a']['tid'], by_name['b']['tid']}
+
+
+def test_failed_spans_record_the_error(tmp_path):
+    tracer = Tracer(enabled=True)
+    
+    with pytest.raises(KeyError):
+        with tracer.span("lookup", "test"):
+            raise KeyError("missing")
+    
+    assert spans(load_trace(tracer, tmp_path / "trace.json"))['lookup']['args']['error'] == "KeyError"
+
+
+def test_disabled_tracer_records_nothing(tmp_path):
+    tracer = Tracer(enabled=False)
+    
+    with tracer.span("outer") as span:
+        tracer.instant("marker")
+    
+    assert span is None
+    assert load_trace(tracer, tmp_path / "trace.json") == []
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+test_workspace_pool.py - Tests for the pre-warmed workspace pool
+"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.claude.workspace_manager import WorkspaceManager
+
+
+@pytest.fixture
+def agent_file(fake_claude, tmp_path):
+    """A user agent definition copied into every workspace"""
+    agent_file = tmp_path / "agents" / "helper.md"
+    agent_file.parent.mkdir()
+    agent_file.write_text("You help.")
+    return agent_file
+
+
+async def ready_pool(manager: WorkspaceManager, size: int):
+    pool = await manager.start_pool(size)
+    while pool.stats()['ready'] < size:
+        await asyncio.sleep(0.01)
+    return pool
+
+
+def test_returned_workspaces_are_recycled(agent_file):
+    async def main():
+        manager = WorkspaceManager()
+        pool = await ready_pool(manager, 1)
+        async with manager.lease_workspace("helper") as first:
+            (first / "notes.md").write_text("scratch")
+            (first / "build" / "cache").mkdir(parents=True)
+            (first / "build" / "cache" / "blob").write_bytes(b"x" * 1024)
+        async with manager.lease_workspace("helper") as second:
+            contents = sorted(entry.name for entry in second.iterdir())
+            agent_copy = (second / ".claude" / "agents" / "helper.md").read_text()
+        stats = pool.stats()
+        await manager.cleanup_all()
+        return first, second, contents, agent_copy, stats
+    
+    first, second, contents, agent_copy, stats = asyncio.run(main())
+    
+    assert first == second
+    assert contents == [".claude"]
+    assert agent_copy == "You help."
+    assert stats['recycled'] == 2
+
+
+def test_hit_rate_stats(agent_file):
+    async def main():
+        manager = WorkspaceManager()
+        pool = await ready_pool(manager, 1)
+        # The second concurrent lease finds the pool empty
+        async with manager.lease_workspace("helper"):
+            async with manager.lease_workspace("helper"):
+                pass
+        stats = pool.stats()
+        await manager.cleanup_all()
+        return stats
+    
+    stats = asyncio.run(main())
+    
+    assert (stats['hits'], stats['misses']) == (1, 1)
+    assert stats['hit_rate'] == 0.5
+
+
+def test_edited_agent_definitions_are_recopied_on_lease(agent_file):
+    async def main():
+        manager = WorkspaceManager()
+        pool = await ready_pool(manager, 1)
+        agent_file.write_text("You help, briefly.")
+        # Make the edit visible even on coarse-mtime filesystems
+        mtime = agent_file.stat().st_mtime_ns + 10 ** 9
+        os.utime(agent_file, ns=(mtime, mtime))
+        async with manager.lease_workspace("helper") as workspace:
+            agent_copy = (workspace / ".claude" / "agents" / "helper.md").read_text()
+        stats = pool.stats()
+        await manager.cleanup_all()
+        return agent_copy, stats
+    
+    agent_copy, stats = asyncio.run(main())
+    
+    assert agent_copy == "You help, briefly."
+    assert (stats['hits'], stats['agent_refreshes']) == (1, 1)